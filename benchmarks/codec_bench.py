@@ -0,0 +1,88 @@
+"""Serialization cost per turn: stdlib json vs the orjson and msgpack codecs
+in src/utils/codec.py.
+
+Encodes and decodes the values a chat turn moves through Redis, the metadata
+columns and the API (fraud check cache entries, an idempotency entry, session
+metadata, the AgentResponse body and a page of history) and reports time and
+payload size per codec.
+
+    python -m benchmarks.codec_bench --turns 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from src.utils.codec import get_codec
+
+CODECS = ["json", "orjson", "msgpack"]
+
+
+def build_payloads() -> dict:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    report = {
+        "phone_number": "+1-555-123-4567",
+        "report_type": "scam",
+        "description": "Caller claimed to be from the IRS and asked for gift cards. " * 2,
+        "created_at": now.isoformat(),
+    }
+    answer = {
+        "content": "The number +1-555-123-4567 has been reported 3 times as a scam. Do not share any details.",
+        "name": "checker",
+    }
+    history = [{
+        "session_id": "session-1",
+        "turn": index,
+        "role": "user" if index % 2 == 0 else "assistant",
+        "content": f"Turn {index}: is +1-555-123-{index:04d} a scam? " * 3,
+        "name": None if index % 2 == 0 else "checker",
+        "metadata": {"tokens": 40 + index, "model": "llama-3.1-8b-instant"},
+        "created_at": (now + timedelta(seconds=index)).isoformat(),
+    } for index in range(50)]
+    return {
+        "fraud_check": [dict(report, report_type=kind) for kind in ("scam", "spam", "robocall")],
+        "idempotency": {"state": "done", "fingerprint": "9f2c" * 16, "result": answer},
+        "session": {"last_active": now.isoformat(), "user_id": "user-1", "turns": 12},
+        "metadata": {"source": "api", "client": {"ip": "203.0.113.7", "agent": "curl/8.5"}, "tags": ["web"]},
+        "response": answer,
+        "history_page": history,
+    }
+
+
+def bench_codec(name: str, payloads: dict, turns: int) -> dict:
+    codec = get_codec(name)
+    encoded = {key: codec.encode(value) for key, value in payloads.items()}
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        for value in payloads.values():
+            codec.encode(value)
+    encode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        for data in encoded.values():
+            codec.decode(data)
+    decode = time.perf_counter() - start
+
+    return {
+        "codec": codec.name,
+        "encode_us_per_turn": round(encode / turns * 1e6, 1),
+        "decode_us_per_turn": round(decode / turns * 1e6, 1),
+        "bytes": {key: len(data) for key, data in encoded.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--codecs", nargs="+", default=CODECS, choices=CODECS)
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    results = [bench_codec(name, payloads, args.turns) for name in args.codecs]
+    print(json.dumps({"benchmark": "codec", "turns": args.turns, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
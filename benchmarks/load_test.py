@@ -0,0 +1,187 @@
+"""Load test for POST /api/v1/chat against the in-process ASGI app.
+
+The agent service runs the real graph with a deterministic fake chat model
+(tests/helpers/fake_llm.py) and in-memory stand-ins for MySQL and Redis, so
+results reflect our own overhead plus the simulated LLM latency. Each session
+sends its turns sequentially; all sessions run concurrently.
+
+    python -m benchmarks.load_test --sessions 50 --turns 4 --llm-latency lognormal:0.3:0.5
+    python -m benchmarks.load_test --output run.json --compare baseline.json
+    python -m benchmarks.load_test --cassette cassettes/llm.json
+
+Prints a JSON report (throughput, p50/p95/p99 latency, error rate). With
+--compare, exits 1 when p95 latency or throughput regress by more than
+--max-regression relative to the baseline report.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Configure the app before anything reads settings
+os.environ.setdefault("CHECKPOINT_BACKEND", "sqlite")
+os.environ.setdefault("CHECKPOINT_SQLITE_PATH", ":memory:")
+os.environ.setdefault("LOG_SAMPLE_RATES", "stream=0,node=0")
+
+import httpx
+
+from tests.helpers.fake_llm import FakeChatModel
+from tests.helpers.in_memory_db import InMemoryDatabaseService, InMemoryRedis
+
+SCRIPT = [
+    "Hi there, what can you do?",
+    "Can you check +1-555-{session:03d}-{turn:04d} for me?",
+    "I want to report 555-{session:03d}-{turn:04d}, they said they were the IRS",
+    "Thanks, is (555) {session:03d}-{turn:04d} safe too?",
+]
+
+
+class NoTools:
+    def get_checker_tools(self):
+        return []
+
+    def get_reporter_tools(self):
+        return []
+
+
+def build_app(args):
+    from main import app
+    from controller.routers import chat
+    from src.services.agent_service import AgentService, get_agent_service
+    from src.services.cache_service import RedisCache
+
+    RedisCache().client = InMemoryRedis()
+    app.state.limiter.enabled = False
+    chat.limiter.enabled = False
+
+    if args.cassette:
+        # Replay responses recorded with LLM_CASSETTE_MODE=record instead of the fake model
+        from src.services.llm_cassette import Cassette, CassetteChatModel
+        llm = CassetteChatModel(
+            cassette=Cassette(args.cassette),
+            mode="replay",
+            latency_scale=args.cassette_latency_scale
+        )
+    else:
+        llm = FakeChatModel(latency=args.llm_latency, seed=args.seed)
+
+    service = AgentService(
+        db_service=InMemoryDatabaseService(db_latency_ms=args.db_latency_ms),
+        llm=llm,
+        tools=NoTools()
+    )
+    app.dependency_overrides[get_agent_service] = lambda: service
+    return app
+
+
+async def run_session(client: httpx.AsyncClient, session: int, turns: int, samples: List[Dict]):
+    for turn in range(turns):
+        content = SCRIPT[turn % len(SCRIPT)].format(session=session, turn=turn)
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/v1/chat", json={
+                "content": content,
+                "session_id": f"load_{session}",
+                "user_id": f"load_user_{session}"
+            })
+            status = response.status_code
+        except Exception:
+            status = 0
+        samples.append({"latency": time.perf_counter() - start, "status": status})
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: List[Dict], duration: float, args) -> Dict:
+    latencies = sorted(s["latency"] * 1000 for s in samples)
+    errors = sum(1 for s in samples if s["status"] != 200)
+    return {
+        "benchmark": "chat_load",
+        "config": {
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "llm_latency": f"cassette:{args.cassette}" if args.cassette else args.llm_latency,
+            "db_latency_ms": args.db_latency_ms,
+            "seed": args.seed,
+        },
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(samples) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Regressions beyond max_regression (a fraction) relative to the baseline"""
+    failures = []
+    p95, base_p95 = report["latency_ms"]["p95"], baseline["latency_ms"]["p95"]
+    if base_p95 and p95 > base_p95 * (1 + max_regression):
+        failures.append(f"p95 latency {p95}ms vs baseline {base_p95}ms")
+    rps, base_rps = report["throughput_rps"], baseline["throughput_rps"]
+    if base_rps and rps < base_rps * (1 - max_regression):
+        failures.append(f"throughput {rps} rps vs baseline {base_rps} rps")
+    if report["error_rate"] > baseline["error_rate"]:
+        failures.append(f"error rate {report['error_rate']} vs baseline {baseline['error_rate']}")
+    return failures
+
+
+async def run(args) -> Dict:
+    app = build_app(args)
+    samples: List[Dict] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_session(client, session, args.turns, samples) for session in range(args.sessions)
+        ))
+        duration = time.perf_counter() - start
+    return summarize(samples, duration, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--llm-latency", default="lognormal:0.3:0.5",
+                        help="fixed:S, uniform:A:B, normal:MEAN:STD or lognormal:MEDIAN:SIGMA (seconds)")
+    parser.add_argument("--cassette", help="Replay this recorded LLM cassette instead of the fake model")
+    parser.add_argument("--cassette-latency-scale", type=float, default=1.0)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(report, json.load(f), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
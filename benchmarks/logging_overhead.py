@@ -0,0 +1,121 @@
+"""Logging overhead per turn: legacy synchronous f-string logging vs the queued,
+capped and sampled setup in src/utils/logger.py.
+
+Simulates the records a turn emits (supervisor/node results and stream
+updates carrying the whole message list) for growing conversation lengths
+and reports the time spent on the calling thread, i.e. on the event loop.
+
+    python -m benchmarks.logging_overhead --turns 200 --lengths 10 50 200
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.utils.logger import (
+    Capped,
+    DeferredQueueHandler,
+    MessagesSummary,
+    SamplingFilter,
+    log_format,
+)
+
+
+def build_messages(length: int):
+    messages = []
+    for index in range(length):
+        content = f"Turn {index}: is +1-555-123-{index:04d} a scam? " * 4
+        messages.append(HumanMessage(content=content) if index % 2 == 0
+                        else AIMessage(content=content, name="checker"))
+    return messages
+
+
+def make_handlers(directory: str):
+    stream = logging.StreamHandler(open(os.devnull, "w"))
+    file = RotatingFileHandler(os.path.join(directory, "bench.log"), maxBytes=10485760, backupCount=1)
+    for handler in (stream, file):
+        handler.setFormatter(log_format)
+    return stream, file
+
+
+def legacy_turn(log: logging.Logger, messages):
+    update = {"messages": messages, "next": "checker"}
+    log.info(f"Supervisor result: {update}")
+    log.info(f"Stream response: {{'supervisor': {update}}}")
+    log.info(f"Checker result: {update}")
+    log.info(f"Stream response: {{'checker': {update}}}")
+    log.info(f"Final response: {messages[-1]}")
+
+
+def current_turn(log: logging.Logger, node: logging.Logger, stream: logging.Logger, messages):
+    update = {"messages": messages, "next": "checker"}
+    node.info("Supervisor result: %s", MessagesSummary(update))
+    stream.info("Stream response: %s", MessagesSummary({"supervisor": update}))
+    node.info("Checker result: %s", MessagesSummary(update))
+    stream.info("Stream response: %s", MessagesSummary({"checker": update}))
+    log.info("Final response: %s", Capped(messages[-1].content))
+
+
+def bench_legacy(directory: str, messages, turns: int) -> dict:
+    log = logging.getLogger("bench.legacy")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.handlers = list(make_handlers(directory))
+    start = time.perf_counter()
+    for _ in range(turns):
+        legacy_turn(log, messages)
+    elapsed = time.perf_counter() - start
+    return {"caller_us_per_turn": round(elapsed / turns * 1e6, 1)}
+
+
+def bench_current(directory: str, messages, turns: int, stream_rate: float) -> dict:
+    records = queue.Queue()
+    listener = QueueListener(records, *make_handlers(directory))
+    log = logging.getLogger("bench.current")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.handlers = [DeferredQueueHandler(records)]
+    node = log.getChild("node")
+    stream = log.getChild("stream")
+    stream.filters = [SamplingFilter(stream_rate)]
+
+    listener.start()
+    start = time.perf_counter()
+    for _ in range(turns):
+        current_turn(log, node, stream, messages)
+    caller = time.perf_counter() - start
+    listener.stop()
+    total = time.perf_counter() - start
+    return {
+        "caller_us_per_turn": round(caller / turns * 1e6, 1),
+        "total_us_per_turn": round(total / turns * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--stream-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for length in args.lengths:
+            messages = build_messages(length)
+            results.append({
+                "conversation_length": length,
+                "legacy": bench_legacy(directory, messages, args.turns),
+                "current": bench_current(directory, messages, args.turns, args.stream_rate),
+            })
+    print(json.dumps({"benchmark": "logging_overhead", "turns": args.turns, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Micro-benchmarks for the repository hot paths with a baseline regression gate.
+
+Runs against a dedicated database (DB_NAME defaults to fraud_detection_bench,
+connection settings come from the usual DB_* variables) seeded to a
+realistic size. For every benchmark it records p50/p95 latency and the
+number of server round trips per call: queries, commits/rollbacks and pool
+checkouts/returns (the pool pings on checkout and resets the session on return).
+With --backend sqlite it runs against an embedded database file instead and
+counts statements and commits.
+
+    python -m benchmarks.repository_bench --scale 1 --update-baseline
+    python -m benchmarks.repository_bench --scale 1
+    python -m benchmarks.repository_bench --backend sqlite --update-baseline
+
+The second form compares against benchmarks/baselines/repositories.json (or
+repositories_sqlite.json for the SQLite backend) and
+exits 1 when p50 latency grows by more than --latency-threshold, any
+benchmark needs more round trips than its baseline, or the baseline is
+missing.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+class RoundTripCounter:
+    """Counts server round trips by wrapping the pool, its connections and cursors"""
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap_connection(self, connection):
+        counter = self
+
+        class CountingCursor:
+            def __init__(self, cursor):
+                self._cursor = cursor
+
+            def execute(self, *args, **kwargs):
+                counter.count += 1
+                return self._cursor.execute(*args, **kwargs)
+
+            def executemany(self, *args, **kwargs):
+                counter.count += 1
+                return self._cursor.executemany(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self._cursor, name)
+
+        class CountingConnection:
+            def __init__(self, connection):
+                self._connection = connection
+
+            def cursor(self, *args, **kwargs):
+                return CountingCursor(self._connection.cursor(*args, **kwargs))
+
+            def commit(self):
+                counter.count += 1
+                return self._connection.commit()
+
+            def rollback(self):
+                counter.count += 1
+                return self._connection.rollback()
+
+            def close(self):
+                counter.count += 1
+                return self._connection.close()
+
+            def __getattr__(self, name):
+                return getattr(self._connection, name)
+
+        return CountingConnection(connection)
+
+    def wrap_pool(self, pool):
+        counter = self
+
+        class CountingPool:
+            def get_connection(self):
+                counter.count += 1
+                return counter.wrap_connection(pool.get_connection())
+
+            def __getattr__(self, name):
+                return getattr(pool, name)
+
+        return CountingPool()
+
+
+def seed(db, scale: int, rng: random.Random) -> Dict[str, List[str]]:
+    """Bulk-load users, sessions, messages and fraud reports unless already present"""
+    users = [f"bench_user_{n}" for n in range(500 * scale)]
+    sessions = [f"bench_session_{n}" for n in range(1000 * scale)]
+    numbers = [f"+1-555-{n // 10000:03d}-{n % 10000:04d}" for n in range(5000 * scale)]
+
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM chat_sessions WHERE session_id LIKE 'bench_session_%'")
+        if cursor.fetchone()[0] >= len(sessions):
+            return {"users": users, "sessions": sessions, "numbers": numbers}
+
+        print(f"Seeding scale {scale}...", file=sys.stderr)
+        cursor.executemany(
+            "INSERT IGNORE INTO users (user_id) VALUES (%s)", [(u,) for u in users]
+        )
+        cursor.executemany(
+            "INSERT IGNORE INTO chat_sessions (session_id, user_id, status) VALUES (%s, %s, 'active')",
+            [(s, users[i % len(users)]) for i, s in enumerate(sessions)]
+        )
+        for i, session_id in enumerate(sessions):
+            cursor.executemany("""
+                INSERT IGNORE INTO chat_messages
+                (message_id, session_id, user_id, role, content, agent_name, turn_number)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, [
+                (
+                    str(uuid.uuid4()), session_id, users[i % len(users)],
+                    "user" if turn % 2 == 0 else "assistant",
+                    f"Seeded message {turn} about {rng.choice(numbers)}",
+                    None if turn % 2 == 0 else "checker", turn + 1
+                ) for turn in range(20)
+            ])
+        cursor.executemany("""
+            INSERT INTO fraud_reports (phone_number, is_fraud, report_count, description, reporter_ip)
+            VALUES (%s, TRUE, %s, %s, '127.0.0.1')
+        """, [(n, rng.randint(1, 20), "Seeded report") for n in numbers])
+    return {"users": users, "sessions": sessions, "numbers": numbers}
+
+
+def measure(name: str, call: Callable[[], object], counter: RoundTripCounter,
+            iterations: int, warmup: int) -> Dict:
+    for _ in range(warmup):
+        call()
+    timings = []
+    trips = counter.count
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    trips = (counter.count - trips) / iterations
+    timings.sort()
+    return {
+        "name": name,
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "round_trips": round(trips, 2),
+    }
+
+
+def run(args) -> List[Dict]:
+    from src.database.connection import get_database
+    from src.database.repositories.chat_repository import ChatRepository
+    from src.database.repositories.fraud_report import FraudReportRepository
+    from src.database.repositories.user_repository import UserRepository
+
+    rng = random.Random(args.seed)
+    chat_repo = ChatRepository()
+    user_repo = UserRepository()
+    fraud_repo = FraudReportRepository()
+    db = get_database()
+    data = seed(db, args.scale, rng)
+
+    counter = RoundTripCounter()
+    if db.dialect == "sqlite":
+        # No server: counts statements and commits on this thread's connection
+        db._local.connection = counter.wrap_connection(db._connection())
+    else:
+        db._pool = counter.wrap_pool(db._pool)
+
+    def pick(key):
+        return rng.choice(data[key])
+
+    benchmarks = {
+        "ChatRepository.save_message": lambda: chat_repo.save_message(
+            pick("sessions"), "bench_user_0", "user", "Benchmark message"
+        ),
+        "ChatRepository.get_session_messages": lambda: chat_repo.get_session_messages(
+            pick("sessions"), limit=10
+        ),
+        "UserRepository.get_or_create_user": lambda: user_repo.get_or_create_user(pick("users")),
+        "FraudReportRepository.check_number": lambda: fraud_repo.check_number(pick("numbers")),
+        "FraudReportRepository.check_number (miss)": lambda: fraud_repo.check_number(
+            f"+1-999-{rng.randint(0, 999):03d}-0000"
+        ),
+    }
+    return [
+        measure(name, call, counter, args.iterations, args.warmup)
+        for name, call in benchmarks.items()
+    ]
+
+
+def gate(results: List[Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    failures = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+        if result["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            failures.append(f"{result['name']}: p50 {result['p50_ms']}ms vs baseline {base['p50_ms']}ms")
+        if result["round_trips"] > base["round_trips"]:
+            failures.append(
+                f"{result['name']}: {result['round_trips']} round trips vs baseline {base['round_trips']}"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--database", default=os.getenv("BENCH_DB_NAME", "fraud_detection_bench"),
+                        help="MySQL database name, or the file path for --backend sqlite")
+    parser.add_argument("--scale", type=int, default=1, help="1 = 1k sessions, 20k messages, 5k reports")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--latency-threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Must be set before src.core.config reads the environment
+    os.environ["DB_BACKEND"] = args.backend
+    if args.backend == "sqlite":
+        os.environ["SQLITE_PATH"] = f"{args.database}.sqlite"
+    else:
+        os.environ["DB_NAME"] = args.database
+    if not args.baseline:
+        suffix = "_sqlite" if args.backend == "sqlite" else ""
+        args.baseline = os.path.join(BASELINE_DIR, f"repositories{suffix}.json")
+
+    results = run(args)
+    print(json.dumps({
+        "benchmark": "repositories", "backend": args.backend, "scale": args.scale, "results": results
+    }, indent=2))
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({r["name"]: r for r in results}, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        # A gate without a baseline would always pass
+        print(f"No baseline at {args.baseline}, run with --update-baseline first", file=sys.stderr)
+        sys.exit(1)
+    with open(args.baseline) as f:
+        failures = gate(results, json.load(f), args.latency_threshold)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Literal
+import asyncio
+from src.services.agent_service import AgentService, get_agent_service
+from src.utils.logger import logger
+
+router = APIRouter()
+
+@router.get("/analytics/latency",
+           summary="Turn latency percentiles",
+           description="p50/p95 processing time per graph node (supervisor included) or per model")
+async def latency_percentiles(
+    group_by: Literal["node", "model"] = "node",
+    hours: int = Query(24, ge=1, le=24 * 30),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return p50/p95 turn latency for the last `hours` hours"""
+    try:
+        rows = await asyncio.to_thread(
+            agent_service.db_service.get_latency_percentiles, group_by, hours
+        )
+        return {"group_by": group_by, "hours": hours, "results": rows}
+    except Exception as e:
+        logger.error(f"Error getting latency percentiles: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analytics/tokens",
+           summary="Token usage",
+           description="Prompt and completion token usage per graph node (supervisor included) or per model")
+async def token_usage(
+    group_by: Literal["node", "model"] = "node",
+    hours: int = Query(24, ge=1, le=24 * 30),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return token totals and per-turn averages for the last `hours` hours"""
+    try:
+        rows = await asyncio.to_thread(agent_service.db_service.get_token_usage, group_by, hours)
+        return {"group_by": group_by, "hours": hours, "results": rows}
+    except Exception as e:
+        logger.error(f"Error getting token usage: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
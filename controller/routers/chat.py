@@ -1,14 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
 from typing import Optional
 from pydantic import BaseModel
-from src.services.agent_service import AgentService
+from src.services.agent_service import AgentService, get_agent_service
+from src.services.idempotency import IdempotencyError, IdempotencyGuard, fingerprint, get_idempotency_guard
+from src.services.resilience import DeadlineExceeded, new_deadline
+from src.services.session_lock import SessionBusy
 from src.models.agents import AgentResponse
 from src.core.config import settings
 from src.utils.logger import logger
 import time
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from src.database.connection import DatabaseConnection
+from src.database.connection import get_database
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -34,12 +37,19 @@ class ChatRequest(BaseModel):
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def chat(
     request: Request,  # Required for rate limiting
+    response: Response,
     chat_request: ChatRequest,
-    agent_service: AgentService = Depends(lambda: AgentService())
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    agent_service: AgentService = Depends(get_agent_service),
+    idempotency: IdempotencyGuard = Depends(get_idempotency_guard)
 ):
     """
     Process a chat message and return the agent's response.
     
+    Requests sharing an Idempotency-Key run once: concurrent duplicates wait
+    for that run and later retries get its stored response, marked with an
+    Idempotent-Replayed header.
+    
     Args:
         request: ChatRequest containing the message content and optional session/user IDs
         
@@ -47,19 +57,50 @@ async def chat(
         AgentResponse containing the assistant's response
         
     Raises:
-        HTTPException: If there's an error processing the message
+        HTTPException: 409 if the session or the idempotency key is still busy
+            after the wait limit, 422 if the key was used for another request,
+            504 if the turn ran past API_TIMEOUT, 500 on any other error
     """
+    # Queueing for the session or a duplicate counts against the same budget
+    deadline = new_deadline()
     try:
         # Generate default IDs if not provided
         session_id = chat_request.session_id or f"session_{int(time.time())}"
         user_id = chat_request.user_id or f"user_{int(time.time())}"
         
-        response = await agent_service.process_message(
-            message=chat_request.content,
-            session_id=session_id,
-            user_id=user_id
-        )
-        return response
+        async def process() -> dict:
+            agent_response = await agent_service.process_message(
+                message=chat_request.content,
+                session_id=session_id,
+                user_id=user_id,
+                deadline=deadline
+            )
+            return agent_response.model_dump()
+        
+        request_fingerprint = fingerprint(chat_request.session_id, chat_request.user_id, chat_request.content)
+        key, ttl = None, None
+        if settings.IDEMPOTENCY_ENABLED:
+            if idempotency_key:
+                key = fingerprint(chat_request.user_id, idempotency_key)
+            elif chat_request.session_id and settings.IDEMPOTENCY_DERIVED_TTL:
+                # Catches proxy retries of clients that send no key
+                key, ttl = f"derived:{request_fingerprint}", settings.IDEMPOTENCY_DERIVED_TTL
+        
+        if key is None:
+            return AgentResponse(**await process())
+        result, replayed = await idempotency.run(key, request_fingerprint, process, ttl)
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return AgentResponse(**result)
+    except IdempotencyError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except DeadlineExceeded as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=504, detail=str(e))
+    except SessionBusy as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(
@@ -84,18 +125,22 @@ async def health_check():
 async def db_health_check():
     """Check database connection"""
     try:
-        db = DatabaseConnection()
+        db = get_database()
         with db.get_cursor() as cursor:
             cursor.execute("SELECT 1")
             result = cursor.fetchone()
             
-            # Also check if we can access our database
-            cursor.execute(f"USE {db.settings.DB_NAME}")
+            if db.dialect == "sqlite":
+                database = db.path
+            else:
+                # Also check if we can access our database
+                cursor.execute(f"USE {db.settings.DB_NAME}")
+                database = db.settings.DB_NAME
             
             return {
                 "status": "healthy",
                 "message": "Database connection successful",
-                "database": db.settings.DB_NAME
+                "database": database
             }
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
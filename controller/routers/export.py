@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from contextlib import aclosing
+from datetime import datetime
+from typing import Literal, Optional
+import hmac
+from src.core.config import settings
+from src.services.export_service import FORMATS, ExportService, get_export_service
+from src.utils.logger import logger
+from src.utils.streaming import iterate_in_one_thread
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+@router.get("/export/{table}",
+           summary="Stream a table export",
+           description="Stream fraud_reports, chat_messages or message_analytics as Parquet or an Arrow IPC "
+                       "stream, optionally only rows past a watermark (the keyset of the last row received)")
+async def export_table(
+    table: Literal["fraud_reports", "chat_messages", "message_analytics"],
+    format: Literal["parquet", "arrow"] = "arrow",
+    after_id: Optional[int] = Query(None, ge=0),
+    after_updated_at: Optional[datetime] = Query(None, description="fraud_reports only, with after_id"),
+    x_export_token: str = Header(""),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """Stream the export in chunks of EXPORT_CHUNK_ROWS rows"""
+    # Exports contain every conversation, so the endpoint is off unless a token is configured
+    if not settings.EXPORT_API_TOKEN or not hmac.compare_digest(x_export_token, settings.EXPORT_API_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid export token")
+
+    after = None
+    if table == "fraud_reports" and after_updated_at is not None:
+        after = [after_updated_at, after_id or 0]
+    elif table != "fraud_reports" and after_id is not None:
+        after = [after_id]
+
+    logger.info(f"Streaming {table} export as {format} after {after}")
+
+    async def body():
+        chunks = iterate_in_one_thread(lambda: export_service.stream(table, format, after))
+        async with aclosing(chunks):
+            async for data in chunks:
+                yield data
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{FORMATS[format]}"'}
+    )
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+import asyncio
+from contextlib import aclosing
+from src.services.agent_service import AgentService, get_agent_service
+from src.utils.codec import json_codec
+from src.utils.logger import logger
+from src.utils.streaming import iterate_in_one_thread
+
+router = APIRouter()
+
+@router.get("/sessions/{session_id}/messages",
+           summary="Session history",
+           description="Read a conversation page by page (keyset on turn_number) or as one NDJSON stream")
+async def session_messages(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    after_turn: Optional[int] = Query(None, ge=0, description="next_after_turn from the previous page"),
+    direction: Literal["asc", "desc"] = "asc",
+    stream: bool = Query(False, description="Stream every message as NDJSON instead of one page"),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return a page of messages after `after_turn`, or stream the whole session"""
+    db_service = agent_service.db_service
+    descending = direction == "desc"
+
+    if stream:
+        async def lines():
+            codec = json_codec()
+            chunks = iterate_in_one_thread(lambda: db_service.stream_session_messages(session_id, descending))
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    yield b"".join(codec.encode(m) + b"\n" for m in chunk)
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    try:
+        # One extra row tells whether another page exists without a COUNT
+        messages = await asyncio.to_thread(
+            db_service.get_messages_page, session_id, after_turn, limit + 1, descending
+        )
+    except Exception as e:
+        logger.error(f"Error getting session messages: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    return {
+        "session_id": session_id,
+        "direction": direction,
+        "messages": messages,
+        "has_more": has_more,
+        "next_after_turn": messages[-1]["turn_number"] if has_more else None
+    }
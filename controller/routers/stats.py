@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+from src.services.agent_service import AgentService, get_agent_service
+from src.utils.logger import logger
+
+router = APIRouter()
+
+async def _read(func, *args):
+    try:
+        return await asyncio.to_thread(func, *args)
+    except Exception as e:
+        logger.error(f"Error reading fraud statistics: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats/top-numbers",
+           summary="Most reported numbers",
+           description="Phone numbers with the most fraud reports")
+async def top_numbers(
+    limit: int = Query(10, ge=1, le=100),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return the `limit` most reported numbers"""
+    rows = await _read(agent_service.db_service.get_top_numbers, limit)
+    return {"limit": limit, "results": rows}
+
+@router.get("/stats/reports-per-day",
+           summary="Reports per day",
+           description="Fraud reports and newly reported numbers per UTC day, from the daily rollup")
+async def reports_per_day(
+    days: int = Query(30, ge=1, le=366),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return daily counts for the last `days` days (days without reports are omitted)"""
+    rows = await _read(agent_service.db_service.get_reports_per_day, days)
+    return {"days": days, "results": rows}
+
+@router.get("/stats/new-numbers-per-hour",
+           summary="New numbers per hour",
+           description="Numbers reported for the first time per UTC hour, from the hourly rollup")
+async def new_numbers_per_hour(
+    hours: int = Query(24, ge=1, le=24 * 14),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Return hourly counts for the last `hours` hours (hours without reports are omitted)"""
+    rows = await _read(agent_service.db_service.get_new_numbers_per_hour, hours)
+    return {"hours": hours, "results": rows}
@@ -1,10 +1,10 @@
-from src.services.agent_service import AgentService
+from src.services.agent_service import get_agent_service
 from src.utils.logger import logger
 from typing import Dict, Any
 
 class ChatService:
     def __init__(self):
-        self.agent_service = AgentService()
+        self.agent_service = get_agent_service()
     
     async def process_chat(self, message: str, session_id: str, user_id: str) -> Dict[str, Any]:
         try:
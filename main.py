@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -6,11 +6,17 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from src.middleware.session import SessionMiddleware
-from controller.routers import chat
+from controller.routers import chat, analytics, export, sessions, stats
 from src.core.config import get_settings
+from src.services.agent_service import get_agent_service
+from src.monitoring.metrics import REQUEST_LATENCY, render_metrics, reset_multiprocess_dir
+from src.monitoring.tracing import tracer, set_request_id, reset_request_id
+from src.utils.codec import CodecJSONResponse
 import uvicorn
+import asyncio
 import logging
 import time
+import uuid
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +35,8 @@ limiter = Limiter(
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=CodecJSONResponse
 )
 
 # Add rate limiter
@@ -58,20 +65,65 @@ app.add_middleware(
 
 # Include routers
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(analytics.router, prefix="/api/v1", tags=["analytics"])
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
+app.include_router(sessions.router, prefix="/api/v1", tags=["sessions"])
+app.include_router(stats.router, prefix="/api/v1", tags=["stats"])
 
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
+    # Reuse the caller's request ID so traces line up across services
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = set_request_id(request_id)
+    try:
+        with tracer.span("http", method=request.method, path=request.url.path) as span:
+            response = await call_next(request)
+            if span is not None:
+                span.attributes["status_code"] = response.status_code
+    finally:
+        reset_request_id(token)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Request-ID"] = request_id
+    # Label by route template, not raw path, to keep the series count bounded
+    route = request.scope.get("route")
+    REQUEST_LATENCY.labels(
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code
+    ).observe(process_time)
     return response
 
+@app.on_event("startup")
+async def start_background_jobs():
+    if settings.SESSION_SWEEP_ENABLED:
+        from src.services.session_sweeper import SessionSweeper
+        sweeper = SessionSweeper(get_agent_service().db_service)
+        app.state.sweeper_task = asyncio.create_task(sweeper.run_forever())
+    if settings.ARCHIVE_ENABLED:
+        from src.services.archive_service import MessageArchiver
+        # Every worker schedules it; a database lock lets one archive at a time
+        app.state.archiver_task = asyncio.create_task(MessageArchiver().run_forever())
+
+@app.on_event("shutdown")
+async def flush_buffers():
+    # Only flush if a worker actually built the agent service
+    if get_agent_service.cache_info().currsize:
+        await get_agent_service().analytics.flush()
+    tracer.writer.flush()
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
 if __name__ == "__main__":
+    reset_multiprocess_dir()
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
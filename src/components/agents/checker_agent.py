@@ -1,16 +1,36 @@
 from src.components.base_agent import BaseAgent
-from src.utils.logger import logger
+from src.services.cache_service import fraud_check_keys
+from src.services.resilience import CircuitOpen, DeadlineExceeded
+from src.utils.logger import logger, get_category_logger, MessagesSummary
 from src.constants.routes import AgentRoutes
 from src.prompts.checker_prompts import CheckerPrompts
-from typing import Dict, Any
+from src.core.config import settings
+from typing import Dict, Any, List, Optional
+import asyncio
 import json
 import re
+import time
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
+node_logger = get_category_logger("node")
+
 class CheckerAgent(BaseAgent):
-    def __init__(self, agent):
+    # Phrases that mean the user wants more than a plain verdict
+    EXPLANATION_TRIGGERS = ("why", "explain", "what does", "what should i do", "tell me more", "how do")
+    
+    # Try various phone number formats
+    PHONE_PATTERNS = [
+        r'\+1-\d{3}-\d{3}-\d{4}',  # +1-XXX-XXX-XXXX
+        r'(?<!\d)1?\d{10}(?!\d)', # XXXXXXXXXX or 1XXXXXXXXXX
+        r'\d{3}-\d{3}-\d{4}',      # XXX-XXX-XXXX
+        r'\(\d{3}\)\s*\d{3}-\d{4}' # (XXX) XXX-XXXX
+    ]
+    
+    def __init__(self, agent, db_service=None, cache=None):
         super().__init__("checker")
         self.agent = agent
+        self.db_service = db_service
+        self.cache = cache
     
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -18,23 +38,38 @@ class CheckerAgent(BaseAgent):
             last_message = state["messages"][-1]
             
             if isinstance(last_message, HumanMessage):
-                # First, try to understand and extract phone number
-                response = self.agent.invoke({
+                # Fast path: extract and look the numbers up locally, no LLM round-trip
+                phone_numbers = self._extract_phone_numbers(last_message.content)
+                if phone_numbers:
+                    results = await self._lookup_all(phone_numbers[:settings.CHECKER_MAX_NUMBERS])
+                    if any(result["reports"] is not None for result in results):
+                        verdict = self._format_combined_verdict(
+                            results, skipped=phone_numbers[settings.CHECKER_MAX_NUMBERS:]
+                        )
+                        if self._wants_explanation(last_message.content):
+                            verdict = await self._explain(last_message.content, verdict)
+                        return self.create_response(
+                            state,
+                            verdict,
+                            metadata={"lookups": [
+                                {"phone_number": r["phone_number"], "source": r["source"],
+                                 "duration_ms": r["duration_ms"]}
+                                for r in results
+                            ]}
+                        )
+                
+                # Extraction or lookup failed, let the LLM handle the conversation
+                response = await self.agent.ainvoke({
                     "messages": [
                         SystemMessage(content=CheckerPrompts.SYSTEM),
                         HumanMessage(content=last_message.content)
                     ]
                 })
+                node_logger.info("%s response: %s", self.name, MessagesSummary(response))
                 
-                logger.info(f"Initial response: {response}")
-                
-                # If we got a valid number, format it
-                phone_number = self._extract_phone_number(last_message.content)
-                if phone_number:
-                    return self.create_response(
-                        state,
-                        f"I found the phone number {phone_number}. Let me check it for any fraud reports."
-                    )
+                content = self.extract_content(response)
+                if content:
+                    return self.create_response(state, content)
                 
                 # If we need clarification
                 return self.create_response(
@@ -50,6 +85,8 @@ class CheckerAgent(BaseAgent):
                 "Please provide the number you'd like to check."
             )
             
+        except (CircuitOpen, DeadlineExceeded) as e:
+            return self.degraded_response(state, e)
         except Exception as e:
             logger.error(f"{self.name} error: {str(e)}")
             return self.create_response(
@@ -58,33 +95,159 @@ class CheckerAgent(BaseAgent):
                 "in the format: +1-XXX-XXX-XXXX (for example: +1-555-123-4567)"
             )
 
-    def _extract_phone_number(self, content: str) -> str:
-        """Extract phone number from content"""
-        try:
-            # Try various phone number formats
-            patterns = [
-                r'\+1-\d{3}-\d{3}-\d{4}',  # +1-XXX-XXX-XXXX
-                r'\d{10}',                  # XXXXXXXXXX
-                r'\d{3}-\d{3}-\d{4}',      # XXX-XXX-XXXX
-                r'\(\d{3}\)\s*\d{3}-\d{4}' # (XXX) XXX-XXXX
+    def _lookup_keys(self, phone_number: str) -> List[str]:
+        """Formats a number may be stored under (the report tool strips punctuation)"""
+        digits = re.sub(r'\D', '', phone_number)
+        return [phone_number, digits, digits[1:]]
+
+    def _lookup_reports(self, phone_number: str) -> Optional[List[Dict[str, Any]]]:
+        """Query fraud reports for a normalized number, None if no lookup was possible"""
+        if self.db_service is None:
+            return None
+        return self.db_service.find_fraud_reports(self._lookup_keys(phone_number))
+
+    async def _lookup_one(self, phone_number: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Look a number up in the cache, then the database, timing the lookup"""
+        async with semaphore:
+            started = time.perf_counter()
+            source = "cache"
+            # Numbers are extracted as +1-XXX-XXX-XXXX, the form report_fraud invalidates
+            cache_key = fraud_check_keys(phone_number)[-1]
+            reports = await self.cache.get(cache_key) if self.cache else None
+            if reports is None:
+                source = "db"
+                # Repository calls block, keep them off the event loop so lookups overlap
+                reports = await asyncio.to_thread(self._lookup_reports, phone_number)
+                if reports is not None and self.cache:
+                    await self.cache.set(
+                        cache_key,
+                        [{"report_count": r.get("report_count"), "description": r.get("description")}
+                         for r in reports],
+                        expiry=settings.CHECKER_CACHE_TTL
+                    )
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            logger.info(f"Lookup for {phone_number} took {duration_ms}ms ({source})")
+            return {
+                "phone_number": phone_number,
+                "reports": reports,
+                "source": source,
+                "duration_ms": duration_ms
+            }
+
+    async def _lookup_all(self, phone_numbers: List[str]) -> List[Dict[str, Any]]:
+        """Look up every number concurrently, bounded by CHECKER_LOOKUP_CONCURRENCY"""
+        semaphore = asyncio.Semaphore(settings.CHECKER_LOOKUP_CONCURRENCY)
+        return await asyncio.gather(
+            *(self._lookup_one(phone_number, semaphore) for phone_number in phone_numbers)
+        )
+
+    def _wants_explanation(self, content: str) -> bool:
+        content = content.lower()
+        return any(trigger in content for trigger in self.EXPLANATION_TRIGGERS)
+
+    async def _explain(self, question: str, verdict: str) -> str:
+        """Use the LLM only to turn a verdict into a conversational explanation"""
+        response = await self.agent.ainvoke({
+            "messages": [
+                SystemMessage(content=CheckerPrompts.SYSTEM),
+                SystemMessage(content=CheckerPrompts.EXPLAIN_VERDICT.format(verdict=verdict)),
+                HumanMessage(content=question)
             ]
+        })
+        return self.extract_content(response) or verdict
+
+    def _format_verdict(self, phone_number: str, reports: List[Dict[str, Any]]) -> str:
+        """Render the fraud verdict for a number from its report rows"""
+        report_count = sum(row.get('report_count') or 0 for row in reports)
+        if report_count == 0:
+            return (
+                f"I found the phone number {phone_number}. There are no fraud reports for it "
+                "in our database. That doesn't guarantee it's safe, so stay cautious with "
+                "unexpected calls asking for money or personal details."
+            )
+        
+        times = "time" if report_count == 1 else "times"
+        verdict = (
+            f"I found the phone number {phone_number}. Warning: it has been reported as "
+            f"fraudulent {report_count} {times}."
+        )
+        descriptions = [row['description'] for row in reports if row.get('description')]
+        if descriptions:
+            latest = descriptions[-1].strip().splitlines()[-1]
+            verdict += f" Most recent report: \"{latest}\"."
+        return verdict + " We recommend not answering or sharing any personal information."
+
+    def _format_combined_verdict(self, results: List[Dict[str, Any]], skipped: List[str]) -> str:
+        """Render one reply covering every number found in the message"""
+        if len(results) == 1 and not skipped:
+            return self._format_verdict(results[0]["phone_number"], results[0]["reports"])
+        
+        lines = [f"I checked {len(results)} phone numbers:"]
+        flagged = 0
+        for result in results:
+            phone_number, reports = result["phone_number"], result["reports"]
+            if reports is None:
+                lines.append(f"- {phone_number}: I couldn't check this number right now, please try again.")
+                continue
+            report_count = sum(row.get('report_count') or 0 for row in reports)
+            if report_count:
+                flagged += 1
+                times = "time" if report_count == 1 else "times"
+                lines.append(f"- {phone_number}: reported as fraudulent {report_count} {times}.")
+            else:
+                lines.append(f"- {phone_number}: no fraud reports found.")
+        
+        if skipped:
+            lines.append(
+                f"I skipped {len(skipped)} more number(s), please send them in a separate message."
+            )
+        if flagged:
+            lines.append(
+                f"{flagged} of {len(results)} numbers have fraud reports. We recommend not answering "
+                "them or sharing any personal information."
+            )
+        else:
+            lines.append("None of these numbers have fraud reports, but stay cautious with unexpected calls.")
+        return "\n".join(lines)
+
+    def _normalize(self, number: str) -> Optional[str]:
+        """Convert a matched number to the standard +1-XXX-XXX-XXXX format"""
+        digits = re.sub(r'\D', '', number)
+        if len(digits) == 10:
+            return f"+1-{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+        elif len(digits) == 11 and digits.startswith('1'):
+            return f"+{digits[0]}-{digits[1:4]}-{digits[4:7]}-{digits[7:]}"
+        return None
+
+    def _extract_phone_numbers(self, content: str) -> List[str]:
+        """Extract every distinct phone number from content, in order of appearance"""
+        try:
+            matches = []
+            taken = []
+            for pattern in self.PHONE_PATTERNS:
+                for match in re.finditer(pattern, content):
+                    # Skip matches overlapping a number an earlier pattern already found
+                    if any(match.start() < end and start < match.end() for start, end in taken):
+                        continue
+                    number = self._normalize(match.group())
+                    if number:
+                        taken.append(match.span())
+                        matches.append((match.start(), number))
             
-            for pattern in patterns:
-                match = re.search(pattern, content)
-                if match:
-                    number = match.group()
-                    # Convert to standard format
-                    digits = re.sub(r'\D', '', number)
-                    if len(digits) == 10:
-                        return f"+1-{digits[:3]}-{digits[3:6]}-{digits[6:]}"
-                    elif len(digits) == 11 and digits.startswith('1'):
-                        return f"+{digits[0]}-{digits[1:4]}-{digits[4:7]}-{digits[7:]}"
-            
-            return None
+            numbers = []
+            for _, number in sorted(matches):
+                if number not in numbers:
+                    numbers.append(number)
+            return numbers
             
         except Exception as e:
-            logger.error(f"Error extracting phone number: {e}")
-            return None
+            logger.error(f"Error extracting phone numbers: {e}")
+            return []
+
+    def _extract_phone_number(self, content: str) -> str:
+        """Extract the first phone number from content"""
+        numbers = self._extract_phone_numbers(content)
+        return numbers[0] if numbers else None
 
     def _format_response(self, phone_number: str) -> str:
         """Format a user-friendly response"""
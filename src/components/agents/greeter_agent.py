@@ -1,10 +1,13 @@
 from src.components.base_agent import BaseAgent
-from src.utils.logger import logger
+from src.services.resilience import CircuitOpen, DeadlineExceeded
+from src.utils.logger import logger, get_category_logger, MessagesSummary
 from src.constants.routes import AgentRoutes
 from src.prompts.greeter_prompts import GreeterPrompts
 from typing import Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
+node_logger = get_category_logger("node")
+
 class GreeterAgent(BaseAgent):
     def __init__(self, agent):
         super().__init__("greeter")
@@ -76,7 +79,7 @@ class GreeterAgent(BaseAgent):
                     )
                 
                 # Generate response using the appropriate prompt
-                response = self.agent.invoke({
+                response = await self.agent.ainvoke({
                     "messages": [
                         SystemMessage(content=GreeterPrompts.SYSTEM),
                         SystemMessage(content=prompt),
@@ -85,14 +88,16 @@ class GreeterAgent(BaseAgent):
                     ]
                 })
                 
-                logger.info(f"{self.name} response: {response}")
+                node_logger.info("%s response: %s", self.name, MessagesSummary(response))
                 return self.create_response(state, self.extract_content(response))
             
             return self.create_response(
                 state,
-                self.extract_content(self.agent.invoke(state))
+                self.extract_content(await self.agent.ainvoke(state))
             )
             
+        except (CircuitOpen, DeadlineExceeded) as e:
+            return self.degraded_response(state, e)
         except Exception as e:
             logger.error(f"{self.name} error: {str(e)}")
             return self.create_response(
@@ -1,7 +1,10 @@
 from src.components.base_agent import BaseAgent
-from src.utils.logger import logger
+from src.services.resilience import CircuitOpen, DeadlineExceeded
+from src.utils.logger import logger, get_category_logger, MessagesSummary
 from typing import Dict, Any
 
+node_logger = get_category_logger("node")
+
 class ReporterAgent(BaseAgent):
     def __init__(self, agent):
         super().__init__("reporter")
@@ -10,12 +13,14 @@ class ReporterAgent(BaseAgent):
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
             logger.info(f"{self.name} node processing...")
-            response = self.agent.invoke(state)
-            logger.info(f"{self.name} response: {response}")
+            response = await self.agent.ainvoke(state)
+            node_logger.info("%s response: %s", self.name, MessagesSummary(response))
             
             content = self.extract_content(response)
             return self.create_response(state, content)
             
+        except (CircuitOpen, DeadlineExceeded) as e:
+            return self.degraded_response(state, e)
         except Exception as e:
             logger.error(f"{self.name} error: {str(e)}")
             return self.create_response(state, f"Error: {str(e)}") 
\ No newline at end of file
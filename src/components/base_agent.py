@@ -5,6 +5,12 @@ from src.constants.routes import AgentRoutes
 from typing import Dict, Any
 
 class BaseAgent(ABC):
+    # Reply when the LLM circuit is open or the request ran out of time
+    DEGRADED_REPLY = (
+        "I'm having trouble answering right now. Please try again in a moment. "
+        "To check a number, send it in the format +1-XXX-XXX-XXXX."
+    )
+    
     def __init__(self, name: str):
         self.name = name
     
@@ -12,16 +18,20 @@ class BaseAgent(ABC):
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
-    def create_response(self, state: Dict[str, Any], content: str) -> Dict[str, Any]:
+    def create_response(self, state: Dict[str, Any], content: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """Create a response that includes both messages and next step"""
         messages = state.get("messages", []) + [
-            AIMessage(content=content, name=self.name)
+            AIMessage(content=content, name=self.name, response_metadata=metadata or {})
         ]
         return {
             "messages": messages,
             "next": AgentRoutes.SUPERVISOR.value
         }
     
+    def degraded_response(self, state: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        logger.warning(f"{self.name} degraded: {error}")
+        return self.create_response(state, self.DEGRADED_REPLY, metadata={"degraded": True})
+    
     def extract_content(self, response: Any) -> str:
         try:
             if isinstance(response, dict):
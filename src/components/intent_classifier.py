@@ -0,0 +1,209 @@
+import json
+import os
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.logger import logger
+
+TOKEN = re.compile(r"\w+")
+DIGIT = re.compile(r"\d")
+
+
+def ngrams(text: str) -> List[str]:
+    """Word unigrams and bigrams plus character trigrams of each word"""
+    # Digits collapse to 0 so every phone number shares the same features
+    words = [DIGIT.sub("0", word) for word in TOKEN.findall(text.lower())]
+    grams = [f"w:{word}" for word in words]
+    grams += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return grams
+
+
+def hash_features(text: str, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Signed feature hashing of a text into (indices, L2-normalized values)"""
+    counts: Dict[int, float] = {}
+    for gram in ngrams(text):
+        # crc32 rather than hash(), which is salted per process
+        code = zlib.crc32(gram.encode())
+        index = code % n_features
+        counts[index] = counts.get(index, 0.0) + (1.0 if code & 0x80000000 else -1.0)
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    norm = np.linalg.norm(values)
+    return indices, values / norm if norm else values
+
+
+def vectorize(texts: Sequence[str], n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sparse (rows, indices, values) triplets for a batch of texts"""
+    features = [hash_features(text, n_features) for text in texts]
+    rows = np.repeat(np.arange(len(texts)), [len(indices) for indices, _ in features])
+    indices = np.concatenate([indices for indices, _ in features] or [np.empty(0, np.int64)])
+    values = np.concatenate([values for _, values in features] or [np.empty(0, np.float32)])
+    return rows, indices, values
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed n-grams.
+
+    Weights are a dense (n_features, n_labels) matrix, but inputs stay sparse,
+    so a prediction costs a few dozen row lookups.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        weights: np.ndarray,
+        bias: np.ndarray,
+        report: Optional[Dict[str, Any]] = None
+    ):
+        self.labels = list(labels)
+        self.weights = weights
+        self.bias = bias
+        self.report = report or {}
+
+    @property
+    def n_features(self) -> int:
+        return self.weights.shape[0]
+
+    def _logits(self, rows: np.ndarray, indices: np.ndarray, values: np.ndarray, n_rows: int) -> np.ndarray:
+        logits = np.tile(self.bias, (n_rows, 1))
+        for label in range(len(self.labels)):
+            logits[:, label] += np.bincount(rows, weights=self.weights[indices, label] * values, minlength=n_rows)
+        return logits
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return _softmax(self._logits(*vectorize(texts, self.n_features), len(texts)))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely label and its probability"""
+        indices, values = hash_features(text, self.n_features)
+        probabilities = _softmax((values @ self.weights[indices] + self.bias)[None, :])[0]
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # np.savez appends .npz unless the name already ends with it
+        temp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            labels=np.array(self.labels),
+            weights=self.weights,
+            bias=self.bias,
+            report=np.array(json.dumps(self.report))
+        )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                labels=[str(label) for label in data["labels"]],
+                weights=data["weights"],
+                bias=data["bias"],
+                report=json.loads(str(data["report"]))
+            )
+
+
+def _fit(
+    rows: np.ndarray,
+    indices: np.ndarray,
+    values: np.ndarray,
+    targets: np.ndarray,
+    n_labels: int,
+    n_features: int,
+    epochs: int,
+    learning_rate: float,
+    l2: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Full-batch Adam on the L2-regularized cross-entropy"""
+    n_rows = len(targets)
+    weights = np.zeros((n_features, n_labels), dtype=np.float32)
+    bias = np.zeros(n_labels, dtype=np.float32)
+    one_hot = np.eye(n_labels, dtype=np.float32)[targets]
+    moments = [(np.zeros_like(weights), np.zeros_like(weights)), (np.zeros_like(bias), np.zeros_like(bias))]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    model = IntentClassifier(range(n_labels), weights, bias)
+
+    for step in range(1, epochs + 1):
+        error = (_softmax(model._logits(rows, indices, values, n_rows)) - one_hot) / n_rows
+        grad_weights = np.stack([
+            np.bincount(indices, weights=values * error[rows, label], minlength=n_features)
+            for label in range(n_labels)
+        ], axis=1).astype(np.float32) + l2 * weights
+        grad_bias = error.sum(axis=0)
+        for param, grad, (m, v) in ((weights, grad_weights, moments[0]), (bias, grad_bias, moments[1])):
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad * grad
+            param -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+    return weights, bias
+
+
+def train_intent_classifier(
+    texts: Sequence[str],
+    labels: Sequence[str],
+    n_features: int = 2 ** 18,
+    epochs: int = 100,
+    learning_rate: float = 0.05,
+    l2: float = 1e-4,
+    holdout: float = 0.2,
+    threshold: float = 0.9,
+    seed: int = 0
+) -> IntentClassifier:
+    """Train on a shuffled split and evaluate on the `holdout` fraction.
+
+    The report holds overall holdout accuracy plus, at `threshold`, the share
+    of messages the classifier would route itself (coverage) and its accuracy
+    on those.
+    """
+    label_names = sorted(set(labels))
+    targets = np.array([label_names.index(label) for label in labels])
+    order = np.random.default_rng(seed).permutation(len(texts))
+    n_holdout = int(len(texts) * holdout)
+    test, train = order[:n_holdout], order[n_holdout:]
+
+    rows, indices, values = vectorize([texts[i] for i in train], n_features)
+    weights, bias = _fit(
+        rows, indices, values, targets[train], len(label_names), n_features, epochs, learning_rate, l2
+    )
+    report: Dict[str, Any] = {
+        "examples": len(texts),
+        "train": len(train),
+        "holdout": n_holdout,
+        "labels": {name: int((targets == i).sum()) for i, name in enumerate(label_names)},
+        "threshold": threshold,
+    }
+    classifier = IntentClassifier(label_names, weights, bias, report)
+
+    if n_holdout:
+        probabilities = classifier.predict_proba([texts[i] for i in test])
+        correct = probabilities.argmax(axis=1) == targets[test]
+        confident = probabilities.max(axis=1) >= threshold
+        report["accuracy"] = round(float(correct.mean()), 4)
+        report["coverage"] = round(float(confident.mean()), 4)
+        report["confident_accuracy"] = round(float(correct[confident].mean()), 4) if confident.any() else None
+    return classifier
+
+
+def load_intent_classifier(path: str) -> Optional[IntentClassifier]:
+    """The trained classifier at path, or None (routing stays on the LLM) if it is missing"""
+    if not os.path.exists(path):
+        logger.warning(f"Intent classifier {path} not found, routing every message with the LLM")
+        return None
+    classifier = IntentClassifier.load(path)
+    logger.info(f"Loaded intent classifier {path}: {classifier.report}")
+    return classifier
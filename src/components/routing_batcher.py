@@ -0,0 +1,84 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from src.models.agents import BatchRoutingDecisions, RoutingDecision
+from src.prompts.analysis_prompts import AnalysisPrompts
+from src.services.resilience import current_deadline, deadline_context
+from src.utils.logger import logger
+
+
+class RoutingBatcher:
+    """Collects routing requests from concurrent sessions into one LLM call.
+
+    Requests wait at most window_ms for others to arrive, or until max_batch
+    are queued, then a single batched prompt is sent and every waiting
+    coroutine receives its own decision. A decision missing from the batched
+    answer resolves to None so the caller can apply its parse-failure fallback.
+    The shared call runs until the latest deadline in the batch, so one
+    caller running out of time does not cut it short for the others.
+    """
+
+    def __init__(self, llm, window_ms: int, max_batch: int):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.router = llm.with_structured_output(BatchRoutingDecisions, include_raw=True)
+        self._pending: List[Tuple[str, str, asyncio.Future, Optional[float]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only holds weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def route(self, current_message: str, conversation_history: str) -> Optional[RoutingDecision]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((current_message, conversation_history, future, current_deadline()))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_now)
+        return await future
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            deadlines = [deadline for *_, deadline in batch]
+            # The timer callback and create_task would otherwise inherit the first caller's deadline
+            deadline = None if None in deadlines else max(deadlines)
+            task = asyncio.create_task(self._send(batch), context=deadline_context(deadline))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, str, asyncio.Future, Optional[float]]]):
+        decisions = {}
+        try:
+            conversations = "\n".join(
+                AnalysisPrompts.BATCH_CONVERSATION.format(
+                    index=index,
+                    current_message=current_message,
+                    conversation_history=conversation_history
+                )
+                for index, (current_message, conversation_history, *_) in enumerate(batch)
+            )
+            prompt = AnalysisPrompts.SUPERVISOR_BATCH_ANALYSIS.format(conversations=conversations)
+
+            logger.info(f"Sending batched routing call for {len(batch)} conversations")
+            result = await self.router.ainvoke([{"role": "system", "content": prompt}])
+            parsed = result.get("parsed")
+            if parsed is None:
+                logger.error(f"Error parsing batched supervisor response: {result.get('parsing_error')}")
+            decisions = {d.index: d for d in parsed.decisions} if parsed else {}
+        except Exception as e:
+            logger.error(f"Batched routing call failed: {str(e)}")
+        finally:
+            # Every caller gets an answer, even if the call was cancelled
+            for index, (_, _, future, _) in enumerate(batch):
+                if future.done():
+                    continue
+                decision = decisions.get(index)
+                future.set_result(
+                    RoutingDecision(selected_agent=decision.selected_agent, reasoning=decision.reasoning)
+                    if decision else None
+                )
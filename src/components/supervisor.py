@@ -1,15 +1,27 @@
-from src.utils.logger import logger
+from src.utils.logger import logger, Capped
 from src.constants.routes import AgentRoutes
+from src.models.agents import RoutingDecision
+from src.monitoring.metrics import ROUTING_DECISIONS, ROUTING_PARSE_FAILURES
 from typing import Dict, Any
-import json
 from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.graph import END
 
 class Supervisor:
-    def __init__(self, llm, analysis_prompt):
+    # Process-wide count of routing responses that could not be parsed
+    parse_failures = 0
+
+    def __init__(self, llm, analysis_prompt, batcher=None, classifier=None, threshold: float = 1.0):
         self.llm = llm
         self.analysis_prompt = analysis_prompt
-    
+        # Optional RoutingBatcher sharing one LLM call across concurrent sessions
+        self.batcher = batcher
+        # Optional IntentClassifier answering messages it is at least `threshold` sure of
+        self.classifier = classifier
+        self.threshold = threshold
+        # Tool calling constrains the answer to the RoutingDecision enum and
+        # parses it exactly once; include_raw surfaces parse errors without raising
+        self.router = llm.with_structured_output(RoutingDecision, include_raw=True)
+
     def format_history(self, messages: list) -> str:
         """Format conversation history for the prompt"""
         formatted = []
@@ -20,44 +32,53 @@ class Supervisor:
                 agent_name = getattr(msg, 'name', 'Assistant')
                 formatted.append(f"{agent_name}: {msg.content}")
         return "\n".join(formatted)
-    
-    def clean_json_response(self, content: str) -> str:
-        """Clean and extract JSON from LLM response"""
-        try:
-            # Remove any leading/trailing whitespace
-            content = content.strip()
-            
-            # Find the first '{' and last '}'
-            start = content.find('{')
-            end = content.rfind('}')
-            
-            if start >= 0 and end > start:
-                # Extract just the JSON part
-                json_str = content[start:end + 1]
-                
-                # Try to parse it to validate
-                json.loads(json_str)
-                return json_str
-            
-            raise ValueError("No valid JSON found in response")
-            
-        except Exception as e:
-            logger.error(f"Error cleaning JSON response: {e}")
-            logger.error(f"Original content: {content}")
-            # Return a default response
-            return json.dumps({
-                "decision": {
-                    "selected_agent": "greeter",
-                    "reasoning": "Error parsing response, defaulting to greeter"
-                }
-            })
-    
+
+    async def route(self, current_msg: str, history: list) -> RoutingDecision:
+        """Ask the LLM for a routing decision, defaulting to greeter if it can't be parsed"""
+        if self.classifier is not None:
+            agent, confidence = self.classifier.predict(current_msg)
+            if confidence >= self.threshold:
+                ROUTING_DECISIONS.labels(source="classifier").inc()
+                return RoutingDecision(
+                    selected_agent=agent,
+                    reasoning=f"Intent classifier, confidence {confidence:.2f}"
+                )
+        ROUTING_DECISIONS.labels(source="llm").inc()
+
+        history_str = self.format_history(history)
+        logger.info("Supervisor analyzing message: %s", Capped(current_msg))
+
+        if self.batcher is not None:
+            decision = await self.batcher.route(current_msg, history_str)
+        else:
+            analysis_prompt = self.analysis_prompt.format(
+                current_message=current_msg,
+                conversation_history=history_str
+            )
+            result = await self.router.ainvoke([{
+                "role": "system",
+                "content": analysis_prompt
+            }])
+            decision = result.get("parsed")
+            if decision is None:
+                logger.error(f"Raw response: {result.get('raw')} ({result.get('parsing_error')})")
+
+        if decision is None:
+            Supervisor.parse_failures += 1
+            ROUTING_PARSE_FAILURES.inc()
+            logger.error(f"Error parsing supervisor response ({Supervisor.parse_failures} so far)")
+            return RoutingDecision(
+                selected_agent=AgentRoutes.GREETER.value,
+                reasoning="Error parsing response, defaulting to greeter"
+            )
+        return decision
+
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
             logger.info("Supervisor node processing...")
             last_message = state["messages"][-1]
             history = state["messages"][:-1]
-            
+
             # If last message was from an agent, we're done
             if isinstance(last_message, AIMessage):
                 logger.info("Last message was from agent, ending conversation")
@@ -65,50 +86,20 @@ class Supervisor:
                     "messages": state["messages"],
                     "next": END
                 }
-            
-            current_msg = last_message.content if isinstance(last_message, (dict, HumanMessage)) else last_message.content
-            history_str = self.format_history(history)
-            
-            # Format prompt
-            analysis_prompt = self.analysis_prompt.format(
-                current_message=current_msg,
-                conversation_history=history_str
-            )
-            
-            logger.info(f"Supervisor analyzing message: {current_msg}")
-            response = self.llm.invoke([{
-                "role": "system",
-                "content": analysis_prompt
-            }])
-            
-            try:
-                # Clean and parse the response
-                json_str = self.clean_json_response(response.content)
-                analysis = json.loads(json_str)
-                
-                # Extract the decision
-                next_agent = analysis['decision']['selected_agent']
-                reasoning = analysis['decision']['reasoning']
-                
-                logger.info(f"Supervisor selected agent: {next_agent} (Reason: {reasoning})")
-                
-                # Return state with next agent
-                return {
-                    "messages": state["messages"],
-                    "next": next_agent if next_agent != AgentRoutes.FINISH.value else END
-                }
-                
-            except Exception as e:
-                logger.error(f"Error parsing supervisor response: {e}")
-                logger.error(f"Raw response: {response.content}")
-                return {
-                    "messages": state["messages"],
-                    "next": AgentRoutes.GREETER.value
-                }
-            
+
+            decision = await self.route(last_message.content, history)
+            next_agent = decision.selected_agent
+            logger.info(f"Supervisor selected agent: {next_agent} (Reason: {decision.reasoning})")
+
+            # Return state with next agent
+            return {
+                "messages": state["messages"],
+                "next": next_agent if next_agent != AgentRoutes.FINISH.value else END
+            }
+
         except Exception as e:
             logger.error(f"Supervisor error: {str(e)}")
             return {
                 "messages": state["messages"],
                 "next": AgentRoutes.GREETER.value
-            } 
\ No newline at end of file
+            }
@@ -23,6 +23,21 @@ class Settings(BaseSettings):
     # Model Settings
     GROQ_MODEL: str = Field(default="llama-3.1-8b-instant")
     
+    # Per-node model tiers: an empty <NODE>_MODEL falls back to GROQ_MODEL and
+    # <NODE>_MAX_TOKENS=0 keeps the provider default. Nodes with equal settings share a client.
+    SUPERVISOR_MODEL: str = os.getenv("SUPERVISOR_MODEL", "")
+    SUPERVISOR_TEMPERATURE: float = float(os.getenv("SUPERVISOR_TEMPERATURE", "0"))
+    SUPERVISOR_MAX_TOKENS: int = int(os.getenv("SUPERVISOR_MAX_TOKENS", "128"))
+    CHECKER_MODEL: str = os.getenv("CHECKER_MODEL", "")
+    CHECKER_TEMPERATURE: float = float(os.getenv("CHECKER_TEMPERATURE", "0.1"))
+    CHECKER_MAX_TOKENS: int = int(os.getenv("CHECKER_MAX_TOKENS", "0"))
+    REPORTER_MODEL: str = os.getenv("REPORTER_MODEL", "")
+    REPORTER_TEMPERATURE: float = float(os.getenv("REPORTER_TEMPERATURE", "0.1"))
+    REPORTER_MAX_TOKENS: int = int(os.getenv("REPORTER_MAX_TOKENS", "0"))
+    GREETER_MODEL: str = os.getenv("GREETER_MODEL", "")
+    GREETER_TEMPERATURE: float = float(os.getenv("GREETER_TEMPERATURE", "0.1"))
+    GREETER_MAX_TOKENS: int = int(os.getenv("GREETER_MAX_TOKENS", "0"))
+    
     # Database Settings
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
     DB_PORT: int = int(os.getenv("DB_PORT", "3306"))
@@ -30,6 +45,11 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
     DB_NAME: str = os.getenv("DB_NAME", "fraud_detection")
     
+    # Storage backend (mysql or sqlite, an embedded single-node database file)
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "mysql")
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "fraud_detection.sqlite")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    
     # Project Settings
     OPIK_PROJECT_NAME: str = os.getenv("OPIK_PROJECT_NAME", "")
     COMET_URL: str = os.getenv("COMET_URL", "")
@@ -43,6 +63,106 @@ class Settings(BaseSettings):
     DB_POOL_MAX_OVERFLOW: int = int(os.getenv("DB_POOL_MAX_OVERFLOW", "64"))
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     
+    # Routing micro-batching across sessions (a window of 0 disables it)
+    ROUTING_BATCH_WINDOW_MS: int = int(os.getenv("ROUTING_BATCH_WINDOW_MS", "0"))
+    ROUTING_BATCH_MAX_SIZE: int = int(os.getenv("ROUTING_BATCH_MAX_SIZE", "16"))
+    
+    # Graph Checkpointing (mysql, sqlite or none)
+    CHECKPOINT_BACKEND: str = os.getenv("CHECKPOINT_BACKEND", "mysql")
+    CHECKPOINT_SQLITE_PATH: str = os.getenv("CHECKPOINT_SQLITE_PATH", "checkpoints.sqlite")
+    # Checkpoints kept per thread and namespace, older ones are pruned on write (0 keeps all)
+    CHECKPOINT_KEEP_LAST: int = int(os.getenv("CHECKPOINT_KEEP_LAST", "10"))
+    HISTORY_WINDOW: int = int(os.getenv("HISTORY_WINDOW", "10"))
+    
+    # Speculative routing: run the predicted (side-effect free) agent alongside the supervisor
+    SPECULATIVE_ROUTING: bool = os.getenv("SPECULATIVE_ROUTING", "false").lower() == "true"
+    SPECULATIVE_AGENTS: str = os.getenv("SPECULATIVE_AGENTS", "greeter,checker")
+    
+    # Checker lookups: max numbers per message, concurrent lookups and cache TTL (seconds)
+    CHECKER_MAX_NUMBERS: int = int(os.getenv("CHECKER_MAX_NUMBERS", "10"))
+    CHECKER_LOOKUP_CONCURRENCY: int = int(os.getenv("CHECKER_LOOKUP_CONCURRENCY", "5"))
+    CHECKER_CACHE_TTL: int = int(os.getenv("CHECKER_CACHE_TTL", "60"))
+    
+    # Message analytics: rows per insert, max seconds a row waits, max queued rows
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", "50"))
+    ANALYTICS_FLUSH_INTERVAL: float = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2.0"))
+    ANALYTICS_MAX_PENDING: int = int(os.getenv("ANALYTICS_MAX_PENDING", "10000"))
+    
+    # Tracing: fraction of requests traced (0 disables), JSONL output and rotation
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0.0"))
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "logs/traces.jsonl")
+    TRACE_MAX_BYTES: int = int(os.getenv("TRACE_MAX_BYTES", "10485760"))
+    TRACE_BACKUP_COUNT: int = int(os.getenv("TRACE_BACKUP_COUNT", "5"))
+    TRACE_BATCH_SIZE: int = int(os.getenv("TRACE_BATCH_SIZE", "256"))
+    TRACE_FLUSH_INTERVAL: float = float(os.getenv("TRACE_FLUSH_INTERVAL", "1.0"))
+    
+    # Logging: max chars per logged payload, per-category sample rates, queued records cap
+    LOG_MAX_PAYLOAD: int = int(os.getenv("LOG_MAX_PAYLOAD", "500"))
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "stream=0.1,node=1.0")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    
+    # LLM cassettes: off, record or replay; replayed latency = recorded latency * scale
+    LLM_CASSETTE_MODE: str = os.getenv("LLM_CASSETTE_MODE", "off")
+    LLM_CASSETTE_PATH: str = os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.json")
+    LLM_CASSETTE_LATENCY_SCALE: float = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0.0"))
+    
+    # Session sweeper: sessions without a message for SESSION_IDLE_MINUTES become inactive
+    SESSION_SWEEP_ENABLED: bool = os.getenv("SESSION_SWEEP_ENABLED", "true").lower() == "true"
+    SESSION_IDLE_MINUTES: int = int(os.getenv("SESSION_IDLE_MINUTES", "30"))
+    SESSION_SWEEP_INTERVAL: float = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+    SESSION_SWEEP_BATCH_SIZE: int = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "500"))
+    SESSION_SWEEP_MAX_BATCHES: int = int(os.getenv("SESSION_SWEEP_MAX_BATCHES", "20"))
+    
+    # One turn per session at a time: wait up to SESSION_LOCK_WAIT seconds, then 409.
+    # The cross-worker lease expires after SESSION_LEASE_TTL if its worker dies.
+    SESSION_LOCK_WAIT: float = float(os.getenv("SESSION_LOCK_WAIT", "10"))
+    SESSION_LEASE_TTL: int = int(os.getenv("SESSION_LEASE_TTL", "120"))
+    
+    # Idempotency-Key on POST /chat: duplicates share one execution, retries replay its result.
+    # Without the header a key can be derived from session, user and content for IDEMPOTENCY_DERIVED_TTL
+    # seconds. Off by default: a user repeating a message ("yes") inside the window would get the old reply.
+    IDEMPOTENCY_ENABLED: bool = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+    IDEMPOTENCY_TTL: int = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    IDEMPOTENCY_DERIVED_TTL: int = int(os.getenv("IDEMPOTENCY_DERIVED_TTL", "0"))
+    IDEMPOTENCY_PENDING_TTL: int = int(os.getenv("IDEMPOTENCY_PENDING_TTL", "120"))
+    IDEMPOTENCY_WAIT: float = float(os.getenv("IDEMPOTENCY_WAIT", "60"))
+    
+    # Local intent classifier answering confident routing decisions without the LLM.
+    # Train it with: python -m src.scripts.train_intent_classifier
+    INTENT_CLASSIFIER_ENABLED: bool = os.getenv("INTENT_CLASSIFIER_ENABLED", "false").lower() == "true"
+    INTENT_CLASSIFIER_PATH: str = os.getenv("INTENT_CLASSIFIER_PATH", "models/intent_classifier.npz")
+    INTENT_CLASSIFIER_THRESHOLD: float = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.9"))
+    
+    # LLM calls stop at the request deadline (API_TIMEOUT), send one hedged duplicate once
+    # they run past LLM_HEDGE_PERCENTILE of recent latencies, and fail fast while the
+    # circuit is open (after LLM_BREAKER_FAILURES consecutive failures, for LLM_BREAKER_RESET_SECONDS)
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+    
+    # Cold-session archival to Parquet and monthly chat_messages partitions (MySQL)
+    ARCHIVE_ENABLED: bool = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "archive")
+    ARCHIVE_IDLE_DAYS: int = int(os.getenv("ARCHIVE_IDLE_DAYS", "30"))
+    ARCHIVE_BATCH_SESSIONS: int = int(os.getenv("ARCHIVE_BATCH_SESSIONS", "200"))
+    ARCHIVE_CHUNK_ROWS: int = int(os.getenv("ARCHIVE_CHUNK_ROWS", "5000"))
+    ARCHIVE_COMPRESSION: str = os.getenv("ARCHIVE_COMPRESSION", "zstd")
+    ARCHIVE_INTERVAL: float = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+    CHAT_PARTITION_MONTHS_AHEAD: int = int(os.getenv("CHAT_PARTITION_MONTHS_AHEAD", "3"))
+    
+    # Analytics export (GET /api/v1/export is disabled while EXPORT_API_TOKEN is empty)
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", "exports")
+    EXPORT_CHUNK_ROWS: int = int(os.getenv("EXPORT_CHUNK_ROWS", "10000"))
+    EXPORT_COMPRESSION: str = os.getenv("EXPORT_COMPRESSION", "zstd")
+    EXPORT_API_TOKEN: str = os.getenv("EXPORT_API_TOKEN", "")
+    
+    # Serialization: JSON_CODEC (json|orjson) for JSON columns and API responses,
+    # CACHE_CODEC (json|orjson|msgpack) for Redis values, msgpack needs the msgpack extra
+    JSON_CODEC: str = os.getenv("JSON_CODEC", "orjson")
+    CACHE_CODEC: str = os.getenv("CACHE_CODEC", "orjson")
+    
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
     RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "100"))
@@ -0,0 +1,405 @@
+import asyncio
+import random
+import sqlite3
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.core.config import get_settings
+from src.database.connection import DatabaseConnection
+from src.utils.logger import logger
+
+
+class ThreadedAsyncSaverMixin:
+    """Serve the async saver API by running the sync implementation in a worker thread.
+
+    The graph is driven with astream, so savers must implement the async methods;
+    running the blocking calls off the event loop keeps one saver instance usable
+    from every request without binding it to a particular loop.
+    """
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+class ThreadedSqliteSaver(ThreadedAsyncSaverMixin, SqliteSaver):
+    """SQLite checkpointer for single-node deployments"""
+
+    keep_last = 0
+
+    @classmethod
+    def from_path(cls, path: str, keep_last: int = 0) -> "ThreadedSqliteSaver":
+        # check_same_thread=False is safe, SqliteSaver serializes access with a lock
+        saver = cls(sqlite3.connect(path, check_same_thread=False))
+        saver.keep_last = keep_last
+        return saver
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        if self.keep_last:
+            self.prune(str(config["configurable"]["thread_id"]), config["configurable"]["checkpoint_ns"])
+        return next_config
+
+    def prune(self, thread_id: str, checkpoint_ns: str = "", keep_last: Optional[int] = None) -> int:
+        """Delete all but the newest `keep_last` checkpoints of a thread and their writes"""
+        keep_last = self.keep_last if keep_last is None else keep_last
+        with self.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT checkpoint_id FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ?
+                ORDER BY checkpoint_id DESC
+                LIMIT 1 OFFSET {int(keep_last)}
+            """, (thread_id, checkpoint_ns))
+            row = cursor.fetchone()
+            if row is None:
+                return 0
+            params = (thread_id, checkpoint_ns, row[0])
+            cursor.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?", params
+            )
+            cursor.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?", params
+            )
+            return cursor.rowcount
+
+
+class MySQLCheckpointSaver(ThreadedAsyncSaverMixin, BaseCheckpointSaver[str]):
+    """Checkpointer storing LangGraph state in the application's MySQL database.
+
+    Mirrors the SqliteSaver schema so state written by any uvicorn worker can be
+    resumed by any other worker using the session_id as thread_id.
+    """
+
+    def __init__(self, db: Optional[DatabaseConnection] = None, keep_last: int = 0):
+        super().__init__()
+        self.jsonplus_serde = JsonPlusSerializer()
+        self.db = db or DatabaseConnection()
+        # Each super-step stores the whole state, so old checkpoints are pruned on write
+        self.keep_last = keep_last
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure checkpoint tables exist"""
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS graph_checkpoints (
+                        thread_id VARCHAR(100) NOT NULL,
+                        checkpoint_ns VARCHAR(255) NOT NULL DEFAULT '',
+                        checkpoint_id VARCHAR(64) NOT NULL,
+                        parent_checkpoint_id VARCHAR(64),
+                        type VARCHAR(32),
+                        checkpoint LONGBLOB,
+                        metadata BLOB,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS graph_checkpoint_writes (
+                        thread_id VARCHAR(100) NOT NULL,
+                        checkpoint_ns VARCHAR(255) NOT NULL DEFAULT '',
+                        checkpoint_id VARCHAR(64) NOT NULL,
+                        task_id VARCHAR(64) NOT NULL,
+                        idx INT NOT NULL,
+                        channel VARCHAR(255) NOT NULL,
+                        type VARCHAR(32),
+                        value LONGBLOB,
+                        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+
+                logger.info("Checkpoint tables verified/created successfully")
+
+        except Exception as e:
+            logger.error(f"Error ensuring checkpoint tables: {str(e)}")
+            raise
+
+    def _load_writes(self, cursor, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[tuple]:
+        cursor.execute("""
+            SELECT task_id, channel, type, value
+            FROM graph_checkpoint_writes
+            WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id = %s
+            ORDER BY task_id, idx
+        """, (thread_id, checkpoint_ns, checkpoint_id))
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, bytes(value))))
+            for task_id, channel, type_, value in cursor.fetchall()
+        ]
+
+    def _to_tuple(self, cursor, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata = row
+        return CheckpointTuple(
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            self.serde.loads_typed((type_, bytes(checkpoint))),
+            self.jsonplus_serde.loads(bytes(metadata)) if metadata is not None else {},
+            (
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            self._load_writes(cursor, thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.db.get_cursor() as cursor:
+            if checkpoint_id := get_checkpoint_id(config):
+                cursor.execute("""
+                    SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                           type, checkpoint, metadata
+                    FROM graph_checkpoints
+                    WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id = %s
+                """, (thread_id, checkpoint_ns, checkpoint_id))
+            else:
+                cursor.execute("""
+                    SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                           type, checkpoint, metadata
+                    FROM graph_checkpoints
+                    WHERE thread_id = %s AND checkpoint_ns = %s
+                    ORDER BY checkpoint_id DESC
+                    LIMIT 1
+                """, (thread_id, checkpoint_ns))
+            rows = cursor.fetchall()
+            if not rows:
+                return None
+            return self._to_tuple(cursor, rows[0])
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        wheres, params = [], []
+        if config is not None:
+            wheres.append("thread_id = %s")
+            params.append(str(config["configurable"]["thread_id"]))
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                wheres.append("checkpoint_ns = %s")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                wheres.append("checkpoint_id = %s")
+                params.append(checkpoint_id)
+        if before is not None:
+            wheres.append("checkpoint_id < %s")
+            params.append(get_checkpoint_id(before))
+
+        query = """
+            SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                   type, checkpoint, metadata
+            FROM graph_checkpoints
+        """
+        if wheres:
+            query += " WHERE " + " AND ".join(wheres)
+        query += " ORDER BY checkpoint_id DESC"
+        # Metadata filters are applied after decoding, so only push the limit down without one
+        if limit and not filter:
+            query += f" LIMIT {int(limit)}"
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            count = 0
+            for row in rows:
+                checkpoint_tuple = self._to_tuple(cursor, row)
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                yield checkpoint_tuple
+                count += 1
+                if limit and count >= limit:
+                    break
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        serialized_metadata = self.jsonplus_serde.dumps(get_checkpoint_metadata(config, metadata))
+        with self.db.get_cursor() as cursor:
+            cursor.execute("""
+                REPLACE INTO graph_checkpoints (
+                    thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                    type, checkpoint, metadata
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (
+                str(thread_id),
+                checkpoint_ns,
+                checkpoint["id"],
+                config["configurable"].get("checkpoint_id"),
+                type_,
+                serialized_checkpoint,
+                serialized_metadata
+            ))
+            if self.keep_last:
+                self._prune(cursor, str(thread_id), checkpoint_ns, self.keep_last)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        verb = "REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT IGNORE"
+        with self.db.get_cursor() as cursor:
+            cursor.executemany(f"""
+                {verb} INTO graph_checkpoint_writes (
+                    thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, [
+                (
+                    str(config["configurable"]["thread_id"]),
+                    str(config["configurable"]["checkpoint_ns"]),
+                    str(config["configurable"]["checkpoint_id"]),
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    *self.serde.dumps_typed(value),
+                )
+                for idx, (channel, value) in enumerate(writes)
+            ])
+
+    def _prune(self, cursor, thread_id: str, checkpoint_ns: str, keep_last: int) -> int:
+        cursor.execute(f"""
+            SELECT checkpoint_id FROM graph_checkpoints
+            WHERE thread_id = %s AND checkpoint_ns = %s
+            ORDER BY checkpoint_id DESC
+            LIMIT 1 OFFSET {int(keep_last)}
+        """, (thread_id, checkpoint_ns))
+        rows = cursor.fetchall()
+        if not rows:
+            return 0
+        params = (thread_id, checkpoint_ns, rows[0][0])
+        cursor.execute("""
+            DELETE FROM graph_checkpoint_writes
+            WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id <= %s
+        """, params)
+        cursor.execute("""
+            DELETE FROM graph_checkpoints
+            WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id <= %s
+        """, params)
+        return cursor.rowcount
+
+    def prune(self, thread_id: str, checkpoint_ns: str = "", keep_last: Optional[int] = None) -> int:
+        """Delete all but the newest `keep_last` checkpoints of a thread and their writes"""
+        with self.db.get_cursor() as cursor:
+            return self._prune(
+                cursor, str(thread_id), checkpoint_ns, self.keep_last if keep_last is None else keep_last
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM graph_checkpoints WHERE thread_id = %s", (str(thread_id),))
+            cursor.execute("DELETE FROM graph_checkpoint_writes WHERE thread_id = %s", (str(thread_id),))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Same monotonically increasing string versions as SqliteSaver
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+@lru_cache()
+def get_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Get the process-wide checkpointer selected by CHECKPOINT_BACKEND (None disables it)"""
+    settings = get_settings()
+    backend = settings.CHECKPOINT_BACKEND.lower()
+    keep_last = settings.CHECKPOINT_KEEP_LAST
+    if backend == "mysql" and settings.DB_BACKEND.lower() == "sqlite":
+        # No MySQL server in an embedded deployment, keep checkpoints in SQLite too
+        return ThreadedSqliteSaver.from_path(settings.CHECKPOINT_SQLITE_PATH, keep_last)
+    if backend == "mysql":
+        return MySQLCheckpointSaver(keep_last=keep_last)
+    if backend == "sqlite":
+        return ThreadedSqliteSaver.from_path(settings.CHECKPOINT_SQLITE_PATH, keep_last)
+    if backend != "none":
+        logger.warning(f"Unknown CHECKPOINT_BACKEND '{backend}', checkpointing disabled")
+    return None
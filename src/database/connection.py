@@ -2,10 +2,12 @@ import mysql.connector
 from mysql.connector import Error, pooling
 from src.core.config import get_settings
 from src.utils.logger import logger
+from src.monitoring.metrics import DB_POOL_IN_USE, DB_POOL_SIZE
 import time
 from contextlib import contextmanager
 
 class DatabaseConnection:
+    dialect = "mysql"
     _instance = None
     _pool = None
     
@@ -41,6 +43,7 @@ class DatabaseConnection:
                 
                 # Create the connection pool
                 self._pool = mysql.connector.pooling.MySQLConnectionPool(**pool_config)
+                DB_POOL_SIZE.set(self.settings.DB_POOL_SIZE)
                 logger.info("Database connection pool created successfully")
                 
                 # Initialize tables
@@ -96,12 +99,14 @@ class DatabaseConnection:
         conn = None
         try:
             conn = self._pool.get_connection()
+            DB_POOL_IN_USE.inc()
             yield conn
         except Error as e:
             logger.error(f"Error getting connection from pool: {str(e)}")
             raise Exception(f"Database connection error: {str(e)}")
         finally:
             if conn:
+                DB_POOL_IN_USE.dec()
                 try:
                     conn.close()
                 except Error:
@@ -114,6 +119,7 @@ class DatabaseConnection:
         cursor = None
         try:
             conn = self._pool.get_connection()
+            DB_POOL_IN_USE.inc()
             cursor = conn.cursor(dictionary=dictionary)
             yield cursor
             conn.commit()  # Commit after successful execution
@@ -123,11 +129,38 @@ class DatabaseConnection:
             logger.error(f"Database cursor error: {str(e)}")
             raise Exception(f"Database operation failed: {str(e)}")
         finally:
+            # A streaming read closed early leaves rows on the wire, which would
+            # fail cursor.close() and return the connection to the pool dirty
+            if conn and conn.unread_result:
+                conn.consume_results()
             if cursor:
                 cursor.close()
             if conn:
+                DB_POOL_IN_USE.dec()
                 conn.close()
     
+    def ensure_index(self, cursor, table: str, index: str, columns: str):
+        """Add an index to an existing table unless it already exists"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """, (table, index))
+        if not cursor.fetchone()[0]:
+            logger.info(f"Adding index {index} to {table}")
+            cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} ({columns})")
+
+    def ensure_column(self, cursor, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table unless it already exists, returning whether it was added"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+        if cursor.fetchone()[0]:
+            return False
+        logger.info(f"Adding column {column} to {table}")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    
     def setup_tables(self):
         """Setup database tables with error handling"""
         try:
@@ -198,4 +231,16 @@ class DatabaseConnection:
                 
         except Exception as e:
             logger.error(f"Error setting up tables: {str(e)}")
-            raise Exception(f"Failed to setup database tables: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to setup database tables: {str(e)}")
+
+
+def get_database():
+    """Storage backend selected by DB_BACKEND (mysql or sqlite)"""
+    settings = get_settings()
+    backend = settings.DB_BACKEND.lower()
+    if backend == "sqlite":
+        from src.database.sqlite_connection import get_sqlite_connection
+        return get_sqlite_connection(settings.SQLITE_PATH)
+    if backend != "mysql":
+        raise ValueError(f"Unknown DB_BACKEND: {backend}")
+    return DatabaseConnection()
@@ -1,4 +1,5 @@
 from src.database.connection import DatabaseConnection
+from src.database.repositories.analytics_repository import MESSAGE_ANALYTICS_TABLE, NODE_ANALYTICS_TABLE
 from src.utils.logger import logger
 
 def init_database():
@@ -28,6 +29,7 @@ def init_database():
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                     last_message_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_turn INT NOT NULL DEFAULT 0,
                     metadata JSON,
                     INDEX idx_session_lookup (session_id, status),
                     INDEX idx_user_sessions (user_id, status),
@@ -61,25 +63,9 @@ def init_database():
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """)
 
-            # Create message analytics table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS message_analytics (
-                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
-                    message_id VARCHAR(100) NOT NULL UNIQUE,
-                    session_id VARCHAR(100) NOT NULL,
-                    processing_time FLOAT,
-                    token_count INT,
-                    completion_tokens INT,
-                    prompt_tokens INT,
-                    model_name VARCHAR(100),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    
-                    INDEX idx_message_stats (message_id),
-                    INDEX idx_session_stats (session_id),
-                    FOREIGN KEY (message_id) REFERENCES chat_messages(message_id) ON DELETE CASCADE,
-                    FOREIGN KEY (session_id) REFERENCES chat_sessions(session_id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """)
+            # Analytics tables share their DDL with AnalyticsRepository
+            cursor.execute(MESSAGE_ANALYTICS_TABLE.format(table="message_analytics"))
+            cursor.execute(NODE_ANALYTICS_TABLE)
 
             db.connection.commit()
             logger.info("Production database schema created successfully")
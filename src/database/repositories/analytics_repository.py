@@ -0,0 +1,202 @@
+from typing import List, Dict, Any
+from src.database.connection import get_database
+from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
+
+# Allowed group_by values mapped to their node_analytics column, never interpolate user input directly
+GROUP_COLUMNS = {
+    "node": "a.node",
+    "model": "a.model_name",
+}
+
+# Archival deletes messages; SET NULL keeps their analytics rows
+MESSAGE_ANALYTICS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        message_id VARCHAR(100) UNIQUE,
+        session_id VARCHAR(100) NOT NULL,
+        processing_time FLOAT,
+        token_count INT,
+        completion_tokens INT,
+        prompt_tokens INT,
+        model_name VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        INDEX idx_message_stats (message_id),
+        INDEX idx_session_stats (session_id),
+        FOREIGN KEY (message_id) REFERENCES chat_messages(message_id) ON DELETE SET NULL,
+        FOREIGN KEY (session_id) REFERENCES chat_sessions(session_id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# One row per graph node that ran in a turn, the supervisor included.
+# No foreign key to chat_messages, so the rows outlive message archival.
+NODE_ANALYTICS_TABLE = """
+    CREATE TABLE IF NOT EXISTS node_analytics (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        message_id VARCHAR(100) NOT NULL,
+        session_id VARCHAR(100) NOT NULL,
+        node VARCHAR(50) NOT NULL,
+        processing_time FLOAT,
+        token_count INT,
+        completion_tokens INT,
+        prompt_tokens INT,
+        model_name VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        UNIQUE KEY uniq_message_node (message_id, node),
+        INDEX idx_node_created (created_at),
+        FOREIGN KEY (session_id) REFERENCES chat_sessions(session_id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+MESSAGE_ANALYTICS_COLUMNS = (
+    "id, message_id, session_id, processing_time, token_count, "
+    "completion_tokens, prompt_tokens, model_name, created_at"
+)
+
+@instrument_repository
+class AnalyticsRepository:
+    def __init__(self):
+        self.db = get_database()
+        self._ensure_table()
+
+    def _ensure_table(self):
+        """Ensure message_analytics table exists"""
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(MESSAGE_ANALYTICS_TABLE.format(table="message_analytics"))
+                self._keep_rows_on_archival(cursor)
+
+                cursor.execute(NODE_ANALYTICS_TABLE)
+                logger.info("Message analytics tables verified/created successfully")
+
+        except Exception as e:
+            logger.error(f"Error ensuring message analytics table: {str(e)}")
+            raise
+
+    def _keep_rows_on_archival(self, cursor):
+        """Switch a message_analytics table created with ON DELETE CASCADE to SET NULL"""
+        if self.db.dialect == "mysql":
+            cursor.execute("""
+                SELECT CONSTRAINT_NAME
+                FROM information_schema.REFERENTIAL_CONSTRAINTS
+                WHERE CONSTRAINT_SCHEMA = DATABASE()
+                    AND TABLE_NAME = 'message_analytics'
+                    AND REFERENCED_TABLE_NAME = 'chat_messages'
+                    AND DELETE_RULE = 'CASCADE'
+            """)
+            for (constraint,) in cursor.fetchall():
+                logger.info(f"Changing message_analytics.{constraint} to ON DELETE SET NULL")
+                cursor.execute(f"ALTER TABLE message_analytics DROP FOREIGN KEY {constraint}")
+                cursor.execute("""
+                    ALTER TABLE message_analytics
+                        MODIFY message_id VARCHAR(100) NULL,
+                        ADD FOREIGN KEY (message_id) REFERENCES chat_messages(message_id) ON DELETE SET NULL
+                """)
+            return
+
+        # SQLite cannot alter a foreign key, so the table is rebuilt
+        cursor.execute("PRAGMA foreign_key_list(message_analytics)")
+        if not any(row[2] == "chat_messages" and row[6] == "CASCADE" for row in cursor.fetchall()):
+            return
+        logger.info("Rebuilding message_analytics with ON DELETE SET NULL")
+        cursor.execute(MESSAGE_ANALYTICS_TABLE.format(table="message_analytics_rebuild"))
+        cursor.execute(
+            f"INSERT INTO message_analytics_rebuild ({MESSAGE_ANALYTICS_COLUMNS}) "
+            f"SELECT {MESSAGE_ANALYTICS_COLUMNS} FROM message_analytics"
+        )
+        cursor.execute("DROP TABLE message_analytics")
+        cursor.execute("ALTER TABLE message_analytics_rebuild RENAME TO message_analytics")
+        # Recreates the indexes dropped with the old table
+        cursor.execute(MESSAGE_ANALYTICS_TABLE.format(table="message_analytics"))
+
+    def save_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert a batch of analytics rows, and their per-node rows, in one transaction"""
+        if not rows:
+            return 0
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.executemany("""
+                    INSERT IGNORE INTO message_analytics (
+                        message_id, session_id, processing_time, token_count,
+                        completion_tokens, prompt_tokens, model_name
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, [
+                    (
+                        row["message_id"], row["session_id"], row["processing_time"],
+                        row["token_count"], row["completion_tokens"], row["prompt_tokens"],
+                        row["model_name"]
+                    ) for row in rows
+                ])
+                inserted = cursor.rowcount
+                node_rows = [
+                    (
+                        row["message_id"], row["session_id"], node["node"], node["processing_time"],
+                        node["token_count"], node["completion_tokens"], node["prompt_tokens"],
+                        node["model_name"]
+                    ) for row in rows for node in row.get("nodes", [])
+                ]
+                if node_rows:
+                    cursor.executemany("""
+                        INSERT IGNORE INTO node_analytics (
+                            message_id, session_id, node, processing_time, token_count,
+                            completion_tokens, prompt_tokens, model_name
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """, node_rows)
+                return inserted
+        except Exception as e:
+            logger.error(f"Error saving message analytics: {e}")
+            raise
+
+    def latency_percentiles(self, group_by: str, hours: int) -> List[Dict[str, Any]]:
+        """p50/p95 processing time per graph node or model over the last hours"""
+        column = GROUP_COLUMNS[group_by]
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT
+                        grp AS {group_by},
+                        COUNT(*) AS turns,
+                        MIN(CASE WHEN pr >= 0.5 THEN processing_time END) AS p50,
+                        MIN(CASE WHEN pr >= 0.95 THEN processing_time END) AS p95
+                    FROM (
+                        SELECT
+                            {column} AS grp,
+                            a.processing_time,
+                            CUME_DIST() OVER (
+                                PARTITION BY {column} ORDER BY a.processing_time
+                            ) AS pr
+                        FROM node_analytics a
+                        WHERE a.created_at >= NOW() - INTERVAL %s HOUR
+                    ) ranked
+                    GROUP BY grp
+                    ORDER BY grp
+                """, (hours,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting latency percentiles: {e}")
+            raise
+
+    def token_usage(self, group_by: str, hours: int) -> List[Dict[str, Any]]:
+        """Token totals and per-turn averages per graph node or model over the last hours"""
+        column = GROUP_COLUMNS[group_by]
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT
+                        {column} AS {group_by},
+                        COUNT(DISTINCT a.message_id) AS turns,
+                        SUM(a.prompt_tokens) AS prompt_tokens,
+                        SUM(a.completion_tokens) AS completion_tokens,
+                        SUM(a.token_count) AS total_tokens,
+                        SUM(a.token_count) * 1.0 / COUNT(DISTINCT a.message_id) AS avg_tokens_per_turn
+                    FROM node_analytics a
+                    WHERE a.created_at >= NOW() - INTERVAL %s HOUR
+                    GROUP BY {column}
+                    ORDER BY {column}
+                """, (hours,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting token usage: {e}")
+            raise
@@ -0,0 +1,238 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from src.database.connection import get_database
+from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
+
+ARCHIVE_COLUMNS = (
+    "message_id", "session_id", "user_id", "role", "content", "agent_name",
+    "turn_number", "parent_message_id", "created_at", "metadata"
+)
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime:
+    return datetime.strptime(name, "p%Y%m")
+
+
+def _partition_clause(month: datetime) -> str:
+    """Partition pYYYYMM holding rows created before the following month"""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (UNIX_TIMESTAMP('{next_month(month):%Y-%m-%d}'))"
+
+
+@instrument_repository
+class MessageArchiveRepository:
+    """Cold-session queries and monthly range partitions of chat_messages.
+
+    Partition management is MySQL only; archival queries run on any backend.
+    """
+
+    def __init__(self):
+        self.db = get_database()
+
+    def cold_sessions(self, idle_days: int, limit: int) -> List[str]:
+        """Sessions with archivable messages and no activity for idle_days"""
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute("""
+                    SELECT s.session_id
+                    FROM chat_sessions s
+                    WHERE s.last_message_at < NOW() - INTERVAL %s DAY
+                        AND EXISTS (SELECT 1 FROM chat_messages m WHERE m.session_id = s.session_id)
+                    ORDER BY s.last_message_at
+                    LIMIT %s
+                """, (idle_days, limit))
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error finding cold sessions: {e}")
+            raise
+
+    def stream_messages(self, session_ids: List[str], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the sessions' messages in chunks from an unbuffered (server-side) cursor"""
+        if not session_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(session_ids))
+        with self.db.get_cursor(dictionary=True) as cursor:
+            cursor.execute(f"""
+                SELECT {", ".join(ARCHIVE_COLUMNS)}
+                FROM chat_messages
+                WHERE session_id IN ({placeholders})
+                ORDER BY session_id, turn_number
+            """, tuple(session_ids))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    def delete_messages(self, message_ids: List[str]) -> int:
+        """Delete archived messages by ID, so rows written after the export survive"""
+        if not message_ids:
+            return 0
+        placeholders = ", ".join(["%s"] * len(message_ids))
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM chat_messages WHERE message_id IN ({placeholders})",
+                    tuple(message_ids)
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting archived messages: {e}")
+            raise
+
+    @contextmanager
+    def exclusive_lock(self, name: str):
+        """Hold a named lock for the block; yields whether it was acquired.
+
+        MySQL user locks belong to the connection, so one connection is kept
+        for the whole block. SQLite deployments are single node and always
+        acquire it.
+        """
+        if self.db.dialect != "mysql":
+            yield True
+            return
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT GET_LOCK(%s, 0)", (name,))
+                acquired = cursor.fetchone()[0] == 1
+                yield acquired
+                if acquired:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+                    cursor.fetchone()
+            finally:
+                cursor.close()
+
+    def list_partitions(self) -> List[Dict[str, Any]]:
+        """Partitions of chat_messages with their row estimates, oldest first"""
+        if self.db.dialect != "mysql":
+            return []
+        with self.db.get_cursor(dictionary=True) as cursor:
+            cursor.execute("""
+                SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS upper_bound, TABLE_ROWS AS row_estimate
+                FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE()
+                    AND TABLE_NAME = 'chat_messages'
+                    AND PARTITION_NAME IS NOT NULL
+                ORDER BY PARTITION_ORDINAL_POSITION
+            """)
+            return cursor.fetchall()
+
+    def partition_table(self, months_ahead: int):
+        """One-off migration of chat_messages to monthly RANGE partitions on created_at.
+
+        MySQL requires every unique key to include the partitioning column and
+        forbids foreign keys on partitioned tables, so the foreign keys on and
+        to chat_messages are dropped and the keys become (id, created_at) and
+        (message_id, created_at). Rebuilds the table; run it off-peak.
+        """
+        if self.db.dialect != "mysql":
+            raise RuntimeError("Partitioning requires the MySQL backend")
+        if self.list_partitions():
+            logger.info("chat_messages is already partitioned")
+            return
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT TABLE_NAME, CONSTRAINT_NAME
+                FROM information_schema.REFERENTIAL_CONSTRAINTS
+                WHERE CONSTRAINT_SCHEMA = DATABASE()
+                    AND (TABLE_NAME = 'chat_messages' OR REFERENCED_TABLE_NAME = 'chat_messages')
+            """)
+            for table, constraint in cursor.fetchall():
+                logger.info(f"Dropping foreign key {table}.{constraint} before partitioning")
+                cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {constraint}")
+
+            cursor.execute("SELECT COALESCE(MIN(created_at), NOW()) FROM chat_messages")
+            month = month_start(cursor.fetchone()[0])
+            last = self._last_month(months_ahead)
+            partitions = []
+            while month <= last:
+                partitions.append(_partition_clause(month))
+                month = next_month(month)
+
+            cursor.execute("""
+                ALTER TABLE chat_messages
+                    DROP PRIMARY KEY,
+                    ADD PRIMARY KEY (id, created_at),
+                    DROP INDEX message_id,
+                    ADD UNIQUE KEY uniq_message_created (message_id, created_at),
+                    MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            """)
+            cursor.execute(
+                "ALTER TABLE chat_messages PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (\n    "
+                + ",\n    ".join(partitions + ["PARTITION pmax VALUES LESS THAN MAXVALUE"])
+                + "\n)"
+            )
+        logger.info(f"chat_messages partitioned into {len(partitions) + 1} partitions")
+
+    @staticmethod
+    def _last_month(months_ahead: int) -> datetime:
+        month = month_start(datetime.now())
+        for _ in range(months_ahead):
+            month = next_month(month)
+        return month
+
+    def add_future_partitions(self, months_ahead: int) -> List[str]:
+        """Split pmax so monthly partitions exist months_ahead past the current month"""
+        months = [partition_month(p["name"]) for p in self.list_partitions() if p["name"] != "pmax"]
+        if not months:
+            return []
+
+        added, month, last = [], next_month(max(months)), self._last_month(months_ahead)
+        while month <= last:
+            added.append(month)
+            month = next_month(month)
+        if not added:
+            return []
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                "ALTER TABLE chat_messages REORGANIZE PARTITION pmax INTO (\n    "
+                + ",\n    ".join([_partition_clause(m) for m in added] + ["PARTITION pmax VALUES LESS THAN MAXVALUE"])
+                + "\n)"
+            )
+        names = [partition_name(m) for m in added]
+        logger.info(f"Added chat_messages partitions {names}")
+        return names
+
+    def drop_empty_partitions(self, keep_days: int) -> List[str]:
+        """Drop partitions older than keep_days that archival has emptied.
+
+        A partition can still hold messages from sessions that are not cold
+        yet; those partitions are kept until a later run empties them.
+        """
+        cutoff = datetime.now() - timedelta(days=keep_days)
+        dropped = []
+        for partition in self.list_partitions():
+            name = partition["name"]
+            if name == "pmax" or next_month(partition_month(name)) > cutoff:
+                continue
+            with self.db.get_cursor() as cursor:
+                cursor.execute(f"SELECT 1 FROM chat_messages PARTITION ({name}) LIMIT 1")
+                if cursor.fetchone():
+                    continue
+                cursor.execute(f"ALTER TABLE chat_messages DROP PARTITION {name}")
+                dropped.append(name)
+        if dropped:
+            logger.info(f"Dropped empty chat_messages partitions {dropped}")
+        return dropped
+
+    def is_partitioned(self) -> Optional[bool]:
+        """None on backends without partitioning"""
+        if self.db.dialect != "mysql":
+            return None
+        return bool(self.list_partitions())
@@ -1,14 +1,16 @@
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import uuid
-from src.database.connection import DatabaseConnection
+from src.database.connection import get_database
+from src.utils.codec import json_codec
 from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
 from src.models.chat import ChatMessage, ChatSession
 from src.database.repositories.user_repository import UserRepository
 
+@instrument_repository
 class ChatRepository:
     def __init__(self):
-        self.db = DatabaseConnection()
+        self.db = get_database()
         self.user_repo = UserRepository()
         self._ensure_tables()
     
@@ -26,14 +28,19 @@ class ChatRepository:
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                         last_message_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_turn INT NOT NULL DEFAULT 0,
                         metadata JSON,
                         INDEX idx_session_lookup (session_id, status),
                         INDEX idx_user_sessions (user_id, status),
                         INDEX idx_last_message (last_message_at),
+                        INDEX idx_status_last_message (status, last_message_at),
                         FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
                 """)
 
+                # Tables created before the sweeper lack its index
+                self.db.ensure_index(cursor, "chat_sessions", "idx_status_last_message", "status, last_message_at")
+
                 # Create messages table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS chat_messages (
@@ -59,6 +66,17 @@ class ChatRepository:
                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
                 """)
                 
+                # Sessions created before the turn counter continue from their stored messages
+                if self.db.ensure_column(cursor, "chat_sessions", "last_turn", "INT NOT NULL DEFAULT 0"):
+                    cursor.execute("""
+                        UPDATE chat_sessions
+                        SET last_turn = (
+                            SELECT COALESCE(MAX(m.turn_number), 0)
+                            FROM chat_messages m
+                            WHERE m.session_id = chat_sessions.session_id
+                        )
+                    """)
+                
                 logger.info("Chat tables verified/created successfully")
                 
         except Exception as e:
@@ -84,23 +102,107 @@ class ChatRepository:
                     LIMIT %s
                 """, (session_id, limit))
                 
-                messages = []
-                for row in cursor.fetchall():
-                    messages.append(ChatMessage(
-                        role=row['role'],
-                        content=row['content'],
-                        name=row['name'],
-                        created_at=row['created_at'],
-                        metadata=json.loads(row['metadata']) if row['metadata'] else None,
-                        message_id=row['message_id'],
-                        turn_number=row['turn_number']
-                    ))
-                return messages
+                return [self._to_message(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logger.error(f"Error getting messages: {str(e)}")
             return []
     
+    @staticmethod
+    def _to_message(row: Dict[str, Any]) -> ChatMessage:
+        return ChatMessage(
+            role=row['role'],
+            content=row['content'],
+            name=row['name'],
+            created_at=row['created_at'],
+            metadata=json_codec().decode(row['metadata']) if row['metadata'] else None,
+            message_id=row['message_id'],
+            turn_number=row['turn_number']
+        )
+    
+    def get_messages_page(
+        self,
+        session_id: str,
+        after_turn: Optional[int] = None,
+        limit: int = 50,
+        descending: bool = False
+    ) -> List[ChatMessage]:
+        """One page of a session's messages after a turn number (keyset, no OFFSET).
+
+        Walks idx_session_turn from after_turn in either direction, so every
+        page costs the same however deep into a long session it is.
+        """
+        comparison, order = ("<", "DESC") if descending else (">", "ASC")
+        where, params = "session_id = %s", [session_id]
+        if after_turn is not None:
+            where += f" AND turn_number {comparison} %s"
+            params.append(after_turn)
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT 
+                        message_id,
+                        role,
+                        content,
+                        agent_name as name,
+                        turn_number,
+                        created_at,
+                        metadata
+                    FROM chat_messages 
+                    WHERE {where}
+                    ORDER BY turn_number {order}
+                    LIMIT %s
+                """, (*params, limit))
+                return [self._to_message(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting message page: {str(e)}")
+            raise
+    
+    def stream_session_messages(
+        self, session_id: str, descending: bool = False, chunk_size: int = 500
+    ) -> Iterator[List[ChatMessage]]:
+        """Yield all of a session's messages in chunks from an unbuffered (server-side) cursor"""
+        with self.db.get_cursor(dictionary=True) as cursor:
+            cursor.execute(f"""
+                SELECT 
+                    message_id,
+                    role,
+                    content,
+                    agent_name as name,
+                    turn_number,
+                    created_at,
+                    metadata
+                FROM chat_messages 
+                WHERE session_id = %s 
+                ORDER BY turn_number {"DESC" if descending else "ASC"}
+            """, (session_id,))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [self._to_message(row) for row in rows]
+    
+    def get_routing_examples(self, agents: List[str], limit: int) -> List[Tuple[str, str]]:
+        """Newest (user message, agent that answered it) pairs, for training the intent classifier"""
+        try:
+            with self.db.get_cursor() as cursor:
+                placeholders = ", ".join(["%s"] * len(agents))
+                cursor.execute(f"""
+                    SELECT u.content, a.agent_name
+                    FROM chat_messages u
+                    JOIN chat_messages a
+                        ON a.session_id = u.session_id AND a.turn_number = u.turn_number + 1
+                    WHERE u.role = 'user'
+                        AND a.role = 'assistant'
+                        AND a.agent_name IN ({placeholders})
+                    ORDER BY u.id DESC
+                    LIMIT %s
+                """, (*agents, limit))
+                return [(row[0], row[1]) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting routing examples: {str(e)}")
+            raise
+    
     def get_or_create_session(self, session_id: str, user_id: str) -> Dict[str, Any]:
         """Get existing session or create a new one"""
         try:
@@ -124,12 +226,18 @@ class ChatRepository:
                 
                 result = cursor.fetchone()
                 if not result:
-                    # Create new session
+                    # Reactivate a session the sweeper closed, otherwise create it
                     cursor.execute("""
-                        INSERT INTO chat_sessions 
-                        (session_id, user_id, status, metadata) 
-                        VALUES (%s, %s, 'active', NULL)
-                    """, (session_id, user_id))
+                        UPDATE chat_sessions
+                        SET status = 'active'
+                        WHERE session_id = %s AND status <> 'active'
+                    """, (session_id,))
+                    if not cursor.rowcount:
+                        cursor.execute("""
+                            INSERT INTO chat_sessions 
+                            (session_id, user_id, status, metadata) 
+                            VALUES (%s, %s, 'active', NULL)
+                        """, (session_id, user_id))
                     
                     # Get the created session
                     cursor.execute("""
@@ -156,7 +264,7 @@ class ChatRepository:
                     'created_at': result['created_at'],
                     'updated_at': result['updated_at'],
                     'last_message_at': result['last_message_at'],
-                    'metadata': json.loads(result['metadata']) if result['metadata'] else None
+                    'metadata': json_codec().decode(result['metadata']) if result['metadata'] else None
                 }
                 
         except Exception as e:
@@ -172,18 +280,21 @@ class ChatRepository:
         agent_name: str = None, 
         metadata: dict = None,
         parent_message_id: str = None
-    ) -> bool:
+    ) -> str:
+        """Save a message and return its message_id"""
         try:
             # First ensure session exists
             session = self.get_or_create_session(session_id, user_id)
             
             with self.db.get_cursor() as cursor:
-                # Get next turn number
+                # Take the next turn from the session's counter rather than MAX(turn_number),
+                # which restarts once archival has moved the session's messages out
                 cursor.execute("""
-                    SELECT COALESCE(MAX(turn_number), 0) + 1
-                    FROM chat_messages
+                    UPDATE chat_sessions
+                    SET last_turn = last_turn + 1, last_message_at = CURRENT_TIMESTAMP
                     WHERE session_id = %s
                 """, (session_id,))
+                cursor.execute("SELECT last_turn FROM chat_sessions WHERE session_id = %s", (session_id,))
                 turn_number = cursor.fetchone()[0]
 
                 # Generate unique message ID
@@ -198,18 +309,53 @@ class ChatRepository:
                 """, (
                     message_id, session_id, user_id, role, content,
                     agent_name, turn_number, parent_message_id,
-                    json.dumps(metadata) if metadata else None
+                    json_codec().encode_text(metadata) if metadata else None
                 ))
 
-                # Update session last_message_at
-                cursor.execute("""
-                    UPDATE chat_sessions 
-                    SET last_message_at = CURRENT_TIMESTAMP
-                    WHERE session_id = %s
-                """, (session_id,))
-
-                return True
+                return message_id
                 
         except Exception as e:
             logger.error(f"Error saving message: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def deactivate_idle_sessions(self, idle_minutes: int, limit: int) -> List[str]:
+        """Mark up to limit active sessions idle for idle_minutes inactive, returning the IDs changed"""
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute("""
+                    SELECT session_id
+                    FROM chat_sessions
+                    WHERE status = 'active'
+                        AND last_message_at < NOW() - INTERVAL %s MINUTE
+                    ORDER BY last_message_at
+                    LIMIT %s
+                """, (idle_minutes, limit))
+                session_ids = [row[0] for row in cursor.fetchall()]
+                if not session_ids:
+                    return []
+
+                # Re-check idleness so a session that just got a message stays active
+                placeholders = ", ".join(["%s"] * len(session_ids))
+                cursor.execute(f"""
+                    UPDATE chat_sessions
+                    SET status = 'inactive'
+                    WHERE session_id IN ({placeholders})
+                        AND status = 'active'
+                        AND last_message_at < NOW() - INTERVAL %s MINUTE
+                """, (*session_ids, idle_minutes))
+                if cursor.rowcount == len(session_ids):
+                    return session_ids
+
+                # Report only the sessions the UPDATE changed
+                cursor.execute(f"""
+                    SELECT session_id
+                    FROM chat_sessions
+                    WHERE session_id IN ({placeholders})
+                        AND status = 'inactive'
+                """, session_ids)
+                deactivated = {row[0] for row in cursor.fetchall()}
+                return [session_id for session_id in session_ids if session_id in deactivated]
+
+        except Exception as e:
+            logger.error(f"Error deactivating idle sessions: {str(e)}")
+            raise
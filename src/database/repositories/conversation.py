@@ -1,11 +1,13 @@
 from typing import List, Dict, Any
-import json
-from src.database.connection import DatabaseConnection
+from src.database.connection import get_database
+from src.utils.codec import json_codec
 from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
 
+@instrument_repository
 class ConversationRepository:
     def __init__(self):
-        self.db = DatabaseConnection()
+        self.db = get_database()
     
     def save_message(
         self, 
@@ -36,7 +38,7 @@ class ConversationRepository:
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """, (
                     session_id, user_id, role, content, name,
-                    json.dumps(metadata) if metadata else None,
+                    json_codec().encode_text(metadata) if metadata else None,
                     next_turn
                 ))
                 self.db.connection.commit()
@@ -51,7 +53,7 @@ class ConversationRepository:
                     VALUES (%s, %s, %s, %s, %s, %s)
                 """, (
                     session_id, user_id, role, content, name,
-                    json.dumps(metadata) if metadata else None
+                    json_codec().encode_text(metadata) if metadata else None
                 ))
                 self.db.connection.commit()
                 return True
@@ -88,11 +90,10 @@ class ConversationRepository:
         try:
             with self.db.get_cursor() as cursor:
                 cursor.execute("""
-                    UPDATE conversation_history
-                    SET is_active = FALSE
+                    UPDATE chat_sessions
+                    SET status = 'inactive'
                     WHERE session_id = %s
                 """, (session_id,))
-                self.db.connection.commit()
                 return True
         except Exception as e:
             logger.error(f"Error marking session inactive: {e}")
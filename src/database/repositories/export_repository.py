@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.database.connection import get_database
+from src.monitoring.metrics import instrument_repository
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    columns: Tuple[str, ...]
+    # Keyset the export is ordered by; the last row's values are the watermark
+    keys: Tuple[str, ...]
+    # Resume at the watermark's first key (>=) instead of past the whole keyset
+    reread_first_key: bool = False
+
+
+# Append-only tables are keyed by id. fraud_reports rows are updated in
+# place, so they are keyed by last_updated_at and re-exported on change.
+# last_updated_at only has second precision and a row updated again within
+# the watermark second may sort before the watermark id, so that second is
+# read again on every export and ExportService drops the rows it already
+# exported unchanged.
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    "fraud_reports": ExportTable(
+        columns=(
+            "id", "phone_number", "is_fraud", "report_count", "first_reported_at",
+            "last_updated_at", "description", "reporter_ip"
+        ),
+        keys=("last_updated_at", "id"),
+        reread_first_key=True,
+    ),
+    "chat_messages": ExportTable(
+        columns=(
+            "id", "message_id", "session_id", "user_id", "role", "content", "agent_name",
+            "turn_number", "parent_message_id", "created_at", "metadata"
+        ),
+        keys=("id",),
+    ),
+    "message_analytics": ExportTable(
+        columns=(
+            "id", "message_id", "session_id", "processing_time", "token_count",
+            "completion_tokens", "prompt_tokens", "model_name", "created_at"
+        ),
+        keys=("id",),
+    ),
+}
+
+
+@instrument_repository
+class ExportRepository:
+    def __init__(self):
+        self.db = get_database()
+
+    def stream_rows(
+        self, table: str, after: Optional[Sequence[Any]], chunk_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield rows past the watermark in keyset order, chunk_size at a time.
+
+        Uses an unbuffered (server-side) cursor on MySQL, so memory stays
+        bounded by the chunk size whatever the table size.
+        """
+        spec = EXPORT_TABLES[table]
+        keys = ", ".join(spec.keys)
+        where, params = "", ()
+        if after is not None and spec.reread_first_key:
+            where, params = f"WHERE {spec.keys[0]} >= %s", (after[0],)
+        elif after is not None:
+            placeholders = ", ".join(["%s"] * len(spec.keys))
+            where = f"WHERE ({keys}) > ({placeholders})" if len(spec.keys) > 1 else f"WHERE {keys} > %s"
+            params = tuple(after)
+
+        with self.db.get_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(spec.columns)} FROM {table} {where} ORDER BY {keys}",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
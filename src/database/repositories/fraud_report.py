@@ -1,11 +1,59 @@
-from typing import Optional, Dict, Any
-from src.database.connection import DatabaseConnection
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+from src.database.connection import get_database
 from src.models.database import FraudReport
 from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
 
+@instrument_repository
 class FraudReportRepository:
     def __init__(self):
-        self.db = DatabaseConnection()
+        self.db = get_database()
+        self._ensure_tables()
+    
+    def _ensure_tables(self):
+        """Ensure fraud_reports and its statistics rollup tables exist"""
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS fraud_reports (
+                        id INT AUTO_INCREMENT PRIMARY KEY,
+                        phone_number VARCHAR(20),
+                        is_fraud BOOLEAN DEFAULT FALSE,
+                        report_count INT DEFAULT 0,
+                        first_reported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                        description TEXT,
+                        reporter_ip VARCHAR(45),
+                        INDEX idx_phone (phone_number),
+                        INDEX idx_last_updated (last_updated_at)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+                # Incremental exports scan by last_updated_at
+                self.db.ensure_index(cursor, "fraud_reports", "idx_last_updated", "last_updated_at")
+                # Top reported numbers read the head of this index
+                self.db.ensure_index(cursor, "fraud_reports", "idx_report_count", "report_count")
+
+                # Rollups kept current by report_fraud, bucketed in UTC
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS fraud_stats_daily (
+                        day DATE PRIMARY KEY,
+                        reports INT NOT NULL DEFAULT 0,
+                        new_numbers INT NOT NULL DEFAULT 0
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS fraud_stats_hourly (
+                        hour DATETIME PRIMARY KEY,
+                        reports INT NOT NULL DEFAULT 0,
+                        new_numbers INT NOT NULL DEFAULT 0
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+                logger.info("Fraud reports tables verified/created successfully")
+                
+        except Exception as e:
+            logger.error(f"Error ensuring fraud reports table: {str(e)}")
+            raise
     
     def check_number(self, phone_number: str) -> Optional[Dict[str, Any]]:
         try:
@@ -19,11 +67,26 @@ class FraudReportRepository:
             logger.error(f"Error checking number: {e}")
             raise
     
+    def check_numbers(self, phone_numbers: List[str]) -> List[Dict[str, Any]]:
+        """Fetch reports stored under any of the given number formats in one query"""
+        if not phone_numbers:
+            return []
+        try:
+            placeholders = ", ".join(["%s"] * len(phone_numbers))
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    f"SELECT * FROM fraud_reports WHERE phone_number IN ({placeholders})",
+                    tuple(phone_numbers)
+                )
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error checking numbers: {e}")
+            raise
+    
     def report_fraud(self, phone_number: str, description: str, reporter_ip: str) -> bool:
         try:
+            existing = self.check_number(phone_number)
             with self.db.get_cursor() as cursor:
-                existing = self.check_number(phone_number)
-                
                 if existing:
                     cursor.execute("""
                         UPDATE fraud_reports 
@@ -39,8 +102,69 @@ class FraudReportRepository:
                         VALUES (%s, TRUE, 1, %s, %s)
                     """, (phone_number, description, reporter_ip))
                 
-                self.db.connection.commit()
+                # Same transaction, so the rollups never drift from fraud_reports
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                new_number = 0 if existing else 1
+                cursor.execute("""
+                    INSERT INTO fraud_stats_daily (day, reports, new_numbers)
+                    VALUES (%s, 1, %s)
+                    ON DUPLICATE KEY UPDATE reports = reports + 1, new_numbers = new_numbers + VALUES(new_numbers)
+                """, (now.date(), new_number))
+                cursor.execute("""
+                    INSERT INTO fraud_stats_hourly (hour, reports, new_numbers)
+                    VALUES (%s, 1, %s)
+                    ON DUPLICATE KEY UPDATE reports = reports + 1, new_numbers = new_numbers + VALUES(new_numbers)
+                """, (now.replace(minute=0, second=0, microsecond=0), new_number))
+                
                 return True
         except Exception as e:
             logger.error(f"Error reporting fraud: {e}")
+            raise
+    
+    def top_numbers(self, limit: int) -> List[Dict[str, Any]]:
+        """Most reported numbers, read from the head of idx_report_count"""
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute("""
+                    SELECT phone_number, report_count, first_reported_at, last_updated_at
+                    FROM fraud_reports
+                    ORDER BY report_count DESC
+                    LIMIT %s
+                """, (limit,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting top numbers: {e}")
+            raise
+    
+    def reports_per_day(self, days: int) -> List[Dict[str, Any]]:
+        """Daily report and new-number counts for the last days (UTC), oldest first"""
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute("""
+                    SELECT day, reports, new_numbers
+                    FROM fraud_stats_daily
+                    WHERE day >= %s
+                    ORDER BY day
+                """, (since,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting reports per day: {e}")
+            raise
+    
+    def new_numbers_per_hour(self, hours: int) -> List[Dict[str, Any]]:
+        """Hourly new-number and report counts for the last hours (UTC), oldest first"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+        since = now - timedelta(hours=hours - 1)
+        try:
+            with self.db.get_cursor(dictionary=True) as cursor:
+                cursor.execute("""
+                    SELECT hour, new_numbers, reports
+                    FROM fraud_stats_hourly
+                    WHERE hour >= %s
+                    ORDER BY hour
+                """, (since,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting new numbers per hour: {e}")
             raise 
\ No newline at end of file
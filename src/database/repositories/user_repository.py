@@ -1,11 +1,13 @@
 from typing import Optional, Dict, Any
-import json
-from src.database.connection import DatabaseConnection
+from src.database.connection import get_database
+from src.utils.codec import json_codec
 from src.utils.logger import logger
+from src.monitoring.metrics import instrument_repository
 
+@instrument_repository
 class UserRepository:
     def __init__(self):
-        self.db = DatabaseConnection()
+        self.db = get_database()
         self._ensure_table()
     
     def _ensure_table(self):
@@ -52,7 +54,7 @@ class UserRepository:
                         VALUES (%s, %s)
                     """, (
                         user_id,
-                        json.dumps(metadata) if metadata else None
+                        json_codec().encode_text(metadata) if metadata else None
                     ))
                     
                     # Get the created user
@@ -74,7 +76,7 @@ class UserRepository:
                     'user_id': result['user_id'],
                     'created_at': result['created_at'],
                     'last_active': result['last_active'],
-                    'metadata': json.loads(result['metadata']) if result['metadata'] else None
+                    'metadata': json_codec().decode(result['metadata']) if result['metadata'] else None
                 }
                 
         except Exception as e:
@@ -112,7 +114,7 @@ class UserRepository:
                         'user_id': result['user_id'],
                         'created_at': result['created_at'],
                         'last_active': result['last_active'],
-                        'metadata': json.loads(result['metadata']) if result['metadata'] else None
+                        'metadata': json_codec().decode(result['metadata']) if result['metadata'] else None
                     }
                 return None
         except Exception as e:
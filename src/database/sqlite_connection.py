@@ -0,0 +1,248 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+from src.core.config import get_settings
+from src.utils.logger import logger
+
+# Applied to every connection. WAL lets readers run alongside the single
+# writer, and NORMAL sync is durable in WAL mode except on power loss.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+
+CREATE_TABLE = re.compile(
+    r"^\s*CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*)\)[^)]*$", re.IGNORECASE | re.DOTALL
+)
+INLINE_INDEX = re.compile(r"^(UNIQUE\s+)?(?:INDEX|KEY)\s+(\w+)\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+AUTO_INCREMENT_KEY = re.compile(r"\b(?:BIG)?INT\s+AUTO_INCREMENT\s+PRIMARY KEY", re.IGNORECASE)
+ENUM_TYPE = re.compile(r"\bENUM\s*(\([^)]*\))", re.IGNORECASE)
+JSON_TYPE = re.compile(r"^(\w+)\s+JSON\b", re.IGNORECASE)
+ON_UPDATE = re.compile(r"\s+ON UPDATE CURRENT_TIMESTAMP", re.IGNORECASE)
+INTERVAL_AGO = re.compile(r"NOW\(\)\s*-\s*INTERVAL\s+\?\s+(SECOND|MINUTE|HOUR|DAY)", re.IGNORECASE)
+VALUES_FUNCTION = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+def _split_definitions(body: str) -> List[str]:
+    """Split a CREATE TABLE body on top-level commas"""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _translate_ddl(table: str, body: str) -> List[str]:
+    columns, indexes, triggers = [], [], []
+    for definition in _split_definitions(body):
+        index = INLINE_INDEX.match(definition)
+        if index:
+            unique, name, keys = index.groups()
+            indexes.append(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({keys})"
+            )
+            continue
+
+        column = definition.split()[0]
+        definition = AUTO_INCREMENT_KEY.sub("INTEGER PRIMARY KEY AUTOINCREMENT", definition)
+        definition = ENUM_TYPE.sub(lambda m: f"TEXT CHECK ({column} IN {m.group(1)})", definition)
+        definition = JSON_TYPE.sub(r"\1 TEXT", definition)
+        if ON_UPDATE.search(definition):
+            definition = ON_UPDATE.sub("", definition)
+            # Recursive triggers are off, so this UPDATE does not fire it again
+            triggers.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_{column}_on_update "
+                f"AFTER UPDATE ON {table} FOR EACH ROW WHEN NEW.{column} IS OLD.{column} "
+                f"BEGIN UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid; END"
+            )
+        columns.append(definition)
+
+    create = f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(columns) + "\n)"
+    return [create] + indexes + triggers
+
+
+@lru_cache(maxsize=512)
+def translate(operation: str) -> List[str]:
+    """Rewrite a MySQL statement (as written in the repositories) for SQLite.
+
+    CREATE TABLE statements lose their table options, inline indexes become
+    CREATE INDEX statements and ON UPDATE columns get a trigger, so one
+    statement may become several.
+    """
+    ddl = CREATE_TABLE.match(operation)
+    if ddl:
+        return _translate_ddl(ddl.group(1), ddl.group(2))
+
+    sql = operation.replace("%s", "?")
+    sql = re.sub(r"\bINSERT IGNORE\b", "INSERT OR IGNORE", sql, flags=re.IGNORECASE)
+    sql = INTERVAL_AGO.sub(lambda m: f"datetime('now', '-' || ? || ' {m.group(1).lower()}s')", sql)
+    if re.search(r"\bON DUPLICATE KEY UPDATE\b", sql, re.IGNORECASE):
+        # SQLite 3.35+ accepts an upsert without a conflict target
+        head, _, assignments = re.split(r"\b(ON DUPLICATE KEY UPDATE)\b", sql, flags=re.IGNORECASE)
+        assignments = VALUES_FUNCTION.sub(r"excluded.\1", assignments)
+        sql = f"{head}ON CONFLICT DO UPDATE SET{assignments}"
+    return [sql]
+
+
+def _concat(*values):
+    # MySQL semantics: NULL if any argument is NULL
+    if any(value is None for value in values):
+        return None
+    return "".join(str(value) for value in values)
+
+
+class SQLiteCursor:
+    """DB-API cursor over sqlite3 that accepts the repositories' MySQL SQL"""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def execute(self, operation: str, params: Sequence[Any] = ()):
+        statements = translate(operation)
+        self._cursor.execute(statements[0], tuple(params or ()))
+        for statement in statements[1:]:
+            self._cursor.execute(statement)
+
+    def executemany(self, operation: str, seq_params):
+        self._cursor.executemany(translate(operation)[0], seq_params)
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((column[0] for column in self._cursor.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Embedded storage backend with the same interface as DatabaseConnection.
+
+    Each thread gets its own connection to the database file (WAL allows
+    concurrent readers), opened once and reused. Nested get_cursor blocks on
+    one thread share a transaction that commits when the outermost exits.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(self, path: str):
+        self.settings = get_settings()
+        self.path = path
+        self._local = threading.local()
+        with self.get_cursor() as cursor:
+            cursor.execute("SELECT sqlite_version()")
+            logger.info(f"SQLite database {path} opened (SQLite {cursor.fetchone()[0]}, WAL mode)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conn.create_function("CONCAT", -1, _concat, deterministic=True)
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._local.connection = self._connect()
+            self._local.depth = 0
+        return conn
+
+    def ensure_index(self, cursor, table: str, index: str, columns: str):
+        """Add an index to an existing table unless it already exists"""
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns})")
+
+    def ensure_column(self, cursor, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table unless it already exists, returning whether it was added"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if any(row[1] == column for row in cursor.fetchall()):
+            return False
+        logger.info(f"Adding column {column} to {table}")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+
+    @contextmanager
+    def get_connection(self):
+        """Get this thread's connection"""
+        yield self._connection()
+
+    @contextmanager
+    def get_cursor(self, dictionary=False):
+        """Get a cursor, committing when the outermost block exits cleanly"""
+        conn = self._connection()
+        cursor = None
+        self._local.depth += 1
+        try:
+            cursor = SQLiteCursor(conn.cursor(), dictionary=dictionary)
+            yield cursor
+            if self._local.depth == 1:
+                conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Database cursor error: {str(e)}")
+            raise Exception(f"Database operation failed: {str(e)}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.depth -= 1
+            if cursor:
+                cursor.close()
+
+
+@lru_cache()
+def get_sqlite_connection(path: str) -> SQLiteConnection:
+    """One SQLiteConnection per database file"""
+    return SQLiteConnection(path)
@@ -1,5 +1,9 @@
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from src.constants.routes import AgentRoutes
+
+# Every route the supervisor may pick, derived so new routes reach the tool schema
+RoutableAgent = Literal[tuple(route.value for route in AgentRoutes if route is not AgentRoutes.SUPERVISOR)]
 
 class AgentResponse(BaseModel):
     """Response model for agent messages"""
@@ -19,4 +23,21 @@ class AgentState(BaseModel):
     messages: List[dict]
     session_id: Optional[str] = None
     user_id: Optional[str] = None
-    next: Optional[str] = None 
\ No newline at end of file
+    next: Optional[str] = None 
+
+class RoutingDecision(BaseModel):
+    """Routing decision the supervisor LLM must return through tool calling"""
+    selected_agent: RoutableAgent = Field(
+        description="The agent that should handle the current user message"
+    )
+    reasoning: str = Field(description="Brief explanation of why this agent was chosen")
+
+
+class BatchedRoutingDecision(RoutingDecision):
+    """Routing decision for one conversation of a batched supervisor call"""
+    index: int = Field(description="Index of the conversation this decision is for")
+
+
+class BatchRoutingDecisions(BaseModel):
+    """All routing decisions returned by a batched supervisor call"""
+    decisions: List[BatchedRoutingDecision]
@@ -0,0 +1,198 @@
+# Settings are imported first so PROMETHEUS_MULTIPROC_DIR from .env is in the
+# environment before prometheus_client decides where to keep its values
+from src.core.config import settings
+import contextvars
+import functools
+import inspect
+import os
+import shutil
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from src.monitoring.tracing import tracer
+
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Buckets sized for LLM-backed requests, which range from a cached lookup to several seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+NODE_LATENCY = Histogram(
+    "graph_node_duration_seconds", "Graph node latency", ["node"], buckets=LATENCY_BUCKETS
+)
+LLM_LATENCY = Histogram(
+    "llm_call_duration_seconds", "LLM call latency", ["model", "status"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens", "LLM tokens used", ["model", "kind"])
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Database latency per repository method",
+    ["repository", "method"], buckets=DB_BUCKETS
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Pooled connections checked out", multiprocess_mode="livesum"
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", multiprocess_mode="livesum")
+CACHE_REQUESTS = Counter("cache_requests", "Cache lookups by key prefix", ["prefix", "result"])
+ROUTING_PARSE_FAILURES = Counter(
+    "supervisor_parse_failures", "Routing responses that could not be parsed"
+)
+ROUTING_DECISIONS = Counter(
+    "supervisor_routing_decisions", "Routing decisions by source (local classifier or LLM)", ["source"]
+)
+SPECULATION_OUTCOMES = Counter("speculation_outcomes", "Speculative agent runs", ["outcome"])
+SPECULATION_SAVED_SECONDS = Counter(
+    "speculation_saved_seconds", "Agent time overlapped with routing by speculation"
+)
+SESSIONS_DEACTIVATED = Counter("sessions_deactivated", "Idle sessions marked inactive by the sweeper")
+SESSION_LOCK_CONFLICTS = Counter(
+    "session_lock_conflicts", "Turns rejected because the session stayed busy past SESSION_LOCK_WAIT", ["scope"]
+)
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests", "Chat requests by idempotency outcome", ["outcome"]
+)
+DEADLINES_EXCEEDED = Counter("deadlines_exceeded", "Work cut short by the request deadline", ["stage"])
+LLM_HEDGES = Counter("llm_hedges", "Duplicate LLM calls sent past the latency percentile", ["outcome"])
+LLM_CIRCUIT_EVENTS = Counter("llm_circuit_events", "LLM circuit breaker transitions and rejections", ["event"])
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Serialize all metrics, aggregated across workers in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir():
+    """Clear values left by a previous run; call once before the workers start"""
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+# Graph node running in this context, so LLM usage can be attributed to it
+current_node: ContextVar[Optional[str]] = ContextVar("current_node", default=None)
+# Receives (node, seconds) for every node run of the current turn
+node_timings: ContextVar[Optional[Callable[[str, float], None]]] = ContextVar("node_timings", default=None)
+
+
+def node_context(node: str) -> contextvars.Context:
+    """Copy of the current context attributed to `node`, for work a node starts on another's behalf"""
+    context = contextvars.copy_context()
+    context.run(current_node.set, node)
+    return context
+
+
+def observe_node(node: str):
+    """Record the latency of a (state, config) graph node, in a span of its own.
+
+    The time also goes to the turn's node_timings recorder, if one is bound.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(state, config):
+            token = current_node.set(node)
+            start = time.perf_counter()
+            try:
+                with tracer.span(f"node.{node}"):
+                    return await func(state, config)
+            finally:
+                elapsed = time.perf_counter() - start
+                NODE_LATENCY.labels(node=node).observe(elapsed)
+                record = node_timings.get()
+                if record is not None:
+                    record(node, elapsed)
+                current_node.reset(token)
+        return wrapper
+    return decorator
+
+
+def instrument_repository(cls):
+    """Time and trace every public method of a repository class"""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        histogram = DB_QUERY_LATENCY.labels(cls.__name__, name)
+        setattr(cls, name, _timed(attr, histogram, f"db.{cls.__name__}.{name}"))
+    return cls
+
+
+def _timed(func, histogram, span_name: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    return wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records latency and token usage of every chat model call"""
+
+    # Cheap enough to run on the event loop instead of a thread pool
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        llm_output = response.llm_output or {}
+        model = llm_output.get("model_name", settings.GROQ_MODEL)
+        self._observe(run_id, model, "ok")
+
+        usage = llm_output.get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if prompt_tokens is None and response.generations and response.generations[0]:
+            # Streaming responses only carry usage on the message itself
+            metadata = getattr(response.generations[0][0], "message", None)
+            metadata = getattr(metadata, "usage_metadata", None) or {}
+            prompt_tokens = metadata.get("input_tokens")
+            completion_tokens = metadata.get("output_tokens")
+        if prompt_tokens:
+            LLM_TOKENS.labels(model=model, kind="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(model=model, kind="completion").inc(completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._observe(run_id, settings.GROQ_MODEL, "error")
+
+    def _observe(self, run_id: UUID, model: str, status: str):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            LLM_LATENCY.labels(model=model, status=status).observe(time.perf_counter() - started)
+
+
+llm_metrics = LLMMetricsCallback()
@@ -0,0 +1,223 @@
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.core.config import settings
+from src.utils.logger import logger
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    request_id: Optional[str]
+    start: float = field(default_factory=time.time)
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class _Unsampled:
+    """Marks a trace dropped by head sampling so its children are skipped too"""
+
+
+UNSAMPLED = _Unsampled()
+
+_current_span: ContextVar[Any] = ContextVar("current_span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def set_request_id(request_id: str):
+    """Bind the request ID to the current context, returning a token for reset_request_id"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+class JsonlSpanWriter:
+    """Buffers finished spans and appends them to a size-rotated JSONL file.
+
+    A daemon thread writes the buffer every flush_interval seconds, or sooner
+    once batch_size spans are waiting, so request handling never touches the file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        backup_count: int,
+        batch_size: int,
+        flush_interval: float
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, span: Span):
+        line = json.dumps(asdict(span), default=str)
+        with self._lock:
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        try:
+            self._rotate_if_needed()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.error(f"Error writing {len(lines)} spans: {str(e)}")
+
+    def _rotate_if_needed(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.max_bytes:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+class Tracer:
+    """In-process tracer building one span tree per request.
+
+    The sampling decision is made once at the root span; children of an
+    unsampled root cost a context-variable lookup and nothing else.
+    """
+
+    def __init__(self, writer: JsonlSpanWriter, sample_rate: float):
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """Open a span under the current one without making it current (None if not sampled)"""
+        parent = _current_span.get()
+        if parent is UNSAMPLED:
+            return None
+        if parent is None:
+            if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                return None
+            trace_id = uuid.uuid4().hex
+        else:
+            trace_id = parent.trace_id
+        return Span(
+            trace_id=trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            request_id=get_request_id(),
+            attributes=attributes
+        )
+
+    def end_span(self, span: Optional[Span], status: str = "ok"):
+        if span is None:
+            return
+        span.duration_ms = round((time.time() - span.start) * 1000, 3)
+        span.status = status
+        self.writer.write(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Open a span and make it the parent of spans started inside the block"""
+        span = self.start_span(name, **attributes)
+        # An unsampled root marks the whole tree as skipped
+        token = _current_span.set(span if span is not None else UNSAMPLED)
+        status = "ok"
+        try:
+            yield span
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, status)
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """Adds a span for every chat model call under the node that made it"""
+
+    # Must run in the caller's context to see the current span
+    run_inline = True
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._spans: Dict[UUID, Span] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        span = self.tracer.start_span("llm", messages=sum(len(batch) for batch in messages))
+        if span is not None:
+            self._spans[run_id] = span
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        llm_output = response.llm_output or {}
+        usage = llm_output.get("token_usage") or {}
+        span.attributes.update(
+            model=llm_output.get("model_name"),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens")
+        )
+        self.tracer.end_span(span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.attributes["error"] = str(error)
+            self.tracer.end_span(span, "error")
+
+
+tracer = Tracer(
+    JsonlSpanWriter(
+        path=settings.TRACE_FILE,
+        max_bytes=settings.TRACE_MAX_BYTES,
+        backup_count=settings.TRACE_BACKUP_COUNT,
+        batch_size=settings.TRACE_BATCH_SIZE,
+        flush_interval=settings.TRACE_FLUSH_INTERVAL
+    ),
+    sample_rate=settings.TRACE_SAMPLE_RATE
+)
+llm_tracing = LLMTracingCallback(tracer)
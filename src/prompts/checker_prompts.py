@@ -45,4 +45,12 @@ class CheckerPrompts:
     {context}
     
     Current message:
-    {message}""" 
\ No newline at end of file
+    {message}""" 
+
+    EXPLAIN_VERDICT = """The phone number has already been checked against the fraud database.
+    Verdict: {verdict}
+    
+    Answer the user's question using only this verdict:
+    1. Explain what the result means for them
+    2. Suggest sensible next steps
+    3. Do not invent reports that are not in the verdict"""
\ No newline at end of file
@@ -0,0 +1,25 @@
+import argparse
+import json
+from src.core.config import settings
+from src.database.repositories.archive_repository import MessageArchiveRepository
+from src.services.archive_service import MessageArchiver
+from src.utils.logger import logger
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive cold chat sessions to Parquet")
+    parser.add_argument(
+        "--partition", action="store_true",
+        help="Migrate chat_messages to monthly partitions first (MySQL, rebuilds the table)"
+    )
+    args = parser.parse_args()
+
+    repo = MessageArchiveRepository()
+    if args.partition:
+        repo.partition_table(settings.CHAT_PARTITION_MONTHS_AHEAD)
+
+    result = MessageArchiver(repo=repo).run_once()
+    logger.info(f"Archival finished: {result}")
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
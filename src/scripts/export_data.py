@@ -0,0 +1,23 @@
+import argparse
+import json
+from src.core.config import settings
+from src.database.repositories.export_repository import EXPORT_TABLES
+from src.services.export_service import ExportService
+from src.utils.logger import logger
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental Parquet/Arrow export for analytics")
+    parser.add_argument("--tables", nargs="+", choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES))
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--output-dir", default=settings.EXPORT_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=settings.EXPORT_CHUNK_ROWS)
+    parser.add_argument("--full", action="store_true", help="Ignore stored watermarks and export everything")
+    args = parser.parse_args()
+
+    service = ExportService(chunk_rows=args.chunk_rows)
+    results = service.run_incremental(args.tables, args.output_dir, args.format, full=args.full)
+    logger.info(f"Export finished: {results}")
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
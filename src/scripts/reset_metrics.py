@@ -0,0 +1,8 @@
+from src.monitoring.metrics import reset_multiprocess_dir
+
+def main():
+    # Run by the entrypoint before uvicorn starts its workers
+    reset_multiprocess_dir()
+
+if __name__ == "__main__":
+    main()
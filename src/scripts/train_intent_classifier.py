@@ -0,0 +1,48 @@
+import argparse
+import json
+from src.components.intent_classifier import train_intent_classifier
+from src.constants.routes import AgentRoutes
+from src.core.config import settings
+from src.services.database_service import DatabaseService
+from src.utils.logger import logger
+
+AGENTS = [AgentRoutes.GREETER.value, AgentRoutes.CHECKER.value, AgentRoutes.REPORTER.value]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the routing intent classifier on user messages and the agent that answered them"
+    )
+    parser.add_argument("--output", default=settings.INTENT_CLASSIFIER_PATH)
+    parser.add_argument("--limit", type=int, default=50000, help="Newest examples to train on")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction kept out to measure accuracy")
+    parser.add_argument("--threshold", type=float, default=settings.INTENT_CLASSIFIER_THRESHOLD)
+    parser.add_argument("--features", type=int, default=2 ** 18, help="Hashed feature space size")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument(
+        "--min-accuracy", type=float, default=0.9,
+        help="Keep the existing model unless holdout accuracy reaches this"
+    )
+    args = parser.parse_args()
+
+    examples = DatabaseService().get_routing_examples(AGENTS, args.limit)
+    if len(set(label for _, label in examples)) < 2:
+        raise SystemExit(f"Need examples for at least two agents, found {len(examples)} examples")
+
+    classifier = train_intent_classifier(
+        [text for text, _ in examples],
+        [label for _, label in examples],
+        n_features=args.features,
+        epochs=args.epochs,
+        holdout=args.holdout,
+        threshold=args.threshold
+    )
+    report = classifier.report
+    print(json.dumps(report))
+
+    if report.get("accuracy", 0.0) < args.min_accuracy:
+        raise SystemExit(f"Holdout accuracy {report.get('accuracy')} is below {args.min_accuracy}, not saving")
+    classifier.save(args.output)
+    logger.info(f"Saved intent classifier to {args.output}")
+
+if __name__ == "__main__":
+    main()
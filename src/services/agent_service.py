@@ -1,82 +1,184 @@
-from typing import List, Dict, Any, Union
-from langchain_groq import ChatGroq
+from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
+import asyncio
+import time
+import uuid
 from src.core.config import settings
-from src.utils.logger import logger
+from src.utils.logger import logger, get_category_logger, Capped, MessagesSummary
 from src.models.agents import AgentState, AgentResponse
 from src.services.database_service import DatabaseService
+from src.services.cache_service import RedisCache
+from src.services.session_lock import SessionLock
+from src.database.checkpointer import get_checkpointer
+from src.services.speculation import RoutePredictor, SpeculativeExecutor
+from src.services.analytics_service import AnalyticsWriter, TurnUsage
+from src.services.llm_factory import get_chat_model, node_tier
+from src.services.resilience import DEADLINE_GRACE, DeadlineExceeded, new_deadline, within_deadline
+from src.monitoring.metrics import DEADLINES_EXCEEDED, node_context, node_timings, observe_node
+from src.monitoring.tracing import tracer
 from langgraph.graph import StateGraph, MessagesState, END
 from langgraph.prebuilt import create_react_agent
 from src.tools.tool_factory import ToolFactory
 from src.prompts.system_prompts import SystemPrompts
 from src.prompts.analysis_prompts import AnalysisPrompts
 from src.components.supervisor import Supervisor
+from src.components.routing_batcher import RoutingBatcher
+from src.components.intent_classifier import load_intent_classifier
 from src.components.agents.greeter_agent import GreeterAgent
 from src.components.agents.checker_agent import CheckerAgent
 from src.components.agents.reporter_agent import ReporterAgent
 from src.constants.routes import AgentRoutes
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.language_models import BaseChatModel
 from src.models.chat import ChatMessage
 
+# High-volume categories, sampled per LOG_SAMPLE_RATES
+node_logger = get_category_logger("node")
+stream_logger = get_category_logger("stream")
+
 class AgentService:
-    def __init__(self):
+    def __init__(
+        self,
+        db_service: Optional[DatabaseService] = None,
+        llm: Optional[BaseChatModel] = None,
+        tools: Optional[ToolFactory] = None
+    ):
+        """Dependencies may be injected to run the graph without Groq or MySQL, e.g. in load tests"""
         self.settings = settings
-        self.db_service = DatabaseService()
-        self.llm = self._init_llm()
-        self.tools = ToolFactory()
+        self.db_service = db_service or DatabaseService()
+        # An injected model serves every node, including the supervisor's routing calls
+        self._injected_llm = llm
+        self.tools = tools or ToolFactory()
+        self.checkpointer = get_checkpointer()
+        self.analytics = AnalyticsWriter(self.db_service.save_message_analytics)
+        self.route_predictor = RoutePredictor()
+        self.session_lock = SessionLock()
+        self.speculation = (
+            SpeculativeExecutor(settings.SPECULATIVE_AGENTS.split(","))
+            if settings.SPECULATIVE_ROUTING else None
+        )
         self.graph = self._build_graph()
     
-    def _init_llm(self) -> ChatGroq:
-        return ChatGroq(
-            model_name=settings.GROQ_MODEL,
-            temperature=0.1,
-            api_key=settings.GROQ_API_KEY
+    def _node_llm(self, node: AgentRoutes, max_tokens: int = None) -> BaseChatModel:
+        """Client for the node's model tier (see node_tier), built once per distinct tier"""
+        if self._injected_llm is not None:
+            return self._injected_llm
+        tier = node_tier(node.value)
+        if max_tokens:
+            tier = tier.with_max_tokens(max_tokens)
+        return get_chat_model(tier)
+    
+    def _init_routing_batcher(self) -> Optional[RoutingBatcher]:
+        """Cross-session routing batcher, or None when ROUTING_BATCH_WINDOW_MS is 0"""
+        if settings.ROUTING_BATCH_WINDOW_MS <= 0:
+            return None
+        return RoutingBatcher(
+            self._node_llm(AgentRoutes.SUPERVISOR, settings.SUPERVISOR_MAX_TOKENS * settings.ROUTING_BATCH_MAX_SIZE),
+            window_ms=settings.ROUTING_BATCH_WINDOW_MS,
+            max_batch=settings.ROUTING_BATCH_MAX_SIZE
         )
     
     def _build_graph(self) -> StateGraph:
         # Create base agents
         checker_base = create_react_agent(
-            model=self.llm,
+            model=self._node_llm(AgentRoutes.CHECKER),
             tools=self.tools.get_checker_tools(),
             prompt=SystemPrompts.CHECKER
         )
         
         reporter_base = create_react_agent(
-            model=self.llm,
+            model=self._node_llm(AgentRoutes.REPORTER),
             tools=self.tools.get_reporter_tools(),
             prompt=SystemPrompts.REPORTER
         )
         
         greeter_base = create_react_agent(
-            model=self.llm,
+            model=self._node_llm(AgentRoutes.GREETER),
             tools=[],
             prompt=SystemPrompts.GREETER
         )
 
         # Create agent components
-        checker = CheckerAgent(checker_base)
+        checker = CheckerAgent(checker_base, self.db_service, RedisCache())
         reporter = ReporterAgent(reporter_base)
         greeter = GreeterAgent(greeter_base)
-        supervisor = Supervisor(self.llm, AnalysisPrompts.SUPERVISOR_ANALYSIS)
+        supervisor = Supervisor(
+            self._node_llm(AgentRoutes.SUPERVISOR),
+            AnalysisPrompts.SUPERVISOR_ANALYSIS,
+            batcher=self._init_routing_batcher(),
+            classifier=(
+                load_intent_classifier(settings.INTENT_CLASSIFIER_PATH)
+                if settings.INTENT_CLASSIFIER_ENABLED else None
+            ),
+            threshold=settings.INTENT_CLASSIFIER_THRESHOLD
+        )
+
+        # Checkpointed state keeps the whole conversation, agents only see a window of it.
+        # Returned messages are merged back by id, so the rest of the history is untouched.
+        window = self.settings.HISTORY_WINDOW + 1
+
+        def windowed(state: MessagesState) -> Dict:
+            return {"messages": state["messages"][-window:]}
+
+        agents = {
+            AgentRoutes.CHECKER.value: checker,
+            AgentRoutes.REPORTER.value: reporter,
+            AgentRoutes.GREETER.value: greeter
+        }
+
+        async def run_agent(agent, state: MessagesState, config: RunnableConfig) -> Dict:
+            """Reuse the speculative result when the supervisor agreed with the prediction"""
+            if self.speculation is not None:
+                result = await self.speculation.take(config["configurable"]["turn_id"], agent.name)
+                if result is not None:
+                    return result
+            return await agent.process(windowed(state))
 
         # Define nodes
-        async def supervisor_node(state: MessagesState) -> Dict:
-            result = await supervisor.process(state)
-            logger.info(f"Supervisor result: {result}")
+        @observe_node(AgentRoutes.SUPERVISOR.value)
+        @within_deadline
+        async def supervisor_node(state: MessagesState, config: RunnableConfig) -> Dict:
+            current = windowed(state)
+            session_id = config["configurable"]["thread_id"]
+            turn_id = config["configurable"]["turn_id"]
+            last_message = current["messages"][-1]
+            
+            speculating = False
+            if self.speculation is not None and isinstance(last_message, HumanMessage):
+                predicted = self.route_predictor.predict(session_id, last_message.content)
+                # Its LLM usage counts towards the predicted agent, not the supervisor
+                speculating = self.speculation.start(
+                    turn_id, predicted, agents[predicted].process(current), context=node_context(predicted)
+                )
+            
+            result = await supervisor.process(current)
+            if speculating:
+                self.speculation.resolve(turn_id, result["next"])
+            if result["next"] in agents:
+                self.route_predictor.record(session_id, result["next"])
+            node_logger.info("Supervisor result: %s", MessagesSummary(result))
             return result
 
-        async def checker_node(state: MessagesState) -> Dict:
-            result = await checker.process(state)
-            logger.info(f"Checker result: {result}")
+        @observe_node(AgentRoutes.CHECKER.value)
+        @within_deadline
+        async def checker_node(state: MessagesState, config: RunnableConfig) -> Dict:
+            result = await run_agent(checker, state, config)
+            node_logger.info("Checker result: %s", MessagesSummary(result))
             return result
 
-        async def reporter_node(state: MessagesState) -> Dict:
-            result = await reporter.process(state)
-            logger.info(f"Reporter result: {result}")
+        @observe_node(AgentRoutes.REPORTER.value)
+        @within_deadline
+        async def reporter_node(state: MessagesState, config: RunnableConfig) -> Dict:
+            result = await run_agent(reporter, state, config)
+            node_logger.info("Reporter result: %s", MessagesSummary(result))
             return result
 
-        async def greeter_node(state: MessagesState) -> Dict:
-            result = await greeter.process(state)
-            logger.info(f"Greeter result: {result}")
+        @observe_node(AgentRoutes.GREETER.value)
+        @within_deadline
+        async def greeter_node(state: MessagesState, config: RunnableConfig) -> Dict:
+            result = await run_agent(greeter, state, config)
+            node_logger.info("Greeter result: %s", MessagesSummary(result))
             return result
 
         # Build graph
@@ -119,7 +221,7 @@ class AgentService:
         # Set entry point
         workflow.set_entry_point(AgentRoutes.SUPERVISOR.value)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
     
     def _convert_to_langchain_messages(self, messages: List[Dict[str, Any]]) -> List[Union[HumanMessage, AIMessage]]:
         """Convert database messages to langchain messages"""
@@ -134,41 +236,60 @@ class AgentService:
                 ))
         return converted
 
-    async def process_message(
-        self, 
-        message: str, 
-        session_id: str, 
-        user_id: str
-    ) -> AgentResponse:
+    def _graph_config(
+        self,
+        session_id: str,
+        turn_id: Optional[str] = None,
+        callbacks: Optional[List[Any]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run config resuming the session's checkpointed state (thread_id = session_id)"""
+        config = {"configurable": {"thread_id": session_id, "turn_id": turn_id or str(uuid.uuid4())}}
+        if deadline is not None:
+            # Every node binds it, so its LLM calls stop waiting once it passes
+            config["configurable"]["deadline"] = deadline
+        if callbacks:
+            config["callbacks"] = callbacks
+        return config
+
+    async def _build_input(self, message: str, session_id: str) -> Dict[str, Any]:
+        """Build graph input, loading history from chat_messages only when there is no checkpoint"""
+        if self.checkpointer is not None:
+            snapshot = await self.graph.aget_state(self._graph_config(session_id))
+            if snapshot.values.get("messages"):
+                # The checkpointer restores the conversation, only send the new turn
+                return {"messages": [HumanMessage(content=message)]}
+        
+        # Load conversation history
+        history = self.db_service.get_session_messages(session_id)
+        
+        # Convert history to langchain messages
+        langchain_history = self._convert_to_langchain_messages(history)
+        
+        return {"messages": langchain_history + [HumanMessage(content=message)]}
+
+    async def _run_graph(
+        self,
+        graph_input: Optional[Dict[str, Any]],
+        session_id: str,
+        usage: Optional[TurnUsage] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Stream the graph and return the last agent update"""
+        last_response = None
+        turn_id = str(uuid.uuid4())
+        config = self._graph_config(session_id, turn_id, [usage] if usage else None, deadline)
+        # Backstop for work that does not check the deadline; agents get DEADLINE_GRACE
+        # past it to turn a timed-out LLM call into a degraded reply
+        timeout = asyncio.timeout(
+            None if deadline is None else max(deadline - time.monotonic(), 0) + DEADLINE_GRACE
+        )
+        # Node tasks inherit it, so every observe_node run reports to this turn's usage
+        timings_token = node_timings.set(usage.record_node if usage else None)
         try:
-            logger.info(f"Processing message: {message}")
-            
-            # Load conversation history
-            history = self.db_service.get_session_messages(session_id)
-            
-            # Convert history to langchain messages
-            langchain_history = self._convert_to_langchain_messages(history)
-            
-            # Create initial state with history and new message
-            state = {
-                "messages": langchain_history + [HumanMessage(content=message)],
-                "session_id": session_id,
-                "user_id": user_id
-            }
-            
-            # Save user message to database
-            self.db_service.save_message(
-                session_id=session_id,
-                user_id=user_id,
-                role="user",
-                content=message
-            )
-            
-            # Process stream and get last response
-            last_response = None
-            try:
-                async for response in self.graph.astream(state):
-                    logger.info(f"Stream response: {response}")
+            async with timeout:
+                async for response in self.graph.astream(graph_input, config):
+                    stream_logger.info("Stream response: %s", MessagesSummary(response))
                     if isinstance(response, dict):
                         if "messages" in response:
                             last_response = response
@@ -178,31 +299,116 @@ class AgentService:
                             last_response = response[AgentRoutes.GREETER.value]
                         elif isinstance(response.get(AgentRoutes.REPORTER.value), dict):
                             last_response = response[AgentRoutes.REPORTER.value]
-            except Exception as e:
-                logger.error(f"Error in stream processing: {str(e)}")
+        except TimeoutError:
+            if not timeout.expired():
                 raise
+            DEADLINES_EXCEEDED.labels(stage="graph").inc()
+            raise DeadlineExceeded(f"Turn for session {session_id} ran past its deadline") from None
+        except Exception as e:
+            logger.error(f"Error in stream processing: {str(e)}")
+            raise
+        finally:
+            node_timings.reset(timings_token)
+            if self.speculation is not None:
+                self.speculation.discard(turn_id)
+        
+        if not last_response or "messages" not in last_response:
+            logger.error("Invalid response format: %s", MessagesSummary(last_response))
+            raise Exception("No valid response generated")
+        
+        return last_response
+
+    async def process_message(
+        self, 
+        message: str, 
+        session_id: str, 
+        user_id: str,
+        deadline: Optional[float] = None
+    ) -> AgentResponse:
+        """Run one turn; turns of the same session run one at a time.
+
+        `deadline` is a time.monotonic() value, API_TIMEOUT from now by default.
+        Raises SessionBusy if the session is still busy after SESSION_LOCK_WAIT,
+        DeadlineExceeded if the turn could not finish in time.
+        """
+        deadline = deadline or new_deadline()
+        async with self.session_lock.hold(session_id):
+            return await self._process_message(message, session_id, user_id, deadline)
+
+    async def _process_message(
+        self, message: str, session_id: str, user_id: str, deadline: float
+    ) -> AgentResponse:
+        try:
+            with tracer.span("process_message", session_id=session_id):
+                logger.info("Processing message: %s", Capped(message))
+                usage = TurnUsage()
             
-            if not last_response or "messages" not in last_response:
-                logger.error(f"Invalid response format: {last_response}")
-                raise Exception("No valid response generated")
+                # Create initial state with history and new message
+                state = await self._build_input(message, session_id)
             
-            last_message = last_response["messages"][-1]
-            logger.info(f"Final response: {last_message}")
+                # Save user message to database
+                self.db_service.save_message(
+                    session_id=session_id,
+                    user_id=user_id,
+                    role="user",
+                    content=message
+                )
             
-            # Save assistant response to database
-            self.db_service.save_message(
-                session_id=session_id,
-                user_id=user_id,
-                role="assistant",
-                content=last_message.content,
-                name=getattr(last_message, 'name', None)
-            )
+                # Process stream and get last response
+                last_response = await self._run_graph(state, session_id, usage, deadline)
             
-            return AgentResponse(
-                content=last_message.content,
-                name=getattr(last_message, 'name', None)
-            )
+                last_message = last_response["messages"][-1]
+                logger.info("Final response: %s", Capped(last_message.content))
+            
+                # Save assistant response to database
+                message_id = self.db_service.save_message(
+                    session_id=session_id,
+                    user_id=user_id,
+                    role="assistant",
+                    content=last_message.content,
+                    name=getattr(last_message, 'name', None)
+                )
+                # Written in the background, never delays the response
+                self.analytics.record(usage.to_row(message_id, session_id))
+            
+                return AgentResponse(
+                    content=last_message.content,
+                    name=getattr(last_message, 'name', None)
+                )
             
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def resume_turn(self, session_id: str, user_id: str) -> Optional[AgentResponse]:
+        """Finish a turn that stopped mid-graph, returning None if nothing is pending"""
+        if self.checkpointer is None:
+            return None
+        
+        async with self.session_lock.hold(session_id):
+            return await self._resume_turn(session_id, user_id, new_deadline())
+
+    async def _resume_turn(self, session_id: str, user_id: str, deadline: float) -> Optional[AgentResponse]:
+        snapshot = await self.graph.aget_state(self._graph_config(session_id))
+        if not snapshot.next:
+            return None
+        
+        logger.info(f"Resuming session {session_id} at {snapshot.next}")
+        last_message = (await self._run_graph(None, session_id, deadline=deadline))["messages"][-1]
+        self.db_service.save_message(
+            session_id=session_id,
+            user_id=user_id,
+            role="assistant",
+            content=last_message.content,
+            name=getattr(last_message, 'name', None)
+        )
+        return AgentResponse(
+            content=last_message.content,
+            name=getattr(last_message, 'name', None)
+        )
+
+
+@lru_cache()
+def get_agent_service() -> AgentService:
+    """Get the process-wide agent service so the graph and checkpointer are built once"""
+    return AgentService()
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.core.config import settings
+from src.monitoring.metrics import current_node
+from src.utils.logger import logger
+
+
+class TurnUsage(BaseCallbackHandler):
+    """Accumulates token usage of every LLM call made while answering one turn.
+
+    Usage is also broken down per graph node: observe_node reports each
+    node's time through record_node, and LLM calls count towards the node
+    running when they finish. A node that runs twice in a turn (the
+    supervisor) adds up into one entry.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.model_name: Optional[str] = None
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+
+    def _node(self, node: str) -> Dict[str, Any]:
+        return self.nodes.setdefault(
+            node, {"processing_time": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "model_name": None}
+        )
+
+    def record_node(self, node: str, seconds: float):
+        self._node(node)["processing_time"] += seconds
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        llm_output = response.llm_output or {}
+        usage = llm_output.get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        # The last call is the one that produced the reply
+        self.model_name = llm_output.get("model_name", self.model_name)
+
+        node = current_node.get()
+        if node is not None:
+            entry = self._node(node)
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["model_name"] = llm_output.get("model_name", entry["model_name"])
+
+    def to_row(self, message_id: str, session_id: str) -> Dict[str, Any]:
+        return {
+            "message_id": message_id,
+            "session_id": session_id,
+            "processing_time": round(time.perf_counter() - self.started, 4),
+            "token_count": self.prompt_tokens + self.completion_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_tokens": self.prompt_tokens,
+            # Turns answered without an LLM call (e.g. local phone checks) have no model
+            "model_name": self.model_name,
+            "nodes": [
+                {
+                    "node": node,
+                    "processing_time": round(entry["processing_time"], 4),
+                    "token_count": entry["prompt_tokens"] + entry["completion_tokens"],
+                    "completion_tokens": entry["completion_tokens"],
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "model_name": entry["model_name"],
+                }
+                for node, entry in self.nodes.items()
+            ],
+        }
+
+
+class AnalyticsWriter:
+    """Writes message_analytics rows in the background.
+
+    record() only enqueues, so the response never waits on the insert. A
+    single task drains the queue, writing up to batch_size rows per round
+    trip or whatever arrived within flush_interval seconds. When the queue
+    is full new rows are dropped rather than slowing down requests.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Dict[str, Any]]], Any],
+        batch_size: int = settings.ANALYTICS_BATCH_SIZE,
+        flush_interval: float = settings.ANALYTICS_FLUSH_INTERVAL,
+        max_pending: int = settings.ANALYTICS_MAX_PENDING
+    ):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[Dict[str, Any]] = []
+        self.dropped = 0
+
+    def record(self, row: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Analytics queue full, dropped row ({self.dropped} so far)")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        try:
+            await asyncio.to_thread(self.write, batch)
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} analytics rows: {str(e)}")
+
+    async def flush(self):
+        """Write everything still queued, used on shutdown"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        # Rows the cancelled task had already taken off the queue
+        batch, self._batch = self._batch, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            if len(batch) >= self.batch_size:
+                await self._write(batch)
+                batch = []
+        if batch:
+            await self._write(batch)
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from src.core.config import settings
+from src.database.checkpointer import get_checkpointer
+from src.database.repositories.archive_repository import MessageArchiveRepository
+from src.utils.logger import logger
+
+ARCHIVE_SCHEMA = pa.schema([
+    ("message_id", pa.string()),
+    ("session_id", pa.string()),
+    ("user_id", pa.string()),
+    ("role", pa.string()),
+    ("content", pa.string()),
+    ("agent_name", pa.string()),
+    ("turn_number", pa.int32()),
+    ("parent_message_id", pa.string()),
+    ("created_at", pa.timestamp("us")),
+    ("metadata", pa.string()),
+])
+
+LOCK_NAME = "chat_message_archiver"
+
+
+def _normalize(row: Dict[str, Any]) -> Dict[str, Any]:
+    # MySQL may return JSON columns as bytes
+    metadata = row.get("metadata")
+    if isinstance(metadata, (bytes, bytearray)):
+        row["metadata"] = metadata.decode()
+    return row
+
+
+class MessageArchiver:
+    """Moves messages of cold sessions from chat_messages into Parquet files.
+
+    Messages are streamed in chunks into one compressed file per batch of
+    sessions, under ARCHIVE_DIR/chat_messages/archived_date=YYYY-MM-DD/. Rows
+    are deleted only after their file is complete, by message ID, so a
+    message written to a session while it was being archived is kept. A
+    session that resumes after archival starts a new transcript in the table,
+    its turn numbers continuing from chat_sessions.last_turn so they never
+    repeat archived ones. Analytics rows stay, their message_id set to NULL.
+    The sessions' graph checkpoints, which hold the same transcript, are
+    deleted along with the rows.
+    """
+
+    def __init__(
+        self,
+        repo: MessageArchiveRepository = None,
+        directory: str = settings.ARCHIVE_DIR,
+        idle_days: int = settings.ARCHIVE_IDLE_DAYS,
+        batch_sessions: int = settings.ARCHIVE_BATCH_SESSIONS,
+        chunk_rows: int = settings.ARCHIVE_CHUNK_ROWS,
+        compression: str = settings.ARCHIVE_COMPRESSION,
+        checkpointer: Optional[BaseCheckpointSaver] = None
+    ):
+        self.repo = repo or MessageArchiveRepository()
+        self.checkpointer = checkpointer if checkpointer is not None else get_checkpointer()
+        self.directory = directory
+        self.idle_days = idle_days
+        self.batch_sessions = batch_sessions
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+
+    def _write_batch(self, session_ids: List[str]) -> List[str]:
+        """Stream the sessions' messages into a new Parquet file, returning the archived IDs"""
+        directory = os.path.join(
+            self.directory, "chat_messages", f"archived_date={datetime.now():%Y-%m-%d}"
+        )
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{uuid.uuid4().hex}.parquet")
+        temp_path = f"{path}.tmp"
+
+        message_ids = []
+        with pq.ParquetWriter(temp_path, ARCHIVE_SCHEMA, compression=self.compression) as writer:
+            for rows in self.repo.stream_messages(session_ids, self.chunk_rows):
+                writer.write_batch(pa.RecordBatch.from_pylist([_normalize(r) for r in rows], schema=ARCHIVE_SCHEMA))
+                message_ids.extend(r["message_id"] for r in rows)
+        os.replace(temp_path, path)
+        logger.info(f"Archived {len(message_ids)} messages from {len(session_ids)} sessions to {path}")
+        return message_ids
+
+    def archive_batch(self) -> int:
+        """Archive one batch of cold sessions, returning the number of messages moved"""
+        session_ids = self.repo.cold_sessions(self.idle_days, self.batch_sessions)
+        if not session_ids:
+            return 0
+        message_ids = self._write_batch(session_ids)
+        for start in range(0, len(message_ids), self.chunk_rows):
+            self.repo.delete_messages(message_ids[start:start + self.chunk_rows])
+        if self.checkpointer is not None:
+            for session_id in session_ids:
+                self.checkpointer.delete_thread(session_id)
+        return len(message_ids)
+
+    def run_once(self, max_batches: int = 50) -> Dict[str, Any]:
+        """Archive cold sessions, then keep the monthly partitions rolling (MySQL)"""
+        with self.repo.exclusive_lock(LOCK_NAME) as acquired:
+            if not acquired:
+                logger.info("Message archival already running in another worker")
+                return {"skipped": True}
+
+            archived = 0
+            for _ in range(max_batches):
+                moved = self.archive_batch()
+                archived += moved
+                if not moved:
+                    break
+
+            added = dropped = []
+            if self.repo.is_partitioned():
+                added = self.repo.add_future_partitions(settings.CHAT_PARTITION_MONTHS_AHEAD)
+                dropped = self.repo.drop_empty_partitions(self.idle_days)
+            return {"archived": archived, "partitions_added": added, "partitions_dropped": dropped}
+
+    async def run_forever(self, interval: float = settings.ARCHIVE_INTERVAL):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Message archival failed: {e}")
+            await asyncio.sleep(interval)
@@ -1,8 +1,35 @@
 from redis import Redis
 from src.core.config import settings
 from src.utils.logger import logger
-import json
-from typing import Optional, Any
+from src.monitoring.metrics import CACHE_REQUESTS
+from src.utils.codec import cache_codec
+from typing import Optional, Any, List
+import re
+
+# Deletes a lease only while it still holds the caller's token
+RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Per-session keys, evicted when a session goes inactive
+SESSION_KEY_TEMPLATES = (
+    "session:{session_id}:last_active",
+)
+
+def session_keys(session_id: str) -> List[str]:
+    return [template.format(session_id=session_id) for template in SESSION_KEY_TEMPLATES]
+
+def fraud_check_keys(phone_number: str) -> List[str]:
+    """Checker lookup cache keys for a number in any format (the checker caches +1-XXX-XXX-XXXX)"""
+    digits = re.sub(r"\D", "", phone_number)
+    keys = [f"fraud_check:{phone_number}"]
+    if len(digits) in (10, 11):
+        digits = digits[-10:]
+        keys.append(f"fraud_check:+1-{digits[:3]}-{digits[3:6]}-{digits[6:]}")
+    return keys
 
 class RedisCache:
     _instance = None
@@ -18,17 +45,21 @@ class RedisCache:
                 host=settings.REDIS_HOST,
                 port=settings.REDIS_PORT,
                 password=settings.REDIS_PASSWORD,
-                decode_responses=True,
+                # Values are bytes from CACHE_CODEC, which may be binary
+                decode_responses=False,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 max_connections=50
             )
     
     async def get(self, key: str) -> Optional[Any]:
+        prefix = key.split(":", 1)[0]
         try:
             value = self.client.get(key)
-            return json.loads(value) if value else None
+            CACHE_REQUESTS.labels(prefix=prefix, result="hit" if value else "miss").inc()
+            return cache_codec().decode(value) if value else None
         except Exception as e:
+            CACHE_REQUESTS.labels(prefix=prefix, result="error").inc()
             logger.error(f"Redis get error: {e}")
             return None
     
@@ -37,15 +68,53 @@ class RedisCache:
             return self.client.setex(
                 key,
                 expiry,
-                json.dumps(value)
+                cache_codec().encode(value)
             )
         except Exception as e:
             logger.error(f"Redis set error: {e}")
             return False
     
+    async def add(self, key: str, value: Any, expiry: int = 3600) -> Optional[bool]:
+        """Set only if the key is absent; None when Redis is unavailable"""
+        try:
+            return bool(self.client.set(key, cache_codec().encode(value), nx=True, ex=expiry))
+        except Exception as e:
+            logger.error(f"Redis add error: {e}")
+            return None
+    
     async def delete(self, key: str) -> bool:
         try:
             return bool(self.client.delete(key))
         except Exception as e:
             logger.error(f"Redis delete error: {e}")
-            return False 
\ No newline at end of file
+            return False
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete keys in a single round trip, returning how many existed"""
+        return self.delete_many_blocking(keys)
+
+    def delete_many_blocking(self, keys: List[str]) -> int:
+        """delete_many for synchronous callers such as DatabaseService"""
+        if not keys:
+            return 0
+        try:
+            return self.client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return 0
+
+    async def acquire_lease(self, key: str, token: str, ttl: int) -> Optional[bool]:
+        """SET NX with a TTL; None when Redis is unavailable"""
+        try:
+            return bool(self.client.set(key, token, nx=True, ex=ttl))
+        except Exception as e:
+            logger.error(f"Redis lease error: {e}")
+            return None
+    
+    async def release_lease(self, key: str, token: str) -> bool:
+        """Release a lease if it is still ours, returning False if it had expired"""
+        try:
+            return bool(self.client.eval(RELEASE_LEASE_SCRIPT, 1, key, token))
+        except Exception as e:
+            logger.error(f"Redis lease error: {e}")
+            return False
@@ -1,15 +1,19 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from datetime import datetime
 from src.utils.logger import logger
 from src.database.repositories.fraud_report import FraudReportRepository
 from src.database.repositories.user_repository import UserRepository
 from src.database.repositories.chat_repository import ChatRepository, ChatMessage
+from src.database.repositories.analytics_repository import AnalyticsRepository
+from src.services.cache_service import RedisCache, fraud_check_keys
 
 class DatabaseService:
-    def __init__(self):
+    def __init__(self, cache: RedisCache = None):
         self.chat_repo = ChatRepository()
         self.user_repo = UserRepository()
         self.fraud_repo = FraudReportRepository()
+        self.analytics_repo = AnalyticsRepository()
+        self.cache = cache or RedisCache()
     
     def save_message(
         self, 
@@ -19,7 +23,8 @@ class DatabaseService:
         content: str, 
         name: str = None, 
         metadata: dict = None
-    ) -> bool:
+    ) -> str:
+        """Save a message and return its message_id"""
         try:
             return self.chat_repo.save_message(
                 session_id=session_id,
@@ -33,25 +38,59 @@ class DatabaseService:
             logger.error(f"Error saving message: {str(e)}")
             raise
     
+    @staticmethod
+    def _message_dict(msg: ChatMessage) -> Dict[str, Any]:
+        return {
+            'role': msg.role,
+            'content': msg.content,
+            'name': msg.name,
+            'created_at': msg.created_at,
+            'metadata': msg.metadata,
+            'message_id': msg.message_id,
+            'turn_number': msg.turn_number
+        }
+    
     def get_session_messages(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get messages for a session"""
         try:
             messages = self.chat_repo.get_session_messages(session_id, limit)
-            return [
-                {
-                    'role': msg.role,
-                    'content': msg.content,
-                    'name': msg.name,
-                    'created_at': msg.created_at,
-                    'metadata': msg.metadata,
-                    'message_id': msg.message_id,
-                    'turn_number': msg.turn_number
-                } for msg in messages
-            ]
+            return [self._message_dict(msg) for msg in messages]
         except Exception as e:
             logger.error(f"Error getting session messages: {str(e)}")
             return []
     
+    def get_messages_page(
+        self, session_id: str, after_turn: Optional[int], limit: int, descending: bool
+    ) -> List[Dict[str, Any]]:
+        """A keyset-paginated page of a session's messages"""
+        messages = self.chat_repo.get_messages_page(session_id, after_turn, limit, descending)
+        return [self._message_dict(msg) for msg in messages]
+    
+    def stream_session_messages(self, session_id: str, descending: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """All of a session's messages in chunks"""
+        for chunk in self.chat_repo.stream_session_messages(session_id, descending):
+            yield [self._message_dict(msg) for msg in chunk]
+    
+    def deactivate_idle_sessions(self, idle_minutes: int, limit: int) -> List[str]:
+        """Mark a batch of idle sessions inactive"""
+        return self.chat_repo.deactivate_idle_sessions(idle_minutes, limit)
+    
+    def get_routing_examples(self, agents: List[str], limit: int) -> List[Tuple[str, str]]:
+        """(user message, answering agent) pairs to train the routing classifier on"""
+        return self.chat_repo.get_routing_examples(agents, limit)
+    
+    def save_message_analytics(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert a batch of message_analytics rows"""
+        return self.analytics_repo.save_batch(rows)
+    
+    def get_latency_percentiles(self, group_by: str, hours: int = 24) -> List[Dict[str, Any]]:
+        """p50/p95 latency grouped by graph node or model"""
+        return self.analytics_repo.latency_percentiles(group_by, hours)
+    
+    def get_token_usage(self, group_by: str, hours: int = 24) -> List[Dict[str, Any]]:
+        """Token usage grouped by node or model"""
+        return self.analytics_repo.token_usage(group_by, hours)
+    
     def check_phone_number(self, phone_number: str) -> Optional[Dict[str, Any]]:
         """Check if a phone number has been reported"""
         try:
@@ -60,14 +99,38 @@ class DatabaseService:
             logger.error(f"Error checking phone number: {str(e)}")
             return None
     
+    def find_fraud_reports(self, phone_numbers: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Get all reports filed under any of the given number formats (None if the lookup failed)"""
+        try:
+            return self.fraud_repo.check_numbers(phone_numbers)
+        except Exception as e:
+            logger.error(f"Error finding fraud reports: {str(e)}")
+            return None
+    
     def report_fraud(self, phone_number: str, description: str, reporter_ip: str) -> bool:
         """Report a fraudulent phone number"""
         try:
-            return self.fraud_repo.report_fraud(phone_number, description, reporter_ip)
+            reported = self.fraud_repo.report_fraud(phone_number, description, reporter_ip)
+            if reported:
+                # The checker caches lookups, "not reported" included, for CHECKER_CACHE_TTL
+                self.cache.delete_many_blocking(fraud_check_keys(phone_number))
+            return reported
         except Exception as e:
             logger.error(f"Error reporting fraud: {str(e)}")
             return False
     
+    def get_top_numbers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most reported phone numbers"""
+        return self.fraud_repo.top_numbers(limit)
+    
+    def get_reports_per_day(self, days: int = 30) -> List[Dict[str, Any]]:
+        """Fraud reports and newly reported numbers per day"""
+        return self.fraud_repo.reports_per_day(days)
+    
+    def get_new_numbers_per_hour(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Newly reported numbers per hour"""
+        return self.fraud_repo.new_numbers_per_hour(hours)
+    
     def get_or_create_user(self, user_id: str, metadata: dict = None) -> Dict[str, Any]:
         """Get or create a user"""
         try:
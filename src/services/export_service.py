@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.core.config import settings
+from src.database.repositories.export_repository import EXPORT_TABLES, ExportRepository
+from src.utils.logger import logger
+
+ARROW_SCHEMAS = {
+    "fraud_reports": pa.schema([
+        ("id", pa.int64()),
+        ("phone_number", pa.string()),
+        ("is_fraud", pa.bool_()),
+        ("report_count", pa.int32()),
+        ("first_reported_at", pa.timestamp("us")),
+        ("last_updated_at", pa.timestamp("us")),
+        ("description", pa.string()),
+        ("reporter_ip", pa.string()),
+    ]),
+    "chat_messages": pa.schema([
+        ("id", pa.int64()),
+        ("message_id", pa.string()),
+        ("session_id", pa.string()),
+        ("user_id", pa.string()),
+        ("role", pa.string()),
+        ("content", pa.string()),
+        ("agent_name", pa.string()),
+        ("turn_number", pa.int32()),
+        ("parent_message_id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("metadata", pa.string()),
+    ]),
+    "message_analytics": pa.schema([
+        ("id", pa.int64()),
+        ("message_id", pa.string()),
+        ("session_id", pa.string()),
+        ("processing_time", pa.float64()),
+        ("token_count", pa.int32()),
+        ("completion_tokens", pa.int32()),
+        ("prompt_tokens", pa.int32()),
+        ("model_name", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ]),
+}
+
+FORMATS = {"parquet": "parquet", "arrow": "arrows"}
+
+
+def _to_batch(table: str, rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    schema = ARROW_SCHEMAS[table]
+    for row in rows:
+        for field in schema:
+            value = row[field.name]
+            # MySQL returns BOOLEAN as 0/1 and may return JSON as bytes
+            if pa.types.is_boolean(field.type) and value is not None:
+                row[field.name] = bool(value)
+            elif isinstance(value, (bytes, bytearray)):
+                row[field.name] = value.decode()
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def watermark_of(table: str, row: Dict[str, Any]) -> List[Any]:
+    return [row[key] for key in EXPORT_TABLES[table].keys]
+
+
+def row_digest(table: str, row: Dict[str, Any]) -> str:
+    """Fingerprint of an exported row, to tell a re-read row from an updated one"""
+    values = repr(tuple(row[column] for column in EXPORT_TABLES[table].columns))
+    return hashlib.blake2b(values.encode(), digest_size=8).hexdigest()
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained after every batch"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _open_writer(table: str, sink, fmt: str):
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, ARROW_SCHEMAS[table], compression=settings.EXPORT_COMPRESSION)
+    if fmt == "arrow":
+        return pa.ipc.new_stream(sink, ARROW_SCHEMAS[table])
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+class WatermarkStore:
+    """Last exported keyset per table, kept as JSON next to the exports"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, List[Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            stored = json.load(f)
+        return {
+            table: [datetime.fromisoformat(v) if isinstance(v, str) else v for v in values]
+            for table, values in stored.items()
+        }
+
+    def save(self, watermarks: Dict[str, List[Any]]):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(watermarks, f, default=lambda v: v.isoformat(), indent=1)
+        os.replace(temp_path, self.path)
+
+
+class ExportService:
+    """Streams tables to Parquet files or Arrow IPC streams in bounded memory"""
+
+    def __init__(self, repo: ExportRepository = None, chunk_rows: int = settings.EXPORT_CHUNK_ROWS):
+        self.repo = repo or ExportRepository()
+        self.chunk_rows = chunk_rows
+
+    def _batches(
+        self, table: str, after: Optional[Sequence[Any]]
+    ) -> Iterator[Tuple[Optional[pa.RecordBatch], List[Any]]]:
+        """(batch, watermark) per chunk; batch is None when every row in it was already exported.
+
+        For tables that re-read the watermark's first key, the watermark ends
+        with {id: row digest} of the rows exported at that key, and rows that
+        are still unchanged there are left out.
+        """
+        spec = EXPORT_TABLES[table]
+        first_key, id_key = spec.keys[0], spec.keys[-1]
+        exported = {}
+        if spec.reread_first_key and after is not None and len(after) > len(spec.keys):
+            exported = after[len(spec.keys)]
+        edge, seen = None, {}
+        chunks = self.repo.stream_rows(table, after, self.chunk_rows)
+        try:
+            for rows in chunks:
+                fresh = []
+                for row in rows:
+                    digest = row_digest(table, row) if spec.reread_first_key else None
+                    if digest is not None:
+                        if row[first_key] != edge:
+                            edge, seen = row[first_key], {}
+                        seen[str(row[id_key])] = digest
+                    if digest is None or exported.get(str(row[id_key])) != digest:
+                        fresh.append(row)
+                watermark = watermark_of(table, rows[-1])
+                if spec.reread_first_key:
+                    watermark.append(dict(seen))
+                yield (_to_batch(table, fresh) if fresh else None), watermark
+        finally:
+            # Release the cursor right away if the consumer stops early
+            chunks.close()
+
+    def stream(self, table: str, fmt: str, after: Optional[Sequence[Any]] = None) -> Iterator[bytes]:
+        """Encoded export as a byte stream, flushed after every chunk of rows"""
+        sink = _ChunkSink()
+        writer = _open_writer(table, sink, fmt)
+        try:
+            for batch, _ in self._batches(table, after):
+                if batch is None:
+                    continue
+                writer.write_batch(batch)
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def export_file(
+        self, table: str, directory: str, fmt: str, after: Optional[Sequence[Any]] = None
+    ) -> Tuple[Optional[str], int, Optional[List[Any]]]:
+        """Write rows past the watermark to a new file, returning (path, rows, new watermark).
+
+        No file is created when there is nothing new.
+        """
+        os.makedirs(os.path.join(directory, table), exist_ok=True)
+        path = os.path.join(directory, table, f"part-{datetime.now():%Y%m%dT%H%M%S%f}.{FORMATS[fmt]}")
+        temp_path = f"{path}.tmp"
+        rows, watermark, writer, sink = 0, None, None, None
+        try:
+            for batch, watermark in self._batches(table, after):
+                if batch is None:
+                    continue
+                if writer is None:
+                    sink = pa.OSFile(temp_path, "wb")
+                    writer = _open_writer(table, sink, fmt)
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+                sink.close()
+        if writer is None:
+            return None, 0, None
+        os.replace(temp_path, path)
+        logger.info(f"Exported {rows} {table} rows to {path}")
+        return path, rows, watermark
+
+    def run_incremental(self, tables: Sequence[str], directory: str, fmt: str, full: bool = False) -> Dict[str, Dict]:
+        """Export each table from its stored watermark and advance it after the file is complete"""
+        store = WatermarkStore(os.path.join(directory, "_watermarks.json"))
+        watermarks = {} if full else store.load()
+        results = {}
+        for table in tables:
+            path, rows, watermark = self.export_file(table, directory, fmt, watermarks.get(table))
+            if watermark is not None:
+                watermarks[table] = watermark
+                store.save(watermarks)
+            results[table] = {"path": path, "rows": rows}
+        return results
+
+
+@lru_cache()
+def get_export_service() -> ExportService:
+    return ExportService()
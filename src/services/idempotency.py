@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.monitoring.metrics import IDEMPOTENT_REQUESTS
+from src.services.cache_service import RedisCache
+
+KEY_TEMPLATE = "idempotency:{key}"
+
+
+class IdempotencyError(Exception):
+    """A duplicate request that can be neither coalesced nor replayed"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def fingerprint(*parts: Optional[str]) -> str:
+    """Stable hash of the request fields a key is bound to"""
+    return hashlib.sha256("\x1f".join(part or "" for part in parts).encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """Runs each idempotency key once and shares its result with duplicates.
+
+    Duplicates in the same worker await the in-flight future. Across workers
+    the first request claims the Redis key with a pending marker (SET NX,
+    expiring after pending_ttl so a dead worker does not block the key for
+    good), and duplicates poll it for up to `wait` seconds. The finished
+    result is stored for `ttl` seconds and replayed to later retries. Failed
+    executions are not stored, so a retry runs again. Without Redis only the
+    in-process coalescing applies.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = None,
+        ttl: int = settings.IDEMPOTENCY_TTL,
+        pending_ttl: int = settings.IDEMPOTENCY_PENDING_TTL,
+        wait: float = settings.IDEMPOTENCY_WAIT
+    ):
+        self.cache = cache or RedisCache()
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.wait = wait
+        self._inflight: Dict[str, Tuple[asyncio.Future, str]] = {}
+
+    async def run(
+        self,
+        key: str,
+        request_fingerprint: str,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return (result, replayed) where replayed means execute() ran for another request"""
+        loop = asyncio.get_running_loop()
+        redis_key = KEY_TEMPLATE.format(key=key)
+        deadline = loop.time() + self.wait
+        delay = 0.05
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                future, owner_fingerprint = inflight
+                self._check_fingerprint(owner_fingerprint, request_fingerprint)
+                IDEMPOTENT_REQUESTS.labels(outcome="coalesced").inc()
+                return await asyncio.shield(future), True
+
+            claimed = await self.cache.add(
+                redis_key, {"status": "pending", "fingerprint": request_fingerprint}, self.pending_ttl
+            )
+            if claimed is not False:
+                break
+            entry = await self.cache.get(redis_key)
+            if entry is None:
+                # Released by a failed owner or expired between the two calls
+                continue
+            self._check_fingerprint(entry["fingerprint"], request_fingerprint)
+            if entry["status"] == "done":
+                IDEMPOTENT_REQUESTS.labels(outcome="replayed").inc()
+                return entry["result"], True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                IDEMPOTENT_REQUESTS.labels(outcome="in_progress").inc()
+                raise IdempotencyError("A request with this idempotency key is still in progress", 409)
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+
+        IDEMPOTENT_REQUESTS.labels(outcome="executed").inc()
+        future = loop.create_future()
+        self._inflight[key] = (future, request_fingerprint)
+        try:
+            result = await execute()
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved, since there may be no coalesced waiter to see it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.cancel()
+            if claimed:
+                if future.cancelled() or future.exception() is not None:
+                    await self.cache.delete(redis_key)
+                else:
+                    await self.cache.set(
+                        redis_key,
+                        {"status": "done", "fingerprint": request_fingerprint, "result": future.result()},
+                        ttl or self.ttl
+                    )
+        return result, False
+
+    @staticmethod
+    def _check_fingerprint(stored: str, received: str):
+        if stored != received:
+            IDEMPOTENT_REQUESTS.labels(outcome="mismatch").inc()
+            raise IdempotencyError("Idempotency key was already used for a different request", 422)
+
+
+@lru_cache()
+def get_idempotency_guard() -> IdempotencyGuard:
+    return IdempotencyGuard()
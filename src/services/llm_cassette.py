@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, messages_from_dict, message_to_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict
+
+from src.core.config import settings
+from src.utils.logger import logger
+
+# Keeps the wrapped call out of the parent run so callbacks fire only for the wrapper
+INNER_CONFIG = {"callbacks": []}
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class Cassette:
+    """Recorded LLM interactions on disk, keyed by a hash of the request.
+
+    Identical requests are kept in call order and replayed in the same
+    order, repeating the last one once exhausted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._replayed: Dict[str, int] = defaultdict(int)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._interactions.update(json.load(f)["interactions"])
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+    def record(self, key: str, interaction: Dict[str, Any]):
+        with self._lock:
+            self._interactions[key].append(interaction)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write a full copy then swap, so a crash never leaves half a cassette
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"interactions": self._interactions}, f, indent=1)
+            os.replace(temp_path, self.path)
+
+    def replay(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise CassetteMiss(f"No recorded LLM response for request {key[:12]} in {self.path}")
+            index = min(self._replayed[key], len(recorded) - 1)
+            self._replayed[key] += 1
+            return recorded[index]
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records the wrapped model's responses or replays them offline.
+
+    Tools bound through bind_tools (react agents, structured routing output)
+    are part of the request key, so tool calls are recorded and replayed too.
+    In replay mode the wrapped model is never called.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: Any = None
+    cassette: Cassette
+    mode: str = "replay"
+    latency_scale: float = 0.0
+    tools: List[Dict[str, Any]] = []
+    tool_choice: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        inner = self.inner
+        if self.mode == "record":
+            inner = self.inner.bind_tools(tools, tool_choice=tool_choice, **kwargs)
+        return self.model_copy(update={
+            "inner": inner,
+            "tools": [convert_to_openai_tool(tool) for tool in tools],
+            "tool_choice": tool_choice
+        })
+
+    def _request(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        # Message IDs are generated per run, leave them out so keys are stable
+        return {
+            "messages": [
+                {
+                    "type": m.type,
+                    "content": m.content,
+                    "name": getattr(m, "name", None),
+                    "tool_calls": getattr(m, "tool_calls", None),
+                    "tool_call_id": getattr(m, "tool_call_id", None),
+                } for m in messages
+            ],
+            "tools": self.tools,
+            "tool_choice": self.tool_choice,
+        }
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = Cassette.request_key(self._request(messages))
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = self.inner.invoke(messages, config=INNER_CONFIG, stop=stop)
+            return self._record(key, messages, response, time.perf_counter() - start)
+        interaction = self.cassette.replay(key)
+        time.sleep(interaction["latency"] * self.latency_scale)
+        return self._result(interaction)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = Cassette.request_key(self._request(messages))
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = await self.inner.ainvoke(messages, config=INNER_CONFIG, stop=stop)
+            return self._record(key, messages, response, time.perf_counter() - start)
+        interaction = self.cassette.replay(key)
+        await asyncio.sleep(interaction["latency"] * self.latency_scale)
+        return self._result(interaction)
+
+    def _record(self, key: str, messages: List[BaseMessage], response: AIMessage, latency: float) -> ChatResult:
+        interaction = {
+            "request": self._request(messages),
+            "response": message_to_dict(response),
+            "latency": round(latency, 4),
+        }
+        self.cassette.record(key, interaction)
+        return self._result(interaction)
+
+    @staticmethod
+    def _result(interaction: Dict[str, Any]) -> ChatResult:
+        message = messages_from_dict([interaction["response"]])[0]
+        metadata = message.response_metadata or {}
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={
+                "model_name": metadata.get("model_name"),
+                "token_usage": metadata.get("token_usage") or {}
+            }
+        )
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        return next((output for output in llm_outputs if output), {})
+
+
+@lru_cache()
+def get_cassette(path: str) -> Cassette:
+    """One Cassette per file, shared by every wrapped model"""
+    return Cassette(path)
+
+
+def with_cassette(llm: BaseChatModel) -> BaseChatModel:
+    """Wrap llm according to LLM_CASSETTE_MODE (off, record or replay)"""
+    mode = settings.LLM_CASSETTE_MODE
+    if mode == "off":
+        return llm
+    if mode not in ("record", "replay"):
+        raise ValueError(f"Unknown LLM_CASSETTE_MODE: {mode}")
+
+    logger.info(f"LLM cassette {mode} mode using {settings.LLM_CASSETTE_PATH}")
+    # Callbacks move to the wrapper so metrics and traces see each call once
+    return CassetteChatModel(
+        inner=llm.model_copy(update={"callbacks": None}),
+        cassette=get_cassette(settings.LLM_CASSETTE_PATH),
+        mode=mode,
+        latency_scale=settings.LLM_CASSETTE_LATENCY_SCALE,
+        callbacks=llm.callbacks
+    )
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_groq import ChatGroq
+
+from src.core.config import settings
+from src.monitoring.metrics import llm_metrics
+from src.monitoring.tracing import llm_tracing
+from src.services.llm_cassette import with_cassette
+from src.services.resilience import with_resilience
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    model: str
+    temperature: float
+    # None leaves the provider's default
+    max_tokens: Optional[int] = None
+
+    def with_max_tokens(self, max_tokens: int) -> "ModelTier":
+        return replace(self, max_tokens=max_tokens)
+
+
+def node_tier(node: str) -> ModelTier:
+    """Model settings for a graph node from <NODE>_MODEL, _TEMPERATURE and _MAX_TOKENS"""
+    prefix = node.upper()
+    return ModelTier(
+        model=getattr(settings, f"{prefix}_MODEL") or settings.GROQ_MODEL,
+        temperature=getattr(settings, f"{prefix}_TEMPERATURE"),
+        max_tokens=getattr(settings, f"{prefix}_MAX_TOKENS") or None
+    )
+
+
+@lru_cache()
+def get_chat_model(tier: ModelTier) -> BaseChatModel:
+    """One client per distinct tier, shared by every node configured with it"""
+    return with_resilience(with_cassette(ChatGroq(
+        model_name=tier.model,
+        temperature=tier.temperature,
+        max_tokens=tier.max_tokens,
+        api_key=settings.GROQ_API_KEY,
+        callbacks=[llm_metrics, llm_tracing]
+    )), tier.model)
@@ -0,0 +1,276 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict
+
+from src.core.config import settings
+from src.monitoring.metrics import DEADLINES_EXCEEDED, LLM_CIRCUIT_EVENTS, LLM_HEDGES
+from src.services.llm_cassette import INNER_CONFIG
+from src.utils.logger import logger
+
+# Time past the deadline the graph may take to turn a timed-out call into a degraded reply
+DEADLINE_GRACE = 1.0
+
+# time.monotonic() by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time before the call could finish"""
+
+
+class CircuitOpen(Exception):
+    """The LLM provider is failing, calls are rejected until the breaker resets"""
+
+
+def new_deadline(timeout: float = None) -> float:
+    return time.monotonic() + (settings.API_TIMEOUT if timeout is None else timeout)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, None when there is none"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def deadline_context(deadline: Optional[float]) -> contextvars.Context:
+    """Copy of the current context bound to `deadline`, for work shared by several requests"""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, deadline)
+    return context
+
+
+def within_deadline(func):
+    """Bind config["configurable"]["deadline"] for a (state, config) graph node.
+
+    LLM calls made by the node, including tasks it spawns, read it from the
+    context and stop waiting once it passes.
+    """
+    @functools.wraps(func)
+    async def wrapper(state, config):
+        token = _deadline.set(config["configurable"].get("deadline"))
+        try:
+            return await func(state, config)
+        finally:
+            _deadline.reset(token)
+    return wrapper
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive failed calls and rejects calls for
+    reset_seconds, then lets a single trial call through (half-open). The
+    trial closes the breaker on success and reopens it on failure.
+    """
+
+    def __init__(self, name: str, failures: int, reset_seconds: float):
+        self.name = name
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return
+        LLM_CIRCUIT_EVENTS.labels(event="rejected").inc()
+        raise CircuitOpen(f"LLM circuit {self.name} is open")
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"LLM circuit {self.name} closed")
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self._trial or (self._opened_at is None and self._consecutive >= self.failures):
+                logger.warning(f"LLM circuit {self.name} opened after {self._consecutive} failures")
+                LLM_CIRCUIT_EVENTS.labels(event="opened").inc()
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def record_inconclusive(self):
+        """A call that ended without saying anything about the provider
+        (our deadline or a cancellation); frees the half-open trial slot.
+        """
+        with self._lock:
+            self._trial = False
+
+
+class LatencyTracker:
+    """Rolling window of call latencies, giving the delay after which to hedge"""
+
+    def __init__(self, percentile: float, window: int = 200, min_samples: int = 20):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency at the configured percentile, None until there are enough samples"""
+        if not self.percentile or len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+
+
+@lru_cache()
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """One breaker per provider model, shared by every client of it in the worker"""
+    return CircuitBreaker(name, settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS)
+
+
+class ResilientChatModel(BaseChatModel):
+    """Chat model bounding the wrapped model's calls.
+
+    Async calls stop at the request deadline, are hedged with one duplicate
+    call once they run past the tracked latency percentile (first answer
+    wins, the other is cancelled), and fail fast with CircuitOpen while the
+    provider's breaker is open. Copies made by bind_tools share the breaker
+    and latency window.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: Any = None
+    breaker: Any = None
+    latency: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "resilient"
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        return self.model_copy(update={"inner": self.inner.bind_tools(tools, tool_choice=tool_choice, **kwargs)})
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.breaker.before_call()
+        try:
+            response = self.inner.invoke(messages, config=INNER_CONFIG, stop=stop)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return self._result(response)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            DEADLINES_EXCEEDED.labels(stage="llm").inc()
+            raise DeadlineExceeded("Deadline passed before the LLM call")
+        self.breaker.before_call()
+        start = time.perf_counter()
+        timeout = asyncio.timeout(remaining)
+        try:
+            async with timeout:
+                response = await self._hedged(messages, stop)
+        except TimeoutError:
+            if not timeout.expired():
+                # Raised by the provider client, not by our deadline
+                self.breaker.record_failure()
+                raise
+            # The request ran out of time, possibly after queueing; the provider may be fine
+            self.breaker.record_inconclusive()
+            DEADLINES_EXCEEDED.labels(stage="llm").inc()
+            raise DeadlineExceeded(f"LLM call did not finish within {remaining:.1f}s") from None
+        except (DeadlineExceeded, asyncio.CancelledError):
+            self.breaker.record_inconclusive()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.latency.observe(time.perf_counter() - start)
+        return self._result(response)
+
+    async def _call(self, messages: List[BaseMessage], stop) -> AIMessage:
+        return await self.inner.ainvoke(messages, config=INNER_CONFIG, stop=stop)
+
+    async def _hedged(self, messages: List[BaseMessage], stop) -> AIMessage:
+        primary = asyncio.ensure_future(self._call(messages, stop))
+        delay = self.latency.hedge_delay()
+        if delay is None:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            LLM_HEDGES.labels(outcome="sent").inc()
+            hedge = asyncio.ensure_future(self._call(messages, stop))
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            LLM_HEDGES.labels(outcome="won").inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _result(response: AIMessage) -> ChatResult:
+        metadata = response.response_metadata or {}
+        return ChatResult(
+            generations=[ChatGeneration(message=response)],
+            llm_output={
+                "model_name": metadata.get("model_name"),
+                "token_usage": metadata.get("token_usage") or {}
+            }
+        )
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        return next((output for output in llm_outputs if output), {})
+
+
+def with_resilience(llm: BaseChatModel, name: str) -> BaseChatModel:
+    """Wrap llm with deadline, hedging and circuit breaking; `name` picks the shared breaker"""
+    # Callbacks move to the wrapper so a hedged call is metered once
+    return ResilientChatModel(
+        inner=llm.model_copy(update={"callbacks": None}),
+        breaker=get_circuit_breaker(name),
+        latency=LatencyTracker(
+            settings.LLM_HEDGE_PERCENTILE if settings.LLM_HEDGE_ENABLED else 0.0,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+        ),
+        callbacks=llm.callbacks
+    )
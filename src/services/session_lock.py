@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from src.core.config import settings
+from src.monitoring.metrics import SESSION_LOCK_CONFLICTS
+from src.services.cache_service import RedisCache
+from src.utils.logger import logger
+
+LEASE_KEY_TEMPLATE = "session:{session_id}:lease"
+
+
+class SessionBusy(Exception):
+    """Another turn for the session is still running after the wait limit"""
+
+    def __init__(self, session_id: str):
+        super().__init__(f"Session {session_id} is processing another message")
+        self.session_id = session_id
+
+
+class SessionLock:
+    """Serializes turns per session within a worker and across workers.
+
+    Turns in the same worker queue on an asyncio.Lock, so only one of them
+    polls Redis at a time. Across workers the holder owns a lease key (SET NX
+    with a TTL, released by token compare-and-delete), so a crashed worker
+    blocks the session for at most lease_ttl seconds. A caller waits up to
+    `wait` seconds in total before SessionBusy is raised; wait=0 rejects at
+    once. If Redis is unreachable the lease is skipped and only the
+    in-process lock applies.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache = None,
+        wait: float = settings.SESSION_LOCK_WAIT,
+        lease_ttl: int = settings.SESSION_LEASE_TTL
+    ):
+        self.cache = cache or RedisCache()
+        self.wait = wait
+        self.lease_ttl = lease_ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, int] = {}
+
+    async def _acquire_local(self, session_id: str, lock: asyncio.Lock, deadline: float):
+        if not lock.locked():
+            await lock.acquire()
+            return
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise SessionBusy(session_id)
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout=remaining)
+        except asyncio.TimeoutError:
+            raise SessionBusy(session_id) from None
+
+    async def _acquire_lease(self, session_id: str, deadline: float) -> str:
+        """Poll for the lease with backoff, returning its token ('' if Redis is down)"""
+        loop = asyncio.get_running_loop()
+        key = LEASE_KEY_TEMPLATE.format(session_id=session_id)
+        token = uuid.uuid4().hex
+        delay = 0.02
+        while True:
+            acquired = await self.cache.acquire_lease(key, token, self.lease_ttl)
+            if acquired is None:
+                return ""
+            if acquired:
+                return token
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise SessionBusy(session_id)
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        deadline = asyncio.get_running_loop().time() + self.wait
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._holders[session_id] = self._holders.get(session_id, 0) + 1
+        try:
+            try:
+                await self._acquire_local(session_id, lock, deadline)
+            except SessionBusy:
+                SESSION_LOCK_CONFLICTS.labels(scope="local").inc()
+                raise
+            try:
+                try:
+                    token = await self._acquire_lease(session_id, deadline)
+                except SessionBusy:
+                    SESSION_LOCK_CONFLICTS.labels(scope="lease").inc()
+                    raise
+                try:
+                    yield
+                finally:
+                    if token:
+                        key = LEASE_KEY_TEMPLATE.format(session_id=session_id)
+                        if not await self.cache.release_lease(key, token):
+                            logger.warning(f"Lease for session {session_id} expired before the turn finished")
+            finally:
+                lock.release()
+        finally:
+            # Drop the lock once nobody holds or waits on it, so idle sessions cost nothing
+            self._holders[session_id] -= 1
+            if not self._holders[session_id]:
+                del self._holders[session_id]
+                del self._locks[session_id]
@@ -0,0 +1,56 @@
+import asyncio
+from typing import List
+
+from src.core.config import settings
+from src.monitoring.metrics import SESSIONS_DEACTIVATED
+from src.services.cache_service import RedisCache, session_keys
+from src.utils.logger import logger
+
+
+class SessionSweeper:
+    """Marks sessions idle for idle_minutes inactive and evicts their cache keys.
+
+    Each sweep updates at most batch_size sessions per transaction and at
+    most max_batches batches, so a backlog is worked off over several sweeps
+    without long row locks. Sweeps are idempotent, so running one per worker
+    is safe. The next message to an inactive session reactivates it.
+    """
+
+    def __init__(
+        self,
+        db_service,
+        cache: RedisCache = None,
+        idle_minutes: int = settings.SESSION_IDLE_MINUTES,
+        batch_size: int = settings.SESSION_SWEEP_BATCH_SIZE,
+        max_batches: int = settings.SESSION_SWEEP_MAX_BATCHES
+    ):
+        self.db_service = db_service
+        self.cache = cache or RedisCache()
+        self.idle_minutes = idle_minutes
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+
+    async def sweep_once(self) -> List[str]:
+        swept = []
+        for _ in range(self.max_batches):
+            session_ids = await asyncio.to_thread(
+                self.db_service.deactivate_idle_sessions, self.idle_minutes, self.batch_size
+            )
+            if not session_ids:
+                break
+            await self.cache.delete_many([key for s in session_ids for key in session_keys(s)])
+            SESSIONS_DEACTIVATED.inc(len(session_ids))
+            swept.extend(session_ids)
+            if len(session_ids) < self.batch_size:
+                break
+        if swept:
+            logger.info(f"Marked {len(swept)} idle sessions inactive")
+        return swept
+
+    async def run_forever(self, interval: float = settings.SESSION_SWEEP_INTERVAL):
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}")
+            await asyncio.sleep(interval)
@@ -0,0 +1,151 @@
+import asyncio
+import contextvars
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from src.constants.routes import AgentRoutes
+from src.monitoring.metrics import SPECULATION_OUTCOMES, SPECULATION_SAVED_SECONDS
+from src.utils.logger import logger
+
+PHONE_PATTERN = re.compile(r'(\+?1[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}-?\d{4}')
+
+
+class RoutePredictor:
+    """Cheap guess of the supervisor's next route.
+
+    Uses the last route taken in the session, falling back to a keyword
+    heuristic for new sessions.
+    """
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._last_routes: "OrderedDict[str, str]" = OrderedDict()
+
+    def predict(self, session_id: str, message: str) -> str:
+        if session_id in self._last_routes:
+            self._last_routes.move_to_end(session_id)
+            return self._last_routes[session_id]
+        if "report" in message.lower():
+            return AgentRoutes.REPORTER.value
+        if PHONE_PATTERN.search(message):
+            return AgentRoutes.CHECKER.value
+        return AgentRoutes.GREETER.value
+
+    def record(self, session_id: str, route: str):
+        self._last_routes[session_id] = route
+        self._last_routes.move_to_end(session_id)
+        while len(self._last_routes) > self.max_sessions:
+            self._last_routes.popitem(last=False)
+
+
+class SpeculationStats:
+    """Process-wide speculation counters"""
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_seconds": round(self.saved_seconds, 4),
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeExecutor:
+    """Runs the predicted agent while the supervisor is still deciding.
+
+    The supervisor node calls start() before routing and resolve() once the
+    decision is known; on a miss the speculative task is cancelled. The agent
+    node then calls take() to reuse the finished (or still running) result.
+    Only side-effect free agents may be speculated, since a cancelled or
+    discarded run must leave nothing behind.
+    """
+
+    def __init__(self, allowed_agents, stats: SpeculationStats = speculation_stats):
+        self.allowed_agents = set(allowed_agents)
+        self.stats = stats
+        self._pending: Dict[str, Tuple[str, asyncio.Task, Dict[str, float]]] = {}
+
+    def start(
+        self,
+        turn_id: str,
+        agent_name: str,
+        run: Awaitable[Dict[str, Any]],
+        context: Optional[contextvars.Context] = None
+    ) -> bool:
+        """Schedule the predicted agent for this turn, returns False if it can't be speculated"""
+        if agent_name not in self.allowed_agents:
+            run.close()
+            return False
+
+        timings = {"started": time.perf_counter()}
+        task = asyncio.create_task(run, context=context)
+        task.add_done_callback(lambda _: timings.__setitem__("finished", time.perf_counter()))
+        self._pending[turn_id] = (agent_name, task, timings)
+        self.stats.attempts += 1
+        return True
+
+    def resolve(self, turn_id: str, selected_agent: str):
+        """Keep the speculative run if the supervisor agreed with it, cancel it otherwise"""
+        pending = self._pending.get(turn_id)
+        if pending is None:
+            return
+        agent_name, task, _ = pending
+        if agent_name == selected_agent:
+            self.stats.hits += 1
+            SPECULATION_OUTCOMES.labels(outcome="hit").inc()
+            return
+        self.stats.misses += 1
+        SPECULATION_OUTCOMES.labels(outcome="miss").inc()
+        task.cancel()
+        del self._pending[turn_id]
+        logger.info(f"Speculation miss: predicted {agent_name}, supervisor chose {selected_agent}")
+
+    async def take(self, turn_id: str, agent_name: str) -> Optional[Dict[str, Any]]:
+        """Return the speculative result for this agent, or None if it must run normally"""
+        pending = self._pending.pop(turn_id, None)
+        if pending is None:
+            return None
+        speculated_agent, task, timings = pending
+        if speculated_agent != agent_name:
+            task.cancel()
+            return None
+
+        waiting_since = time.perf_counter()
+        try:
+            result = await task
+        except Exception as e:
+            logger.error(f"Speculative {agent_name} run failed, running it again: {str(e)}")
+            return None
+
+        # Time the agent spent running before this node would have started it
+        finished = timings.get("finished", time.perf_counter())
+        saved = max(0.0, min(finished, waiting_since) - timings["started"])
+        self.stats.saved_seconds += saved
+        SPECULATION_SAVED_SECONDS.inc(saved)
+        logger.info(
+            f"Speculation hit for {agent_name}: saved {saved:.3f}s "
+            f"(hit rate {self.stats.hit_rate:.2%})"
+        )
+        return result
+
+    def discard(self, turn_id: str):
+        """Drop any speculative run left over when a turn ends early"""
+        pending = self._pending.pop(turn_id, None)
+        if pending is not None:
+            pending[1].cancel()
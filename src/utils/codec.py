@@ -0,0 +1,129 @@
+"""Serialization codecs for JSON columns, cache values and API responses.
+
+JSON_CODEC (json or orjson) encodes metadata columns and HTTP bodies, which
+must stay JSON text. CACHE_CODEC (json, orjson or msgpack) encodes Redis
+values. orjson is a runtime dependency; msgpack comes from the optional
+`msgpack` extra (ormsgpack). A codec whose library is missing falls back to
+the next one down (msgpack, orjson, json) with a warning, so the stdlib is
+always enough.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+from src.core.config import settings
+from src.utils.logger import logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ormsgpack as msgpack
+except ImportError:  # pragma: no cover - optional speedup
+    try:
+        import msgpack
+    except ImportError:
+        msgpack = None
+
+
+def _default(value: Any) -> Any:
+    """Types the encoders do not handle natively, as plain JSON values"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+class JsonCodec:
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def encode_text(self, value: Any) -> str:
+        return self.encode(value).decode()
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    """MessagePack behind a one-byte marker; unmarked values are read as JSON,
+    so entries written by a JSON codec stay readable after switching.
+    """
+
+    name = "msgpack"
+    MARKER = b"\xc1"  # Never used by MessagePack or JSON, so it cannot start either
+
+    def __init__(self, fallback: JsonCodec):
+        self.fallback = fallback
+
+    def encode(self, value: Any) -> bytes:
+        if msgpack.__name__ == "ormsgpack":
+            return self.MARKER + msgpack.packb(value, default=_default, option=msgpack.OPT_NON_STR_KEYS)
+        return self.MARKER + msgpack.packb(value, default=_default, use_bin_type=True)
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, bytes) and data[:1] == self.MARKER:
+            return msgpack.unpackb(data[1:])
+        return self.fallback.decode(data)
+
+
+def _build(name: str):
+    fast_json = OrjsonCodec() if orjson is not None else JsonCodec()
+    if name == "msgpack":
+        if msgpack is not None:
+            return MsgpackCodec(fast_json)
+        logger.warning("msgpack is not installed (install the msgpack extra), falling back to JSON")
+        return fast_json
+    if name == "orjson":
+        if orjson is None:
+            logger.warning("orjson is not installed, falling back to json")
+        return fast_json
+    if name == "json":
+        return JsonCodec()
+    raise ValueError(f"Unknown codec: {name}")
+
+
+@lru_cache()
+def get_codec(name: str):
+    return _build(name)
+
+
+def json_codec() -> JsonCodec:
+    """Codec for JSON columns and API responses"""
+    codec = get_codec(settings.JSON_CODEC)
+    if not isinstance(codec, JsonCodec):
+        raise ValueError(f"JSON_CODEC must produce JSON, got {settings.JSON_CODEC}")
+    return codec
+
+
+def cache_codec():
+    """Codec for Redis values"""
+    return get_codec(settings.CACHE_CODEC)
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse rendered with JSON_CODEC, used as the app's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec().encode(content)
@@ -1,8 +1,14 @@
+import atexit
 import logging
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 from datetime import datetime
+from typing import Any, Dict
+
+from src.core.config import settings
 
 # Create logs directory
 LOG_DIR = "logs"
@@ -27,14 +33,110 @@ log_format = logging.Formatter(
 console_handler.setFormatter(log_format)
 file_handler.setFormatter(log_format)
 
-# Add handlers to the logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues the record untouched so formatting happens on the listener thread.
+
+    The stock QueueHandler formats in the caller to make records picklable,
+    which is only needed across processes. Records whose queue is full are
+    dropped instead of blocking the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO/DEBUG records; warnings and errors always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class Capped:
+    """Lazily rendered log argument truncated to LOG_MAX_PAYLOAD characters"""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = settings.LOG_MAX_PAYLOAD):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+
+class MessagesSummary:
+    """Lazily rendered summary of a graph update: message count plus the last message.
+
+    Logging the full state grows with the conversation, so only the newest
+    message is rendered, capped like any other payload.
+    """
+
+    __slots__ = ("update",)
+
+    def __init__(self, update: Any):
+        self.update = update
+
+    def __str__(self) -> str:
+        if not isinstance(self.update, dict):
+            return str(Capped(self.update))
+        parts = []
+        for key, value in self.update.items():
+            if isinstance(value, dict):
+                parts.append(f"{key}: {MessagesSummary(value)}")
+            elif key == "messages" and isinstance(value, list):
+                last = value[-1] if value else None
+                name = getattr(last, "name", None) or type(last).__name__
+                content = Capped(getattr(last, "content", last))
+                parts.append(f"{len(value)} messages, last {name}: {content}")
+            else:
+                parts.append(f"{key}={Capped(value)}")
+        return "{" + "; ".join(parts) + "}"
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            category, rate = item.split("=", 1)
+            rates[category.strip()] = float(rate)
+    return rates
+
+
+def get_category_logger(category: str) -> logging.Logger:
+    """Child logger for a high-volume category, sampled per LOG_SAMPLE_RATES"""
+    child = logger.getChild(category)
+    rate = _parse_sample_rates(settings.LOG_SAMPLE_RATES).get(category)
+    if rate is not None and rate < 1 and not child.filters:
+        child.addFilter(SamplingFilter(rate))
+    return child
+
+
+# Handlers run on a background thread fed by a bounded queue, so neither
+# stdout nor the log file is written from the event loop
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DeferredQueueHandler(log_queue)
+listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
 
 # Prevent duplicate logs when using gunicorn
 if not logger.handlers:
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
 
 def get_logger():
-    return logger 
\ No newline at end of file
+    return logger
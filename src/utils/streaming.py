@@ -0,0 +1,56 @@
+"""Async iteration over blocking database generators for streaming responses.
+
+Starlette runs a sync generator through the threadpool, so each next() may
+land on a different thread. SQLite connections belong to the thread that
+opened them and the MySQL cursors are unbuffered, so a generator that holds
+a cursor has to be advanced and closed on one thread.
+"""
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Iterator
+
+_DONE = object()
+
+
+async def iterate_in_one_thread(produce: Callable[[], Iterator], maxsize: int = 2) -> AsyncIterator:
+    """Yield what `produce()` yields, running the whole iteration on one worker thread.
+
+    At most `maxsize` items wait for a slow reader before the producer blocks.
+    The generator is closed on its own thread when the reader stops early.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(maxsize)
+    stop = threading.Event()
+
+    def run():
+        iterator = None
+        try:
+            iterator = produce()
+            for item in iterator:
+                slots.acquire()
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            if iterator is not None:
+                iterator.close()
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    producer = asyncio.ensure_future(asyncio.to_thread(run))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            slots.release()
+            yield item
+    finally:
+        # Wake a producer waiting for a slot after the client went away
+        stop.set()
+        slots.release()
+        await asyncio.shield(producer)
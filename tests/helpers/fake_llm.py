@@ -0,0 +1,133 @@
+"""Deterministic in-process chat model for tests and load runs.
+
+Unlike mock_groq, it is a real BaseChatModel: it works with bind_tools,
+create_react_agent and with_structured_output, so the whole graph runs
+unchanged. Routing calls are answered from keywords in the current user
+message and every call sleeps for a latency drawn from a seeded distribution.
+"""
+import asyncio
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, Callable, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+CURRENT_MESSAGE = re.compile(r"Current user message: (.*)")
+PHONE_NUMBER = re.compile(r"\d{3}\D?\d{3}\D?\d{4}")
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency sampler in seconds from a spec such as:
+
+    fixed:0.2, uniform:0.1:0.5, normal:0.3:0.1 or lognormal:0.3:0.5 (median, sigma)
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def route_for(message: str) -> str:
+    lowered = message.lower()
+    if "report" in lowered:
+        return "reporter"
+    if PHONE_NUMBER.search(message):
+        return "checker"
+    return "greeter"
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeChatModel(BaseChatModel):
+    latency: str = "fixed:0"
+    seed: int = 0
+    model_name: str = "fake-chat"
+    tool_names: List[str] = []
+
+    _rng: random.Random = PrivateAttr()
+    _sample: Callable[[random.Random], float] = PrivateAttr()
+
+    def model_post_init(self, __context: Any):
+        self._rng = random.Random(self.seed)
+        self._sample = parse_latency(self.latency)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        names = [convert_to_openai_tool(tool)["function"]["name"] for tool in tools]
+        bound = self.model_copy(update={"tool_names": names})
+        # Share the RNG so the latency sequence stays deterministic across bindings
+        bound._rng = self._rng
+        bound._sample = self._sample
+        return bound
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._sample(self._rng))
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._sample(self._rng))
+        return self._respond(messages)
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if "RoutingDecision" in self.tool_names:
+            current = CURRENT_MESSAGE.search(prompt)
+            message = self._tool_call("RoutingDecision", self._decision(current.group(1) if current else ""))
+        elif "BatchRoutingDecisions" in self.tool_names:
+            decisions = [
+                dict(self._decision(text), index=index)
+                for index, text in enumerate(CURRENT_MESSAGE.findall(prompt))
+            ]
+            message = self._tool_call("BatchRoutingDecisions", {"decisions": decisions})
+        else:
+            last = str(messages[-1].content) if messages else ""
+            message = AIMessage(content=f"Thanks for your message. You said: {last[:80]}")
+
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(str(message.content) or str(message.tool_calls))
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={
+                "model_name": self.model_name,
+                "token_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            }
+        )
+
+    def _combine_llm_outputs(self, llm_outputs: List[dict]) -> dict:
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        for output in filter(None, llm_outputs):
+            for key in usage:
+                usage[key] += output["token_usage"][key]
+        return {"model_name": self.model_name, "token_usage": usage}
+
+    @staticmethod
+    def _decision(message: str) -> dict:
+        return {"selected_agent": route_for(message), "reasoning": "Keyword match"}
+
+    @staticmethod
+    def _tool_call(name: str, args: dict) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": uuid.uuid4().hex}])
@@ -0,0 +1,135 @@
+"""In-process stand-ins for MySQL and Redis, used to run the app without either.
+
+InMemoryDatabaseService implements the DatabaseService methods AgentService
+calls; db_latency_ms adds a blocking sleep per call to mimic round trips.
+InMemoryRedis covers the redis client calls made by RedisCache.
+"""
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+class InMemoryDatabaseService:
+    def __init__(self, db_latency_ms: float = 0.0, fraud_reports: Optional[Dict[str, Dict]] = None):
+        self.db_latency = db_latency_ms / 1000
+        self.messages: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.fraud_reports: Dict[str, Dict[str, Any]] = dict(fraud_reports or {})
+        self.analytics: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        if self.db_latency:
+            time.sleep(self.db_latency)
+
+    def save_message(
+        self,
+        session_id: str,
+        user_id: str,
+        role: str,
+        content: str,
+        name: str = None,
+        metadata: dict = None
+    ) -> str:
+        self._round_trip()
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            session = self.messages[session_id]
+            session.append({
+                'role': role,
+                'content': content,
+                'name': name,
+                'created_at': None,
+                'metadata': metadata,
+                'message_id': message_id,
+                'turn_number': len(session) + 1
+            })
+        return message_id
+
+    def get_session_messages(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        self._round_trip()
+        with self._lock:
+            return list(self.messages.get(session_id, [])[:limit])
+
+    def save_message_analytics(self, rows: List[Dict[str, Any]]) -> int:
+        self._round_trip()
+        with self._lock:
+            self.analytics.extend(rows)
+        return len(rows)
+
+    def check_phone_number(self, phone_number: str) -> Optional[Dict[str, Any]]:
+        self._round_trip()
+        return self.fraud_reports.get(phone_number)
+
+    def find_fraud_reports(self, phone_numbers: List[str]) -> Optional[List[Dict[str, Any]]]:
+        self._round_trip()
+        return [self.fraud_reports[n] for n in phone_numbers if n in self.fraud_reports]
+
+    def report_fraud(self, phone_number: str, description: str, reporter_ip: str) -> bool:
+        self._round_trip()
+        with self._lock:
+            report = self.fraud_reports.setdefault(phone_number, {
+                'phone_number': phone_number,
+                'is_fraud': True,
+                'report_count': 0,
+                'description': '',
+                'reporter_ip': reporter_ip
+            })
+            report['report_count'] += 1
+            report['description'] = f"{report['description']}\n{description}".strip()
+        return True
+
+    def get_or_create_user(self, user_id: str, metadata: dict = None) -> Dict[str, Any]:
+        self._round_trip()
+        return {'user_id': user_id, 'metadata': metadata}
+
+
+class InMemoryRedis:
+    """Subset of the redis client API used by RedisCache (values stay strings)"""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is not None and expires < time.monotonic():
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return self._data.get(key)
+
+    def setex(self, key: str, seconds: int, value: Any) -> bool:
+        with self._lock:
+            self._data[key] = value
+            self._expires[key] = time.monotonic() + seconds
+        return True
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and key in self._data and self._expires.get(key, float("inf")) >= time.monotonic():
+                return None
+            self._data[key] = value
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._data.pop(key, None) is not None
+                self._expires.pop(key, None)
+            return removed
+
+    def eval(self, script: str, numkeys: int, *args: Any) -> int:
+        """Only the compare-and-delete lease release script is supported"""
+        key, token = args[0], args[1]
+        with self._lock:
+            if self._data.get(key) != token:
+                return 0
+            self._data.pop(key)
+            self._expires.pop(key, None)
+            return 1
@@ -1,8 +1,12 @@
 import pytest
 from src.components.agents.checker_agent import CheckerAgent
-from langchain_core.messages import HumanMessage
-from unittest.mock import Mock, patch
+from langchain_core.messages import HumanMessage, AIMessage
+from unittest.mock import Mock, AsyncMock, patch
 from langchain_groq import ChatGroq
+from src.core.config import settings
+from src.services.cache_service import RedisCache
+from src.services.database_service import DatabaseService
+from tests.helpers.in_memory_db import InMemoryRedis
 
 class TestCheckerAgent:
     @pytest.fixture
@@ -14,10 +18,19 @@ class TestCheckerAgent:
         )
     
     @pytest.fixture
-    def checker_agent(self, mock_llm):
+    def db_service(self):
+        db_service = Mock()
+        db_service.find_fraud_reports.return_value = []
+        return db_service
+    
+    @pytest.fixture
+    def checker_agent(self, mock_llm, db_service):
         agent = Mock()
         agent.llm = mock_llm
-        return CheckerAgent(agent)
+        agent.ainvoke = AsyncMock(return_value={
+            "messages": [AIMessage(content="I need a valid phone number to check.")]
+        })
+        return CheckerAgent(agent, db_service)
     
     @pytest.mark.asyncio
     async def test_extract_phone_number(self, checker_agent):
@@ -42,6 +55,35 @@ class TestCheckerAgent:
         response = await checker_agent.process(state)
         assert "messages" in response
         assert "I found the phone number" in response["messages"][-1].content
+        checker_agent.agent.ainvoke.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_reported_number(self, checker_agent, db_service):
+        db_service.find_fraud_reports.return_value = [
+            {"phone_number": "15551234567", "report_count": 2,
+             "description": "Fake bank call\nClaimed to be IRS"}
+        ]
+        state = {
+            "messages": [HumanMessage(content="Is 555-123-4567 a scam?")]
+        }
+        
+        response = await checker_agent.process(state)
+        content = response["messages"][-1].content
+        assert "reported as fraudulent 2 times" in content
+        assert "Claimed to be IRS" in content
+        db_service.find_fraud_reports.assert_called_once_with(
+            ["+1-555-123-4567", "15551234567", "5551234567"]
+        )
+        checker_agent.agent.ainvoke.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_explanation_uses_llm(self, checker_agent):
+        state = {
+            "messages": [HumanMessage(content="Why would +1-555-123-4567 call me?")]
+        }
+        
+        await checker_agent.process(state)
+        checker_agent.agent.ainvoke.assert_awaited_once()
     
     @pytest.mark.asyncio
     async def test_process_invalid_number(self, checker_agent):
@@ -51,4 +93,61 @@ class TestCheckerAgent:
         
         response = await checker_agent.process(state)
         assert "messages" in response
-        assert "need a valid phone number" in response["messages"][-1].content.lower() 
\ No newline at end of file
+        assert "need a valid phone number" in response["messages"][-1].content.lower()
+    
+    def test_extract_multiple_phone_numbers(self, checker_agent):
+        content = "Got calls from +1-555-123-4567, (555) 987-6543 and 15550001111, also 555-123-4567 again"
+        assert checker_agent._extract_phone_numbers(content) == [
+            "+1-555-123-4567", "+1-555-987-6543", "+1-555-000-1111"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_process_multiple_numbers(self, checker_agent, db_service):
+        def find_reports(keys):
+            return [{"report_count": 1, "description": "Prize scam"}] if keys[0] == "+1-555-987-6543" else []
+        db_service.find_fraud_reports.side_effect = find_reports
+        state = {
+            "messages": [HumanMessage(content="Check 555-123-4567 and 555-987-6543")]
+        }
+        
+        response = await checker_agent.process(state)
+        message = response["messages"][-1]
+        assert "I checked 2 phone numbers" in message.content
+        assert "+1-555-987-6543: reported as fraudulent 1 time" in message.content
+        assert "1 of 2 numbers have fraud reports" in message.content
+        assert [l["phone_number"] for l in message.response_metadata["lookups"]] == [
+            "+1-555-123-4567", "+1-555-987-6543"
+        ]
+        checker_agent.agent.ainvoke.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_respects_fan_out_limit(self, checker_agent, db_service):
+        state = {
+            "messages": [HumanMessage(content="5550000001 5550000002 5550000003")]
+        }
+        
+        with patch("src.components.agents.checker_agent.settings.CHECKER_MAX_NUMBERS", 2):
+            response = await checker_agent.process(state)
+        assert "I checked 2 phone numbers" in response["messages"][-1].content
+        assert "skipped 1 more number" in response["messages"][-1].content
+        assert db_service.find_fraud_reports.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_report_invalidates_cached_lookup(self, checker_agent, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+        monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+        cache = RedisCache()
+        monkeypatch.setattr(cache, "client", InMemoryRedis())
+        db_service = DatabaseService(cache)
+        checker_agent.db_service, checker_agent.cache = db_service, cache
+        state = {"messages": [HumanMessage(content="Is 555-123-4567 a scam?")]}
+        
+        before = await checker_agent.process(state)
+        assert "I found the phone number" in before["messages"][-1].content
+        assert await cache.get("fraud_check:+1-555-123-4567") == []
+        
+        # The reporter tool strips punctuation before saving
+        assert db_service.report_fraud("15551234567", "Fake bank call", "127.0.0.1")
+        after = await checker_agent.process(state)
+        assert "reported as fraudulent 1 time" in after["messages"][-1].content
+        assert after["messages"][-1].response_metadata["lookups"][0]["source"] == "db"
@@ -0,0 +1,66 @@
+import random
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.components.intent_classifier import IntentClassifier, train_intent_classifier
+from src.components.supervisor import Supervisor
+from src.core.config import settings
+from src.prompts.analysis_prompts import AnalysisPrompts
+from src.services.database_service import DatabaseService
+
+TEMPLATES = {
+    "greeter": ["hi", "hello there", "good morning", "my name is {name}", "what can you do?", "thanks, bye"],
+    "checker": ["is {phone} safe?", "can you check {phone}", "who called me from {phone}", "I got a call from {phone}"],
+    "reporter": ["I want to report {phone}", "report {phone}, they said they were the IRS", "{phone} is a scammer"],
+}
+
+@pytest.fixture
+def db_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    service = DatabaseService()
+    rng = random.Random(0)
+    for n in range(150):
+        agent = rng.choice(list(TEMPLATES))
+        phone = f"555-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}"
+        message = rng.choice(TEMPLATES[agent]).format(phone=phone, name=rng.choice(["Ann", "Raj"]))
+        service.save_message(f"s{n % 20}", "u1", "user", message)
+        service.save_message(f"s{n % 20}", "u1", "assistant", "...", name=agent)
+    return service
+
+@pytest.fixture
+def classifier(db_service):
+    examples = db_service.get_routing_examples(list(TEMPLATES), 1000)
+    return train_intent_classifier(
+        [text for text, _ in examples], [label for _, label in examples], n_features=2 ** 14
+    )
+
+class TestIntentClassifier:
+    def test_trains_from_chat_history_with_holdout_report(self, classifier):
+        assert classifier.report["examples"] == 150
+        assert classifier.report["holdout"] == 30
+        assert classifier.report["accuracy"] >= 0.9
+        assert classifier.predict("please check 555-010-9999")[0] == "checker"
+
+    def test_save_and_load(self, classifier, tmp_path):
+        path = str(tmp_path / "models" / "intent.npz")
+        classifier.save(path)
+
+        loaded = IntentClassifier.load(path)
+        assert loaded.labels == classifier.labels
+        assert loaded.report == classifier.report
+        assert loaded.predict("report 555-010-9999") == classifier.predict("report 555-010-9999")
+
+    @pytest.mark.asyncio
+    async def test_supervisor_defers_to_llm_below_threshold(self, classifier):
+        router = Mock(ainvoke=AsyncMock(return_value={"raw": None, "parsed": None, "parsing_error": "x"}))
+        llm = Mock()
+        llm.with_structured_output.return_value = router
+        supervisor = Supervisor(llm, AnalysisPrompts.SUPERVISOR_ANALYSIS, classifier=classifier, threshold=0.6)
+
+        decision = await supervisor.route("I want to report 555-010-9999", [])
+        assert decision.selected_agent == "reporter"
+        router.ainvoke.assert_not_awaited()
+
+        supervisor.threshold = 1.01
+        await supervisor.route("I want to report 555-010-9999", [])
+        router.ainvoke.assert_awaited_once()
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from src.components.routing_batcher import RoutingBatcher
+from src.models.agents import BatchRoutingDecisions, BatchedRoutingDecision
+from src.services.resilience import current_deadline, new_deadline, within_deadline
+from unittest.mock import Mock, AsyncMock
+
+class TestRoutingBatcher:
+    @pytest.fixture
+    def router(self):
+        return Mock(ainvoke=AsyncMock())
+
+    @pytest.fixture
+    def batcher(self, router):
+        llm = Mock()
+        llm.with_structured_output.return_value = router
+        return RoutingBatcher(llm, window_ms=20, max_batch=8)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self, batcher, router):
+        router.ainvoke.return_value = {
+            "raw": None,
+            "parsed": BatchRoutingDecisions(decisions=[
+                BatchedRoutingDecision(index=1, selected_agent="checker", reasoning="Has a number"),
+                BatchedRoutingDecision(index=0, selected_agent="greeter", reasoning="Greeting"),
+            ]),
+            "parsing_error": None
+        }
+
+        first, second = await asyncio.gather(
+            batcher.route("Hello", ""),
+            batcher.route("Check 555-123-4567", "")
+        )
+
+        assert first.selected_agent == "greeter"
+        assert second.selected_agent == "checker"
+        router.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_decision_resolves_to_none(self, batcher, router):
+        router.ainvoke.return_value = {
+            "raw": None,
+            "parsed": BatchRoutingDecisions(decisions=[
+                BatchedRoutingDecision(index=0, selected_agent="reporter", reasoning="Report"),
+            ]),
+            "parsing_error": None
+        }
+
+        first, second = await asyncio.gather(
+            batcher.route("I want to report a number", ""),
+            batcher.route("???", "")
+        )
+
+        assert first.selected_agent == "reporter"
+        assert second is None
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self, router):
+        llm = Mock()
+        llm.with_structured_output.return_value = router
+        batcher = RoutingBatcher(llm, window_ms=60000, max_batch=1)
+        router.ainvoke.return_value = {"raw": None, "parsed": None, "parsing_error": ValueError("bad")}
+
+        decision = await asyncio.wait_for(batcher.route("Hi", ""), timeout=1)
+        assert decision is None
+
+    @pytest.mark.asyncio
+    async def test_shared_call_runs_to_latest_deadline(self, batcher, router):
+        seen = []
+        async def ainvoke(messages):
+            seen.append(current_deadline())
+            return {"raw": None, "parsed": None, "parsing_error": ValueError("bad")}
+        router.ainvoke.side_effect = ainvoke
+
+        @within_deadline
+        async def node(state, config):
+            return await batcher.route(state["message"], "")
+
+        soon, later = new_deadline(0.01), new_deadline(30)
+        await asyncio.gather(
+            node({"message": "Hi"}, {"configurable": {"deadline": soon}}),
+            node({"message": "Check 555-123-4567"}, {"configurable": {"deadline": later}})
+        )
+        await asyncio.gather(
+            node({"message": "Hi"}, {"configurable": {"deadline": soon}}),
+            node({"message": "Hello"}, {"configurable": {}})
+        )
+
+        assert seen == [later, None]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_call_is_referenced_until_done(self, batcher, router):
+        release = asyncio.Event()
+        async def ainvoke(messages):
+            await release.wait()
+            raise RuntimeError("provider down")
+        router.ainvoke.side_effect = ainvoke
+
+        pending = asyncio.ensure_future(batcher.route("Hi", ""))
+        await asyncio.sleep(0.05)
+        assert len(batcher._tasks) == 1
+
+        release.set()
+        assert await pending is None
+        await asyncio.sleep(0)
+        assert not batcher._tasks
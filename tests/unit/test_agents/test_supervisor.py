@@ -0,0 +1,70 @@
+import pytest
+from src.components.supervisor import Supervisor
+from src.constants.routes import AgentRoutes
+from src.models.agents import RoutingDecision
+from src.prompts.analysis_prompts import AnalysisPrompts
+from langchain_core.messages import HumanMessage, AIMessage
+from langgraph.graph import END
+from unittest.mock import Mock, AsyncMock
+
+class TestSupervisor:
+    @pytest.fixture
+    def router(self):
+        return Mock(ainvoke=AsyncMock())
+
+    @pytest.fixture
+    def supervisor(self, router):
+        llm = Mock()
+        llm.with_structured_output.return_value = router
+        return Supervisor(llm, AnalysisPrompts.SUPERVISOR_ANALYSIS)
+
+    def test_decision_schema_lists_every_route_but_supervisor(self):
+        schema = RoutingDecision.model_json_schema()["properties"]["selected_agent"]
+        assert schema["enum"] == [r.value for r in AgentRoutes if r is not AgentRoutes.SUPERVISOR]
+
+    @pytest.mark.asyncio
+    async def test_routes_structured_decision(self, supervisor, router):
+        router.ainvoke.return_value = {
+            "raw": None,
+            "parsed": RoutingDecision(selected_agent="checker", reasoning="Has a number"),
+            "parsing_error": None
+        }
+        state = {"messages": [HumanMessage(content="Check +1-555-123-4567")]}
+
+        response = await supervisor.process(state)
+        assert response["next"] == "checker"
+        router.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_finish_maps_to_end(self, supervisor, router):
+        router.ainvoke.return_value = {
+            "raw": None,
+            "parsed": RoutingDecision(selected_agent="FINISH", reasoning="Done"),
+            "parsing_error": None
+        }
+        state = {"messages": [HumanMessage(content="Thanks, bye")]}
+
+        response = await supervisor.process(state)
+        assert response["next"] == END
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_defaults_to_greeter(self, supervisor, router):
+        router.ainvoke.return_value = {
+            "raw": AIMessage(content="not a tool call"),
+            "parsed": None,
+            "parsing_error": ValueError("no tool call")
+        }
+        failures = Supervisor.parse_failures
+        state = {"messages": [HumanMessage(content="???")]}
+
+        response = await supervisor.process(state)
+        assert response["next"] == "greeter"
+        assert Supervisor.parse_failures == failures + 1
+
+    @pytest.mark.asyncio
+    async def test_agent_message_ends_turn(self, supervisor, router):
+        state = {"messages": [HumanMessage(content="Hi"), AIMessage(content="Hello", name="greeter")]}
+
+        response = await supervisor.process(state)
+        assert response["next"] == END
+        router.ainvoke.assert_not_called()
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+import json
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controller.routers import sessions
+from src.core.config import settings
+from src.services.agent_service import get_agent_service
+from src.services.database_service import DatabaseService
+
+@pytest.fixture
+def db_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    service = DatabaseService()
+    for n in range(7):
+        service.save_message("s1", "u1", "user", f"message {n}")
+    return service
+
+@pytest.fixture
+def client(db_service):
+    app = FastAPI()
+    app.include_router(sessions.router, prefix="/api/v1")
+    app.dependency_overrides[get_agent_service] = lambda: SimpleNamespace(db_service=db_service)
+    return TestClient(app)
+
+def turns(messages):
+    return [m["turn_number"] for m in messages]
+
+class TestSessionHistory:
+    def test_keyset_pages(self, db_service):
+        assert turns(db_service.get_messages_page("s1", None, 3, False)) == [1, 2, 3]
+        assert turns(db_service.get_messages_page("s1", 3, 3, False)) == [4, 5, 6]
+        assert turns(db_service.get_messages_page("s1", 4, 3, True)) == [3, 2, 1]
+
+    def test_api_walks_all_pages(self, client):
+        seen, after = [], None
+        while True:
+            params = {"limit": 3, "direction": "desc"}
+            if after is not None:
+                params["after_turn"] = after
+            page = client.get("/api/v1/sessions/s1/messages", params=params).json()
+            seen += turns(page["messages"])
+            after = page["next_after_turn"]
+            if not page["has_more"]:
+                break
+
+        assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+    def test_api_streams_ndjson(self, client):
+        response = client.get("/api/v1/sessions/s1/messages", params={"stream": "true"})
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert turns(lines) == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_api_streams_every_chunk_from_one_thread(self, client, db_service, monkeypatch):
+        stream = db_service.chat_repo.stream_session_messages
+        threads = []
+
+        def small_chunks(session_id, descending):
+            for chunk in stream(session_id, descending, chunk_size=2):
+                threads.append(threading.get_ident())
+                yield chunk
+
+        monkeypatch.setattr(db_service.chat_repo, "stream_session_messages", small_chunks)
+        response = client.get("/api/v1/sessions/s1/messages", params={"stream": "true", "direction": "desc"})
+
+        assert response.status_code == 200
+        assert turns(json.loads(line) for line in response.text.splitlines()) == [7, 6, 5, 4, 3, 2, 1]
+        assert len(threads) == 4 and len(set(threads)) == 1
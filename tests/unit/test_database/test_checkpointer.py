@@ -0,0 +1,164 @@
+import pytest
+from src.database.checkpointer import MySQLCheckpointSaver, ThreadedSqliteSaver
+from src.database.sqlite_connection import SQLiteConnection
+from langchain_core.messages import HumanMessage, AIMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from langgraph.graph import StateGraph, MessagesState, END
+
+def echo_graph(checkpointer):
+    async def echo_node(state: MessagesState):
+        seen = sum(isinstance(m, HumanMessage) for m in state["messages"])
+        return {"messages": state["messages"] + [AIMessage(content=f"seen {seen}", name="echo")]}
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("echo", echo_node)
+    workflow.set_entry_point("echo")
+    workflow.add_edge("echo", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+class TestThreadedSqliteSaver:
+    @pytest.fixture
+    def graph(self):
+        return echo_graph(ThreadedSqliteSaver.from_path(":memory:"))
+
+    @pytest.mark.asyncio
+    async def test_state_resumes_by_thread_id(self, graph):
+        config = {"configurable": {"thread_id": "session_1"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="first")]}, config)
+        result = await graph.ainvoke({"messages": [HumanMessage(content="second")]}, config)
+
+        assert result["messages"][-1].content == "seen 2"
+        assert len(result["messages"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_old_checkpoints_are_pruned(self):
+        saver = ThreadedSqliteSaver.from_path(":memory:", keep_last=2)
+        graph = echo_graph(saver)
+        config = {"configurable": {"thread_id": "session_1"}}
+
+        for text in ("first", "second", "third"):
+            result = await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+
+        assert result["messages"][-1].content == "seen 3"
+        assert len(list(saver.list(config))) == 2
+        assert saver.prune("session_1", keep_last=1) == 1
+        assert len(list(saver.list(config))) == 1
+
+    @pytest.mark.asyncio
+    async def test_threads_are_isolated(self, graph):
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content="first")]},
+            {"configurable": {"thread_id": "session_1"}}
+        )
+        result = await graph.ainvoke(
+            {"messages": [HumanMessage(content="other")]},
+            {"configurable": {"thread_id": "session_2"}}
+        )
+
+        assert result["messages"][-1].content == "seen 1"
+
+class TestMySQLCheckpointSaver:
+    """Runs the saver's MySQL statements through the SQLite translating cursor"""
+
+    @pytest.fixture
+    def saver(self, tmp_path):
+        return MySQLCheckpointSaver(db=SQLiteConnection(str(tmp_path / "checkpoints.sqlite")))
+
+    @staticmethod
+    def save(saver, thread_id, checkpoint_ns="", parent_id=None, step=0):
+        checkpoint = create_checkpoint(empty_checkpoint(), {}, step)
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
+        if parent_id:
+            config["configurable"]["checkpoint_id"] = parent_id
+        return saver.put(config, checkpoint, {"source": "loop", "step": step, "writes": {}}, {})
+
+    def test_put_then_get_tuple_round_trip(self, saver):
+        first = self.save(saver, "session_1")
+        second = self.save(saver, "session_1", parent_id=first["configurable"]["checkpoint_id"], step=1)
+        saver.put_writes(second, [("messages", "hello"), ("__error__", "boom")], "task_1")
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "session_1", "checkpoint_ns": ""}})
+
+        assert latest.config == second
+        assert latest.parent_config == first
+        assert latest.metadata["step"] == 1
+        # Special channels sort first with their negative idx, as in SqliteSaver
+        assert latest.pending_writes == [("task_1", "__error__", "boom"), ("task_1", "messages", "hello")]
+        assert saver.get_tuple(first).pending_writes == []
+
+    def test_checkpoints_are_keyed_by_thread_namespace_and_id(self, saver):
+        root = self.save(saver, "session_1")
+        child = self.save(saver, "session_1", checkpoint_ns="checker")
+        self.save(saver, "session_2")
+
+        assert saver.get_tuple({"configurable": {"thread_id": "session_1"}}).config == root
+        assert saver.get_tuple({"configurable": {"thread_id": "session_1", "checkpoint_ns": "checker"}}).config == child
+        assert saver.get_tuple({"configurable": {
+            "thread_id": "session_2", "checkpoint_ns": "", "checkpoint_id": root["configurable"]["checkpoint_id"]
+        }}) is None
+        assert saver.get_tuple({"configurable": {"thread_id": "session_3"}}) is None
+
+    def test_list_newest_first_with_before_limit_and_filter(self, saver):
+        configs = []
+        for step in range(3):
+            parent = configs[-1]["configurable"]["checkpoint_id"] if configs else None
+            configs.append(self.save(saver, "session_1", parent_id=parent, step=step))
+        self.save(saver, "session_2")
+        thread = {"configurable": {"thread_id": "session_1"}}
+
+        assert [t.config for t in saver.list(thread)] == configs[::-1]
+        assert [t.config for t in saver.list(thread, limit=2)] == configs[:0:-1]
+        assert [t.config for t in saver.list(thread, before=configs[2])] == configs[1::-1]
+        assert [t.config for t in saver.list(thread, filter={"step": 1})] == [configs[1]]
+        assert len(list(saver.list(None))) == 4
+
+    def test_special_writes_replace_and_regular_writes_are_kept(self, saver):
+        config = self.save(saver, "session_1")
+        saver.put_writes(config, [("messages", "first")], "task_1")
+        saver.put_writes(config, [("messages", "second")], "task_1")
+        saver.put_writes(config, [("__error__", "old")], "task_1")
+        saver.put_writes(config, [("__error__", "new")], "task_1")
+
+        assert saver.get_tuple(config).pending_writes == [
+            ("task_1", "__error__", "new"), ("task_1", "messages", "first")
+        ]
+
+    def test_put_keeps_only_the_newest_checkpoints(self, tmp_path):
+        saver = MySQLCheckpointSaver(db=SQLiteConnection(str(tmp_path / "checkpoints.sqlite")), keep_last=2)
+        configs = []
+        for step in range(4):
+            parent = configs[-1]["configurable"]["checkpoint_id"] if configs else None
+            configs.append(self.save(saver, "session_1", parent_id=parent, step=step))
+            saver.put_writes(configs[-1], [("messages", f"write {step}")], "task_1")
+        other = self.save(saver, "session_2")
+
+        thread = {"configurable": {"thread_id": "session_1"}}
+        assert [t.config for t in saver.list(thread)] == configs[:1:-1]
+        assert saver.get_tuple(configs[1]) is None
+        assert saver.get_tuple(configs[3]).pending_writes == [("task_1", "messages", "write 3")]
+        assert saver.get_tuple(other).config == other
+
+        assert saver.prune("session_1", keep_last=1) == 1
+        assert [t.config for t in saver.list(thread)] == [configs[3]]
+
+    def test_delete_thread(self, saver):
+        config = self.save(saver, "session_1")
+        saver.put_writes(config, [("messages", "hello")], "task_1")
+        other = self.save(saver, "session_2")
+
+        saver.delete_thread("session_1")
+
+        assert saver.get_tuple(config) is None
+        assert saver.get_tuple(other).config == other
+
+    @pytest.mark.asyncio
+    async def test_graph_resumes_from_saved_state(self, saver):
+        graph = echo_graph(saver)
+        config = {"configurable": {"thread_id": "session_1"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="first")]}, config)
+        result = await graph.ainvoke({"messages": [HumanMessage(content="second")]}, config)
+
+        assert result["messages"][-1].content == "seen 2"
+        assert len([t async for t in saver.alist(config)]) > 2
@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock
+from src.database.connection import DatabaseConnection
+
+class TestDatabaseConnection:
+    def test_unread_rows_are_discarded_before_the_cursor_closes(self):
+        db = object.__new__(DatabaseConnection)
+        db._pool = MagicMock()
+        conn = db._pool.get_connection.return_value
+        conn.unread_result = True
+        calls = MagicMock()
+        conn.consume_results = calls.consume_results
+        conn.cursor.return_value.close = calls.close_cursor
+        conn.close = calls.close_connection
+
+        with db.get_cursor() as cursor:
+            cursor.fetchmany(2)
+
+        assert [name for name, _, _ in calls.mock_calls] == ["consume_results", "close_cursor", "close_connection"]
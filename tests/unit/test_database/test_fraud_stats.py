@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+import pytest
+from src.core.config import settings
+from src.database.repositories.fraud_report import FraudReportRepository
+from src.database.sqlite_connection import translate
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    return FraudReportRepository()
+
+class TestFraudStatsRollups:
+    def test_report_fraud_updates_rollups(self, repo):
+        repo.report_fraud("+15550001111", "IRS scam", "127.0.0.1")
+        repo.report_fraud("+15550001111", "Again", "127.0.0.1")
+        repo.report_fraud("+15550002222", "Bank scam", "127.0.0.1")
+
+        today = datetime.now(timezone.utc).date()
+        assert repo.reports_per_day(7) == [{"day": today, "reports": 3, "new_numbers": 2}]
+        [hour] = repo.new_numbers_per_hour(24)
+        assert (hour["new_numbers"], hour["reports"]) == (2, 3)
+        assert hour["hour"].minute == 0
+
+    def test_top_numbers(self, repo):
+        for n, count in enumerate([1, 3, 2]):
+            for _ in range(count):
+                repo.report_fraud(f"+1555000000{n}", "scam", "127.0.0.1")
+
+        top = repo.top_numbers(2)
+
+        assert [(r["phone_number"], r["report_count"]) for r in top] == [
+            ("+15550000001", 3), ("+15550000002", 2)
+        ]
+
+def test_upsert_translation():
+    assert translate(
+        "INSERT INTO t (k, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)"
+    ) == ["INSERT INTO t (k, n) VALUES (?, ?) ON CONFLICT DO UPDATE SET n = n + excluded.n"]
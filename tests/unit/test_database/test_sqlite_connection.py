@@ -0,0 +1,70 @@
+import pytest
+from src.core.config import settings
+from src.database.sqlite_connection import translate
+from src.database.repositories.chat_repository import ChatRepository
+from src.database.repositories.fraud_report import FraudReportRepository
+from src.database.repositories.user_repository import UserRepository
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+
+class TestTranslate:
+    def test_mysql_ddl_is_rewritten(self):
+        statements = translate("""
+            CREATE TABLE IF NOT EXISTS things (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                status ENUM('a', 'b') DEFAULT 'a',
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                metadata JSON,
+                INDEX idx_status (status, updated_at)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+
+        create, index, trigger = statements
+        assert "INTEGER PRIMARY KEY AUTOINCREMENT" in create
+        assert "status TEXT CHECK (status IN ('a', 'b'))" in create
+        assert "metadata TEXT" in create
+        assert "ENGINE" not in create and "ON UPDATE" not in create
+        assert index == "CREATE INDEX IF NOT EXISTS idx_status ON things (status, updated_at)"
+        assert trigger.startswith("CREATE TRIGGER IF NOT EXISTS things_updated_at_on_update")
+
+    def test_dml_placeholders_and_dialect(self):
+        assert translate("INSERT IGNORE INTO t (a) VALUES (%s)") == ["INSERT OR IGNORE INTO t (a) VALUES (?)"]
+        assert translate("SELECT 1 WHERE x >= NOW() - INTERVAL %s HOUR") == [
+            "SELECT 1 WHERE x >= datetime('now', '-' || ? || ' hours')"
+        ]
+
+class TestSQLiteRepositories:
+    def test_chat_round_trip(self, sqlite_backend):
+        repo = ChatRepository()
+
+        first = repo.save_message("s1", "u1", "user", "hello")
+        repo.save_message("s1", "u1", "assistant", "hi", agent_name="greeter", metadata={"k": 1})
+        messages = repo.get_session_messages("s1")
+
+        assert [m.turn_number for m in messages] == [1, 2]
+        assert messages[0].message_id == first
+        assert messages[1].name == "greeter" and messages[1].metadata == {"k": 1}
+        assert repo.get_or_create_session("s1", "u1")["created_at"].year >= 2024
+
+    def test_user_and_fraud_reports(self, sqlite_backend):
+        users = UserRepository()
+        reports = FraudReportRepository()
+
+        assert users.get_or_create_user("u1")["user_id"] == "u1"
+        assert users.update_last_active("u1")
+        reports.report_fraud("+15550001111", "IRS scam", "127.0.0.1")
+        reports.report_fraud("+15550001111", "Again", "127.0.0.1")
+
+        report = reports.check_number("+15550001111")
+        assert report["report_count"] == 2
+        assert report["description"] == "IRS scam\nAgain"
+        assert len(reports.check_numbers(["+15550001111", "+15550002222"])) == 1
+
+    def test_wal_mode(self, sqlite_backend):
+        db = UserRepository().db
+        with db.get_cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from src.components.routing_batcher import RoutingBatcher
+from src.components.supervisor import Supervisor
+from src.prompts.analysis_prompts import AnalysisPrompts
+from tests.helpers.fake_llm import FakeChatModel, parse_latency
+
+class TestFakeChatModel:
+    @pytest.mark.asyncio
+    async def test_supervisor_routes_through_structured_output(self):
+        supervisor = Supervisor(FakeChatModel(), AnalysisPrompts.SUPERVISOR_ANALYSIS)
+
+        checker = await supervisor.route("Is 555-123-4567 a scam?", [HumanMessage(content="Hi")])
+        reporter = await supervisor.route("I want to report a caller", [])
+        assert checker.selected_agent == "checker"
+        assert reporter.selected_agent == "reporter"
+
+    @pytest.mark.asyncio
+    async def test_batched_routing(self):
+        batcher = RoutingBatcher(FakeChatModel(), window_ms=10, max_batch=4)
+
+        first, second = await asyncio.gather(
+            batcher.route("Hello!", ""),
+            batcher.route("Check 555-123-4567", "")
+        )
+        assert (first.selected_agent, second.selected_agent) == ("greeter", "checker")
+
+    @pytest.mark.asyncio
+    async def test_reports_token_usage(self):
+        result = await FakeChatModel().agenerate([[HumanMessage(content="hello")]])
+        assert result.llm_output["token_usage"]["prompt_tokens"] > 0
+
+    def test_latency_is_seeded(self):
+        import random
+        sample = parse_latency("lognormal:0.3:0.5")
+        assert sample(random.Random(1)) == sample(random.Random(1))
+        assert parse_latency("fixed:0.2")(random.Random()) == 0.2
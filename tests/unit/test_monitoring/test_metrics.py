@@ -0,0 +1,64 @@
+import uuid
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from prometheus_client import REGISTRY
+from src.monitoring.metrics import (
+    LLMMetricsCallback,
+    instrument_repository,
+    observe_node,
+    render_metrics,
+)
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+class TestMetrics:
+    def test_instrument_repository_times_public_methods(self):
+        @instrument_repository
+        class DummyRepository:
+            def find(self):
+                return "row"
+
+            def _helper(self):
+                return "private"
+
+        labels = {"repository": "DummyRepository", "method": "find"}
+        before = sample("db_query_duration_seconds_count", labels)
+
+        assert DummyRepository().find() == "row"
+        assert DummyRepository()._helper() == "private"
+        assert sample("db_query_duration_seconds_count", labels) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_observe_node_records_latency(self):
+        @observe_node("test_node")
+        async def node(state, config):
+            return {"messages": []}
+
+        before = sample("graph_node_duration_seconds_count", {"node": "test_node"})
+        await node({"messages": []}, {})
+        assert sample("graph_node_duration_seconds_count", {"node": "test_node"}) == before + 1
+
+    def test_llm_callback_records_latency_and_tokens(self):
+        callback = LLMMetricsCallback()
+        run_id = uuid.uuid4()
+        labels = {"model": "test-model", "kind": "prompt"}
+        before = sample("llm_tokens_total", labels)
+
+        callback.on_chat_model_start({}, [], run_id=run_id)
+        callback.on_llm_end(LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="hi"))]],
+            llm_output={
+                "model_name": "test-model",
+                "token_usage": {"prompt_tokens": 12, "completion_tokens": 3}
+            }
+        ), run_id=run_id)
+
+        assert sample("llm_tokens_total", labels) == before + 12
+        assert sample("llm_call_duration_seconds_count", {"model": "test-model", "status": "ok"}) >= 1
+
+    def test_render_metrics(self):
+        content, content_type = render_metrics()
+        assert b"graph_node_duration_seconds" in content
+        assert content_type.startswith("text/plain")
@@ -0,0 +1,64 @@
+import json
+import pytest
+from src.monitoring.tracing import JsonlSpanWriter, Tracer, set_request_id, reset_request_id
+
+@pytest.fixture
+def writer(tmp_path):
+    return JsonlSpanWriter(
+        path=str(tmp_path / "traces.jsonl"),
+        max_bytes=10_000_000,
+        backup_count=2,
+        batch_size=1000,
+        flush_interval=60
+    )
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+class TestTracer:
+    def test_builds_span_tree(self, writer):
+        tracer = Tracer(writer, sample_rate=1.0)
+        token = set_request_id("req-1")
+        try:
+            with tracer.span("http") as root:
+                with tracer.span("node.checker") as child:
+                    llm = tracer.start_span("llm")
+                    tracer.end_span(llm)
+        finally:
+            reset_request_id(token)
+        writer.flush()
+
+        spans = {span["name"]: span for span in read_spans(writer.path)}
+        assert spans["node.checker"]["parent_id"] == root.span_id
+        assert spans["llm"]["parent_id"] == child.span_id
+        assert {span["trace_id"] for span in spans.values()} == {root.trace_id}
+        assert all(span["request_id"] == "req-1" for span in spans.values())
+
+    def test_unsampled_root_skips_children(self, writer):
+        tracer = Tracer(writer, sample_rate=0.0)
+        with tracer.span("http") as root:
+            with tracer.span("node.greeter") as child:
+                assert tracer.start_span("llm") is None
+        assert root is None and child is None
+        assert writer._buffer == []
+
+    def test_error_status(self, writer):
+        tracer = Tracer(writer, sample_rate=1.0)
+        with pytest.raises(ValueError):
+            with tracer.span("node.reporter"):
+                raise ValueError("boom")
+        writer.flush()
+        assert read_spans(writer.path)[0]["status"] == "error"
+
+class TestJsonlSpanWriter:
+    def test_rotates_when_full(self, tmp_path):
+        writer = JsonlSpanWriter(str(tmp_path / "t.jsonl"), 1, 2, 1000, 60)
+        tracer = Tracer(writer, sample_rate=1.0)
+        for _ in range(3):
+            with tracer.span("http"):
+                pass
+            writer.flush()
+
+        assert (tmp_path / "t.jsonl.1").exists()
+        assert (tmp_path / "t.jsonl.2").exists()
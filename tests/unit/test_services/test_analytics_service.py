@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from langchain_core.outputs import LLMResult
+from src.core.config import settings
+from src.monitoring.metrics import node_timings, observe_node
+from src.services.analytics_service import AnalyticsWriter, TurnUsage
+from src.services.database_service import DatabaseService
+
+def row(n):
+    return {"message_id": f"m{n}", "session_id": "s1"}
+
+def llm_result(prompt, completion, model="test-model"):
+    return LLMResult(generations=[], llm_output={
+        "model_name": model,
+        "token_usage": {"prompt_tokens": prompt, "completion_tokens": completion}
+    })
+
+class TestAnalyticsWriter:
+    @pytest.mark.asyncio
+    async def test_rows_are_batched(self):
+        batches = []
+        writer = AnalyticsWriter(batches.append, batch_size=3, flush_interval=0.05)
+
+        for n in range(5):
+            writer.record(row(n))
+        await asyncio.sleep(0.2)
+
+        assert [len(batch) for batch in batches] == [3, 2]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_rows(self):
+        writer = AnalyticsWriter(lambda batch: None, max_pending=1, flush_interval=1)
+        writer._queue.put_nowait(row(0))
+
+        writer.record(row(1))
+        assert writer.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_pending_rows(self):
+        batches = []
+        writer = AnalyticsWriter(batches.append, batch_size=10, flush_interval=60)
+
+        writer.record(row(0))
+        writer.record(row(1))
+        await asyncio.sleep(0)
+        await writer.flush()
+
+        assert sum(len(batch) for batch in batches) == 2
+
+class TestTurnUsage:
+    def test_accumulates_calls(self):
+        usage = TurnUsage()
+        for prompt, completion in [(100, 10), (50, 5)]:
+            usage.on_llm_end(llm_result(prompt, completion), run_id=None)
+
+        result = usage.to_row("m1", "s1")
+        assert result["prompt_tokens"] == 150
+        assert result["completion_tokens"] == 15
+        assert result["token_count"] == 165
+        assert result["model_name"] == "test-model"
+
+    @pytest.mark.asyncio
+    async def test_breaks_usage_down_per_node(self):
+        usage = TurnUsage()
+
+        @observe_node("supervisor")
+        async def supervisor(state, config):
+            usage.on_llm_end(llm_result(80, 5, "router-model"), run_id=None)
+
+        @observe_node("checker")
+        async def checker(state, config):
+            await asyncio.sleep(0.01)
+
+        token = node_timings.set(usage.record_node)
+        try:
+            # The supervisor runs again to finish the turn
+            for node in (supervisor, checker, supervisor):
+                await node({}, {})
+        finally:
+            node_timings.reset(token)
+
+        nodes = {node["node"]: node for node in usage.to_row("m1", "s1")["nodes"]}
+        assert nodes["supervisor"]["token_count"] == 170
+        assert nodes["supervisor"]["model_name"] == "router-model"
+        assert nodes["checker"]["token_count"] == 0
+        assert nodes["checker"]["processing_time"] >= 0.01
+
+class TestAnalyticsRepository:
+    @pytest.fixture
+    def db_service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+        monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+        return DatabaseService()
+
+    def test_latency_and_tokens_per_node(self, db_service):
+        rows = []
+        for n in range(3):
+            message_id = db_service.save_message("s1", "u1", "assistant", f"answer {n}", name="checker")
+            rows.append({
+                "message_id": message_id, "session_id": "s1", "processing_time": 1.0 + n,
+                "token_count": 50, "completion_tokens": 10, "prompt_tokens": 40, "model_name": "big",
+                "nodes": [
+                    {"node": "supervisor", "processing_time": 0.5 + n, "token_count": 50,
+                     "completion_tokens": 10, "prompt_tokens": 40, "model_name": "small"},
+                    {"node": "checker", "processing_time": 0.1, "token_count": 0,
+                     "completion_tokens": 0, "prompt_tokens": 0, "model_name": None},
+                ]
+            })
+        assert db_service.save_message_analytics(rows) == 3
+
+        latency = {r["node"]: r for r in db_service.get_latency_percentiles("node")}
+        assert (latency["supervisor"]["turns"], latency["supervisor"]["p50"]) == (3, 1.5)
+        assert latency["checker"]["p95"] == pytest.approx(0.1)
+        tokens = {r["model"]: r for r in db_service.get_token_usage("model")}
+        assert tokens["small"]["total_tokens"] == 150
+        assert tokens["small"]["avg_tokens_per_turn"] == 50
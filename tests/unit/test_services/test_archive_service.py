@@ -0,0 +1,118 @@
+from datetime import datetime
+import pyarrow.parquet as pq
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from src.core.config import settings
+from src.database.checkpointer import ThreadedSqliteSaver
+from src.database.repositories.archive_repository import _partition_clause, next_month
+from src.database.repositories.chat_repository import ChatRepository
+from src.services import archive_service
+from src.services.archive_service import MessageArchiver
+from src.services.database_service import DatabaseService
+
+@pytest.fixture
+def chat_repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    monkeypatch.setattr(archive_service, "get_checkpointer", lambda: None)
+    return ChatRepository()
+
+def backdate(repo, session_id, days):
+    with repo.db.get_cursor() as cursor:
+        cursor.execute(
+            "UPDATE chat_sessions SET last_message_at = datetime('now', ?) WHERE session_id = ?",
+            (f"-{days} days", session_id)
+        )
+
+class TestMessageArchiver:
+    def test_cold_sessions_move_to_parquet(self, chat_repo, tmp_path):
+        for n in range(3):
+            chat_repo.save_message("cold", "u1", "user", f"old {n}", metadata={"n": n})
+        chat_repo.save_message("hot", "u1", "user", "recent")
+        backdate(chat_repo, "cold", 45)
+
+        archiver = MessageArchiver(directory=str(tmp_path / "archive"), idle_days=30, chunk_rows=2)
+        result = archiver.run_once()
+
+        assert result["archived"] == 3
+        files = list((tmp_path / "archive" / "chat_messages").rglob("*.parquet"))
+        assert len(files) == 1
+        table = pq.read_table(files[0])
+        assert table.column("content").to_pylist() == ["old 0", "old 1", "old 2"]
+        assert table.column("metadata").to_pylist()[1] == '{"n":1}'
+        assert chat_repo.get_session_messages("cold") == []
+        assert len(chat_repo.get_session_messages("hot")) == 1
+
+    def test_archived_sessions_lose_their_checkpoints(self, chat_repo, tmp_path):
+        checkpointer = ThreadedSqliteSaver.from_path(str(tmp_path / "checkpoints.sqlite"))
+        for session_id in ("cold", "hot"):
+            chat_repo.save_message(session_id, "u1", "user", "hello")
+            config = {"configurable": {"thread_id": session_id, "checkpoint_ns": ""}}
+            checkpoint = create_checkpoint(empty_checkpoint(), {}, 0)
+            checkpoint["channel_values"] = {"messages": [HumanMessage(content="hello")]}
+            checkpointer.put(config, checkpoint, {"source": "loop", "step": 0, "writes": {}}, {})
+        backdate(chat_repo, "cold", 45)
+
+        MessageArchiver(directory=str(tmp_path / "archive"), idle_days=30, checkpointer=checkpointer).run_once()
+
+        assert checkpointer.get_tuple({"configurable": {"thread_id": "cold"}}) is None
+        assert checkpointer.get_tuple({"configurable": {"thread_id": "hot"}}) is not None
+
+    def test_resumed_session_keeps_turns_and_analytics(self, chat_repo, tmp_path):
+        db_service = DatabaseService()
+        for n in range(3):
+            message_id = chat_repo.save_message("cold", "u1", "user", f"old {n}")
+        db_service.save_message_analytics([{
+            "message_id": message_id, "session_id": "cold", "processing_time": 1.5, "token_count": 10,
+            "completion_tokens": 2, "prompt_tokens": 8, "model_name": "m"
+        }])
+        backdate(chat_repo, "cold", 45)
+        MessageArchiver(directory=str(tmp_path / "archive"), idle_days=30).run_once()
+
+        chat_repo.save_message("cold", "u1", "user", "back again")
+
+        assert [m.turn_number for m in chat_repo.get_session_messages("cold")] == [4]
+        with chat_repo.db.get_cursor() as cursor:
+            cursor.execute("SELECT message_id, processing_time FROM message_analytics")
+            assert cursor.fetchall() == [(None, 1.5)]
+
+    def test_cascading_analytics_table_is_migrated(self, chat_repo):
+        with chat_repo.db.get_cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE message_analytics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    message_id VARCHAR(100) NOT NULL UNIQUE REFERENCES chat_messages(message_id) ON DELETE CASCADE,
+                    session_id VARCHAR(100) NOT NULL,
+                    processing_time FLOAT, token_count INT, completion_tokens INT, prompt_tokens INT,
+                    model_name VARCHAR(100), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        message_id = chat_repo.save_message("s1", "u1", "user", "hi")
+        with chat_repo.db.get_cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO message_analytics (message_id, session_id, processing_time) VALUES (?, 's1', 0.5)",
+                (message_id,)
+            )
+
+        DatabaseService()
+
+        with chat_repo.db.get_cursor() as cursor:
+            cursor.execute("PRAGMA foreign_key_list(message_analytics)")
+            assert {row[2]: row[6] for row in cursor.fetchall()}["chat_messages"] == "SET NULL"
+            cursor.execute("SELECT message_id, processing_time FROM message_analytics")
+            assert cursor.fetchall() == [(message_id, 0.5)]
+
+    def test_nothing_to_archive(self, chat_repo, tmp_path):
+        chat_repo.save_message("hot", "u1", "user", "recent")
+
+        result = MessageArchiver(directory=str(tmp_path / "archive")).run_once()
+
+        assert result["archived"] == 0
+        assert not (tmp_path / "archive").exists()
+
+def test_partition_bounds():
+    assert next_month(datetime(2026, 12, 1)) == datetime(2027, 1, 1)
+    assert _partition_clause(datetime(2026, 12, 1)) == (
+        "PARTITION p202612 VALUES LESS THAN (UNIX_TIMESTAMP('2027-01-01'))"
+    )
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controller.routers import export
+from src.core.config import settings
+from src.services.cache_service import RedisCache
+from src.services.database_service import DatabaseService
+from src.services.export_service import ExportService, get_export_service
+from tests.helpers.in_memory_db import InMemoryRedis
+
+@pytest.fixture
+def db_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    cache = RedisCache()
+    monkeypatch.setattr(cache, "client", InMemoryRedis())
+    return DatabaseService(cache)
+
+class TestExportService:
+    def test_incremental_parquet_export(self, db_service, tmp_path):
+        for n in range(5):
+            db_service.save_message("s1", "u1", "user", f"message {n}")
+        service = ExportService(chunk_rows=2)
+        out = str(tmp_path / "exports")
+
+        first = service.run_incremental(["chat_messages"], out, "parquet")
+        db_service.save_message("s1", "u1", "user", "message 5")
+        second = service.run_incremental(["chat_messages"], out, "parquet")
+        third = service.run_incremental(["chat_messages"], out, "parquet")
+
+        assert first["chat_messages"]["rows"] == 5
+        assert pq.read_table(second["chat_messages"]["path"]).column("content").to_pylist() == ["message 5"]
+        assert third["chat_messages"] == {"path": None, "rows": 0}
+
+    def test_updated_fraud_reports_are_exported_again(self, db_service, tmp_path):
+        db_service.report_fraud("+15550001111", "IRS scam", "127.0.0.1")
+        db_service.report_fraud("+15550002222", "Bank scam", "127.0.0.1")
+        service = ExportService()
+        out = str(tmp_path / "exports")
+        service.run_incremental(["fraud_reports"], out, "parquet")
+
+        # Push the row past the stored watermark, as a later report would
+        with db_service.fraud_repo.db.get_cursor() as cursor:
+            cursor.execute(
+                "UPDATE fraud_reports SET report_count = 2, last_updated_at = datetime('now', '+1 minute') "
+                "WHERE phone_number = '+15550001111'"
+            )
+        result = service.run_incremental(["fraud_reports"], out, "parquet")
+
+        table = pq.read_table(result["fraud_reports"]["path"])
+        assert table.column("phone_number").to_pylist() == ["+15550001111"]
+        assert table.column("report_count").to_pylist() == [2]
+        assert table.column("is_fraud").to_pylist() == [True]
+
+    def test_unchanged_fraud_reports_write_no_file(self, db_service, tmp_path):
+        db_service.report_fraud("+15550001111", "IRS scam", "127.0.0.1")
+        db_service.report_fraud("+15550002222", "Bank scam", "127.0.0.1")
+        service = ExportService(chunk_rows=1)
+        out = str(tmp_path / "exports")
+
+        first = service.run_incremental(["fraud_reports"], out, "parquet")
+        second = service.run_incremental(["fraud_reports"], out, "parquet")
+        third = service.run_incremental(["fraud_reports"], out, "parquet")
+
+        assert first["fraud_reports"]["rows"] == 2
+        assert second["fraud_reports"] == third["fraud_reports"] == {"path": None, "rows": 0}
+        assert len(os.listdir(os.path.join(out, "fraud_reports"))) == 1
+
+    def test_update_within_the_watermark_second_is_not_skipped(self, db_service, tmp_path):
+        db_service.report_fraud("+15550001111", "IRS scam", "127.0.0.1")
+        db_service.report_fraud("+15550002222", "Bank scam", "127.0.0.1")
+        with db_service.fraud_repo.db.get_cursor() as cursor:
+            cursor.execute("UPDATE fraud_reports SET last_updated_at = '2026-01-01 12:00:00'")
+        service = ExportService()
+        out = str(tmp_path / "exports")
+        service.run_incremental(["fraud_reports"], out, "parquet")
+
+        # Updated again in the watermark's second, sorting before the watermark id
+        with db_service.fraud_repo.db.get_cursor() as cursor:
+            cursor.execute(
+                "UPDATE fraud_reports SET report_count = 2, last_updated_at = '2026-01-01 12:00:00' "
+                "WHERE phone_number = '+15550001111'"
+            )
+        result = service.run_incremental(["fraud_reports"], out, "parquet")
+
+        table = pq.read_table(result["fraud_reports"]["path"])
+        assert table.column("phone_number").to_pylist() == ["+15550001111"]
+        assert table.column("report_count").to_pylist() == [2]
+
+    def test_arrow_stream(self, db_service):
+        for n in range(3):
+            db_service.save_message("s1", "u1", "user", f"message {n}")
+
+        data = b"".join(ExportService(chunk_rows=2).stream("chat_messages", "arrow", after=[1]))
+
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.column("turn_number").to_pylist() == [2, 3]
+
+    def test_concurrent_api_exports_on_sqlite(self, db_service, monkeypatch):
+        for n in range(7):
+            db_service.report_fraud(f"+1555000{n:04d}", "scam", "127.0.0.1")
+        monkeypatch.setattr(settings, "EXPORT_API_TOKEN", "secret")
+        app = FastAPI()
+        app.include_router(export.router, prefix="/api/v1")
+        app.dependency_overrides[get_export_service] = lambda: ExportService(chunk_rows=2)
+
+        with TestClient(app) as client:
+            def fetch(_):
+                return client.get("/api/v1/export/fraud_reports", headers={"x-export-token": "secret"})
+
+            with ThreadPoolExecutor(8) as pool:
+                responses = list(pool.map(fetch, range(8)))
+            # The thread's transaction depth is back to zero, so later writes commit
+            db_service.report_fraud("+15550009999", "scam", "127.0.0.1")
+            last = fetch(None)
+
+        assert [r.status_code for r in responses] == [200] * 8
+        assert all(pa.ipc.open_stream(r.content).read_all().num_rows == 7 for r in responses)
+        assert pa.ipc.open_stream(last.content).read_all().num_rows == 8
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, Mock
+from controller.routers import chat
+from src.core.config import settings
+from src.models.agents import AgentResponse
+from src.services.agent_service import get_agent_service
+from src.services.cache_service import RedisCache
+from src.services.idempotency import IdempotencyError, IdempotencyGuard, get_idempotency_guard
+from tests.helpers.in_memory_db import InMemoryRedis
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RedisCache()
+    monkeypatch.setattr(cache, "client", InMemoryRedis())
+    return cache
+
+class Turn:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return {"content": f"answer {self.calls}", "name": "checker"}
+
+class TestIdempotencyGuard:
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_execution(self, cache):
+        guard = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+        turn = Turn(delay=0.02)
+
+        results = await asyncio.gather(*(guard.run("k1", "fp", turn) for _ in range(3)))
+
+        assert turn.calls == 1
+        assert [replayed for _, replayed in results] == [False, True, True]
+        assert all(result == {"content": "answer 1", "name": "checker"} for result, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_other_worker_waits_then_replays(self, cache):
+        # Separate guards share the cache like two workers share Redis
+        worker_a = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+        worker_b = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+        turn = Turn(delay=0.05)
+
+        first, second = await asyncio.gather(worker_a.run("k1", "fp", turn), worker_b.run("k1", "fp", turn))
+        later = await worker_b.run("k1", "fp", turn)
+
+        assert turn.calls == 1
+        assert first == ({"content": "answer 1", "name": "checker"}, False)
+        assert second[1] and later[1]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_stored(self, cache):
+        guard = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+
+        with pytest.raises(RuntimeError):
+            await guard.run("k1", "fp", Turn(fail=True))
+        result, replayed = await guard.run("k1", "fp", Turn())
+
+        assert (result["content"], replayed) == ("answer 1", False)
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_another_request(self, cache):
+        guard = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+        await guard.run("k1", "fp", Turn())
+
+        with pytest.raises(IdempotencyError) as exc:
+            await guard.run("k1", "other", Turn())
+        assert exc.value.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_in_progress_elsewhere_past_wait(self, cache):
+        await cache.add("idempotency:k1", {"status": "pending", "fingerprint": "fp"}, 60)
+        guard = IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=0.1)
+
+        with pytest.raises(IdempotencyError) as exc:
+            await guard.run("k1", "fp", Turn())
+        assert exc.value.status_code == 409
+
+@pytest.fixture
+def client(cache, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_ENABLED", True)
+    replies = iter(range(1, 100))
+    agent_service = Mock(process_message=AsyncMock(
+        side_effect=lambda **_: AgentResponse(content=f"answer {next(replies)}", name="checker")
+    ))
+    app = FastAPI()
+    app.state.limiter = chat.limiter
+    app.include_router(chat.router, prefix="/api/v1")
+    app.dependency_overrides[get_agent_service] = lambda: agent_service
+    app.dependency_overrides[get_idempotency_guard] = lambda: IdempotencyGuard(cache, ttl=60, pending_ttl=60, wait=5)
+    return TestClient(app)
+
+class TestChatIdempotency:
+    message = {"content": "yes", "session_id": "s1", "user_id": "u1"}
+
+    def test_repeated_message_without_key_runs_again_by_default(self, client):
+        first = client.post("/api/v1/chat", json=self.message)
+        second = client.post("/api/v1/chat", json=self.message)
+
+        assert [first.json()["content"], second.json()["content"]] == ["answer 1", "answer 2"]
+        assert "Idempotent-Replayed" not in second.headers
+
+    def test_derived_key_only_covers_its_window(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "IDEMPOTENCY_DERIVED_TTL", 1)
+
+        first = client.post("/api/v1/chat", json=self.message)
+        retry = client.post("/api/v1/chat", json=self.message)
+        time.sleep(1.1)
+        repeat = client.post("/api/v1/chat", json=self.message)
+
+        assert retry.json()["content"] == "answer 1"
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert repeat.json()["content"] == "answer 2"
+        assert "Idempotent-Replayed" not in repeat.headers
@@ -0,0 +1,41 @@
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from src.components.supervisor import Supervisor
+from src.prompts.analysis_prompts import AnalysisPrompts
+from src.services.llm_cassette import Cassette, CassetteChatModel, CassetteMiss
+from tests.helpers.fake_llm import FakeChatModel
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "llm.json")
+
+class TestLLMCassette:
+    @pytest.mark.asyncio
+    async def test_replays_recorded_tool_calls_offline(self, path):
+        recorder = CassetteChatModel(inner=FakeChatModel(), cassette=Cassette(path), mode="record")
+        recorded = await Supervisor(recorder, AnalysisPrompts.SUPERVISOR_ANALYSIS).route(
+            "Is 555-123-4567 safe?", []
+        )
+
+        # A fresh cassette from disk and no wrapped model at all
+        player = CassetteChatModel(cassette=Cassette(path), mode="replay")
+        replayed = await Supervisor(player, AnalysisPrompts.SUPERVISOR_ANALYSIS).route(
+            "Is 555-123-4567 safe?", []
+        )
+        assert recorded.selected_agent == replayed.selected_agent == "checker"
+
+    @pytest.mark.asyncio
+    async def test_keys_ignore_message_ids(self, path):
+        recorder = CassetteChatModel(inner=FakeChatModel(), cassette=Cassette(path), mode="record")
+        messages = [SystemMessage(content="Be brief"), HumanMessage(content="Hello", id="run-1")]
+        recorded = await recorder.ainvoke(messages)
+
+        player = CassetteChatModel(cassette=Cassette(path), mode="replay")
+        replayed = await player.ainvoke([SystemMessage(content="Be brief"), HumanMessage(content="Hello", id="run-2")])
+        assert replayed.content == recorded.content
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_raises(self, path):
+        player = CassetteChatModel(cassette=Cassette(path), mode="replay")
+        with pytest.raises(CassetteMiss):
+            await player.ainvoke([HumanMessage(content="never recorded")])
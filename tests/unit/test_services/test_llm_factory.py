@@ -0,0 +1,26 @@
+import pytest
+from src.core.config import settings
+from src.services.llm_factory import ModelTier, get_chat_model, node_tier
+
+@pytest.fixture(autouse=True)
+def tiers(monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_MODEL", "llama-3.3-70b-versatile")
+    monkeypatch.setattr(settings, "SUPERVISOR_MODEL", "llama-3.1-8b-instant")
+    monkeypatch.setattr(settings, "CHECKER_MODEL", "")
+    monkeypatch.setattr(settings, "CHECKER_MAX_TOKENS", 0)
+    get_chat_model.cache_clear()
+
+class TestLLMFactory:
+    def test_node_tiers_fall_back_to_groq_model(self):
+        assert node_tier("supervisor") == ModelTier("llama-3.1-8b-instant", 0.0, settings.SUPERVISOR_MAX_TOKENS)
+        assert node_tier("checker") == ModelTier("llama-3.3-70b-versatile", settings.CHECKER_TEMPERATURE, None)
+
+    def test_clients_are_built_once_per_tier(self):
+        supervisor = get_chat_model(node_tier("supervisor"))
+        checker = get_chat_model(node_tier("checker"))
+
+        assert get_chat_model(node_tier("supervisor")) is supervisor
+        assert supervisor is not checker
+        assert supervisor.inner.model_name == "llama-3.1-8b-instant"
+        assert checker.inner.model_name == "llama-3.3-70b-versatile"
@@ -0,0 +1,119 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain_core.messages import HumanMessage
+from src.components.agents.greeter_agent import GreeterAgent
+from src.services.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    DeadlineExceeded,
+    LatencyTracker,
+    ResilientChatModel,
+    new_deadline,
+    within_deadline,
+)
+from tests.helpers.fake_llm import FakeChatModel
+
+def scripted_llm(*delays):
+    llm = FakeChatModel()
+    remaining = iter(delays)
+    llm._sample = lambda rng: next(remaining)
+    return llm
+
+def resilient(inner, latency=None, breaker=None):
+    return ResilientChatModel(
+        inner=inner,
+        breaker=breaker or CircuitBreaker("test", failures=3, reset_seconds=30),
+        latency=latency or LatencyTracker(0.0)
+    )
+
+class TestResilientChatModel:
+    @pytest.mark.asyncio
+    async def test_hedged_call_wins_past_percentile(self):
+        latency = LatencyTracker(0.95, min_samples=1)
+        latency.observe(0.02)
+        llm = resilient(scripted_llm(2.0, 0.01), latency=latency)
+
+        start = time.perf_counter()
+        response = await llm.ainvoke([HumanMessage(content="hello")])
+
+        assert "hello" in response.content
+        assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_call_stops_at_node_deadline(self):
+        llm = resilient(scripted_llm(2.0))
+
+        @within_deadline
+        async def node(state, config):
+            return await llm.ainvoke(state["messages"])
+
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            await node({"messages": [HumanMessage(content="hello")]}, {"configurable": {"deadline": new_deadline(0.05)}})
+        assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_deadline_does_not_count_against_provider(self):
+        breaker = CircuitBreaker("test", failures=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        llm = resilient(scripted_llm(2.0, 2.0), breaker=breaker)
+
+        @within_deadline
+        async def node(state, config):
+            return await llm.ainvoke(state["messages"])
+
+        # The half-open trial runs out of request time: neither reopens nor closes the breaker
+        for _ in range(2):
+            with pytest.raises(DeadlineExceeded):
+                await node({"messages": [HumanMessage(content="hello")]}, {"configurable": {"deadline": new_deadline(0.02)}})
+        assert breaker.state == "half_open"
+
+    @pytest.mark.asyncio
+    async def test_provider_timeout_counts_as_failure(self):
+        breaker = CircuitBreaker("test", failures=1, reset_seconds=30)
+        llm = resilient(Mock(ainvoke=AsyncMock(side_effect=TimeoutError("read timeout"))), breaker=breaker)
+
+        with pytest.raises(TimeoutError):
+            await llm.ainvoke([HumanMessage(content="hello")])
+        assert breaker.state == "open"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_gives_degraded_reply(self):
+        breaker = CircuitBreaker("test", failures=1, reset_seconds=30)
+        breaker.record_failure()
+        llm = resilient(scripted_llm(), breaker=breaker)
+
+        class Agent:
+            async def ainvoke(self, state):
+                return await llm.ainvoke(state["messages"])
+
+        result = await GreeterAgent(Agent()).process({"messages": [HumanMessage(content="hi")]})
+
+        assert result["messages"][-1].content == GreeterAgent.DEGRADED_REPLY
+
+class TestCircuitBreaker:
+    def test_opens_then_half_opens_for_one_trial(self):
+        breaker = CircuitBreaker("test", failures=2, reset_seconds=0.05)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpen):
+            breaker.before_call()
+        time.sleep(0.06)
+        breaker.before_call()
+        with pytest.raises(CircuitOpen):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker("test", failures=1, reset_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from src.services.cache_service import RedisCache
+from src.services.session_lock import SessionBusy, SessionLock
+from tests.helpers.in_memory_db import InMemoryRedis
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RedisCache()
+    monkeypatch.setattr(cache, "client", InMemoryRedis())
+    return cache
+
+class TestSessionLock:
+    @pytest.mark.asyncio
+    async def test_turns_of_one_session_run_in_order(self, cache):
+        lock = SessionLock(cache, wait=5, lease_ttl=60)
+        events = []
+
+        async def turn(name):
+            async with lock.hold("s1"):
+                events.append(f"{name} start")
+                await asyncio.sleep(0.01)
+                events.append(f"{name} end")
+
+        await asyncio.gather(turn("a"), turn("b"), turn("c"))
+
+        assert events == ["a start", "a end", "b start", "b end", "c start", "c end"]
+        assert lock._locks == {}
+        assert cache.client.get("session:s1:lease") is None
+
+    @pytest.mark.asyncio
+    async def test_other_worker_lease_blocks_until_wait_runs_out(self, cache):
+        # Two SessionLocks share the cache like two workers share Redis
+        worker_a = SessionLock(cache, wait=5, lease_ttl=60)
+        worker_b = SessionLock(cache, wait=0.05, lease_ttl=60)
+
+        async with worker_a.hold("s1"):
+            with pytest.raises(SessionBusy):
+                async with worker_b.hold("s1"):
+                    pass
+            async with worker_b.hold("s2"):
+                pass
+
+        async with worker_b.hold("s1"):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_zero_wait_rejects_at_once(self, cache):
+        lock = SessionLock(cache, wait=0, lease_ttl=60)
+
+        async with lock.hold("s1"):
+            with pytest.raises(SessionBusy):
+                async with lock.hold("s1"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_not_released_by_its_old_holder(self, cache):
+        lock = SessionLock(cache, wait=1, lease_ttl=60)
+
+        async with lock.hold("s1"):
+            # The lease expired and another worker took it over
+            cache.client.set("session:s1:lease", "other")
+
+        assert cache.client.get("session:s1:lease") == "other"
@@ -0,0 +1,78 @@
+import pytest
+from src.core.config import settings
+from src.database.sqlite_connection import SQLiteCursor
+from src.services.cache_service import RedisCache
+from src.services.database_service import DatabaseService
+from src.services.session_sweeper import SessionSweeper
+from tests.helpers.in_memory_db import InMemoryRedis
+
+@pytest.fixture
+def db_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "test.sqlite"))
+    return DatabaseService()
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RedisCache()
+    monkeypatch.setattr(cache, "client", InMemoryRedis())
+    return cache
+
+def idle(db_service, session_id, minutes):
+    with db_service.chat_repo.db.get_cursor() as cursor:
+        cursor.execute(
+            "UPDATE chat_sessions SET last_message_at = datetime('now', ?) WHERE session_id = ?",
+            (f"-{minutes} minutes", session_id)
+        )
+
+def status(db_service, session_id):
+    with db_service.chat_repo.db.get_cursor() as cursor:
+        cursor.execute("SELECT status FROM chat_sessions WHERE session_id = ?", (session_id,))
+        return cursor.fetchone()[0]
+
+class TestSessionSweeper:
+    @pytest.mark.asyncio
+    async def test_idle_sessions_are_swept_in_batches(self, db_service, cache):
+        for n in range(5):
+            db_service.save_message(f"idle_{n}", "u1", "user", "hi")
+            idle(db_service, f"idle_{n}", 60)
+        db_service.save_message("live", "u1", "user", "hi")
+        await cache.set("session:idle_0:last_active", 1)
+
+        sweeper = SessionSweeper(db_service, cache, idle_minutes=30, batch_size=2, max_batches=2)
+        assert len(await sweeper.sweep_once()) == 4
+        assert len(await sweeper.sweep_once()) == 1
+
+        assert [status(db_service, f"idle_{n}") for n in range(5)] == ["inactive"] * 5
+        assert status(db_service, "live") == "active"
+        assert await cache.get("session:idle_0:last_active") is None
+
+    @pytest.mark.asyncio
+    async def test_new_message_reactivates_session(self, db_service, cache):
+        db_service.save_message("s1", "u1", "user", "hi")
+        idle(db_service, "s1", 60)
+        await SessionSweeper(db_service, cache, idle_minutes=30).sweep_once()
+
+        db_service.save_message("s1", "u1", "user", "back again")
+
+        assert status(db_service, "s1") == "active"
+        assert len(db_service.get_session_messages("s1")) == 2
+
+    @pytest.mark.asyncio
+    async def test_session_active_again_before_update_is_not_swept(self, db_service, cache, monkeypatch):
+        for session_id in ("s1", "s2"):
+            db_service.save_message(session_id, "u1", "user", "hi")
+            idle(db_service, session_id, 60)
+        await cache.set("session:s2:last_active", 1)
+
+        # s2 gets a message between the sweep's SELECT and its UPDATE
+        execute = SQLiteCursor.execute
+        def racing_execute(cursor, operation, params=()):
+            if "SET status = 'inactive'" in operation:
+                execute(cursor, "UPDATE chat_sessions SET last_message_at = CURRENT_TIMESTAMP WHERE session_id = 's2'")
+            return execute(cursor, operation, params)
+        monkeypatch.setattr(SQLiteCursor, "execute", racing_execute)
+
+        assert await SessionSweeper(db_service, cache, idle_minutes=30).sweep_once() == ["s1"]
+        assert status(db_service, "s2") == "active"
+        assert await cache.get("session:s2:last_active") == 1
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.services.speculation import RoutePredictor, SpeculationStats, SpeculativeExecutor
+
+class TestSpeculativeExecutor:
+    @pytest.fixture
+    def executor(self):
+        return SpeculativeExecutor(["greeter", "checker"], stats=SpeculationStats())
+
+    @staticmethod
+    async def agent_run(content: str, delay: float = 0.01):
+        await asyncio.sleep(delay)
+        return {"messages": [content]}
+
+    @pytest.mark.asyncio
+    async def test_hit_reuses_result(self, executor):
+        assert executor.start("turn_1", "greeter", self.agent_run("hello"))
+        await asyncio.sleep(0.02)
+        executor.resolve("turn_1", "greeter")
+
+        result = await executor.take("turn_1", "greeter")
+        assert result == {"messages": ["hello"]}
+        assert executor.stats.hits == 1
+        assert executor.stats.saved_seconds > 0
+
+    @pytest.mark.asyncio
+    async def test_miss_cancels_run(self, executor):
+        executor.start("turn_1", "greeter", self.agent_run("hello", delay=1))
+        task = executor._pending["turn_1"][1]
+        executor.resolve("turn_1", "checker")
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert await executor.take("turn_1", "checker") is None
+        assert executor.stats.misses == 1
+        assert executor.stats.hit_rate == 0.0
+
+    @pytest.mark.asyncio
+    async def test_side_effecting_agent_not_speculated(self, executor):
+        assert not executor.start("turn_1", "reporter", self.agent_run("report"))
+        assert executor.stats.attempts == 0
+
+class TestRoutePredictor:
+    def test_prefers_last_session_route(self):
+        predictor = RoutePredictor()
+        assert predictor.predict("s1", "Is 555-123-4567 safe?") == "checker"
+        predictor.record("s1", "greeter")
+        assert predictor.predict("s1", "Is 555-123-4567 safe?") == "greeter"
+
+    def test_evicts_oldest_sessions(self):
+        predictor = RoutePredictor(max_sessions=2)
+        for session_id in ("s1", "s2", "s3"):
+            predictor.record(session_id, "checker")
+        assert predictor.predict("s1", "hello") == "greeter"
@@ -0,0 +1,60 @@
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from src.core.config import settings
+from src.services.cache_service import RedisCache
+from src.utils import codec as codec_module
+from src.utils.codec import CodecJSONResponse, MsgpackCodec, OrjsonCodec, get_codec
+from tests.helpers.in_memory_db import InMemoryRedis
+
+VALUE = {"phone_number": "+1-555-123-4567", "reports": [{"type": "scam", "count": 3}], "note": "café", "ok": None}
+
+class TestCodec:
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_round_trip(self, name):
+        codec = get_codec(name)
+        assert codec.decode(codec.encode(VALUE)) == VALUE
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_datetime_and_decimal_become_json_values(self, name):
+        codec = get_codec(name)
+        value = {"created_at": datetime(2026, 1, 2, 3, 4, 5), "score": Decimal("0.5")}
+        assert codec.decode(codec.encode(value)) == {"created_at": "2026-01-02T03:04:05", "score": 0.5}
+
+    def test_json_codecs_write_identical_text(self):
+        assert get_codec("json").encode(VALUE) == get_codec("orjson").encode(VALUE)
+        assert json.loads(get_codec("orjson").encode_text(VALUE)) == VALUE
+
+    def test_msgpack_reads_entries_written_as_json(self):
+        codec = get_codec("msgpack")
+        assert codec.encode(VALUE)[:1] == MsgpackCodec.MARKER
+        assert codec.decode(json.dumps(VALUE).encode()) == VALUE
+        assert codec.decode(json.dumps(VALUE)) == VALUE
+
+    def test_missing_msgpack_falls_back_to_json_with_warning(self, monkeypatch, caplog):
+        monkeypatch.setattr(codec_module, "msgpack", None)
+        codec = codec_module._build("msgpack")
+        assert isinstance(codec, OrjsonCodec)
+        assert "msgpack is not installed" in caplog.text
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_codec("pickle")
+
+    def test_response_renders_compact_json(self, monkeypatch):
+        monkeypatch.setattr(settings, "JSON_CODEC", "orjson")
+        assert CodecJSONResponse({"content": "hi", "name": None}).body == b'{"content":"hi","name":null}'
+
+    @pytest.mark.asyncio
+    async def test_cache_stores_codec_bytes(self, monkeypatch):
+        monkeypatch.setattr(settings, "CACHE_CODEC", "msgpack")
+        cache = RedisCache()
+        monkeypatch.setattr(cache, "client", InMemoryRedis())
+
+        await cache.set("fraud_check:+15551234567", VALUE)
+        assert cache.client.get("fraud_check:+15551234567")[:1] == MsgpackCodec.MARKER
+        assert await cache.get("fraud_check:+15551234567") == VALUE
+
+        cache.client.set("legacy", json.dumps(VALUE))
+        assert await cache.get("legacy") == VALUE
@@ -0,0 +1,26 @@
+import logging
+from langchain_core.messages import HumanMessage, AIMessage
+from src.utils.logger import Capped, MessagesSummary, SamplingFilter
+
+def record(level):
+    return logging.LogRecord("test", level, __file__, 1, "msg", None, None)
+
+class TestLogger:
+    def test_capped_truncates_long_payloads(self):
+        text = str(Capped("x" * 50, limit=10))
+        assert text == "x" * 10 + "... [40 more chars]"
+        assert str(Capped("short", limit=10)) == "short"
+
+    def test_summary_only_renders_last_message(self):
+        messages = [HumanMessage(content=f"message {n}") for n in range(100)]
+        messages.append(AIMessage(content="latest answer", name="checker"))
+
+        text = str(MessagesSummary({"checker": {"messages": messages}}))
+        assert "101 messages" in text
+        assert "checker: latest answer" in text
+        assert "message 0" not in text
+
+    def test_sampling_keeps_warnings(self):
+        sampler = SamplingFilter(0.0)
+        assert not sampler.filter(record(logging.INFO))
+        assert sampler.filter(record(logging.WARNING))